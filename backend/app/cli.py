@@ -0,0 +1,419 @@
+"""Maintenance commands: ``python -m app.cli <command>``."""
+
+import argparse
+import asyncio
+
+from sqlmodel import Session, select
+
+from app.db.session import engine, init_db
+from app.models import IntakeItem
+
+
+def cmd_enrich(args: argparse.Namespace) -> None:
+    from app.services.enrichment import ENRICHABLE_STATUSES, enricher
+
+    with Session(engine) as session:
+        stmt = select(IntakeItem.id).where(
+            IntakeItem.status.in_(ENRICHABLE_STATUSES), IntakeItem.matched_book_id.is_(None)
+        )
+        ids = list(session.exec(stmt).all())
+
+    async def run():
+        try:
+            return await enricher.enrich_items(ids)
+        finally:
+            await enricher.aclose()
+
+    report = asyncio.run(run())
+    print(
+        f"enriched {len(ids)} items: {report.matched} matched, "
+        f"{report.needs_review} need review, {report.failed} failed"
+    )
+
+
+def cmd_match(args: argparse.Namespace) -> None:
+    from sqlmodel.ext.asyncio.session import AsyncSession
+
+    from app.core import etag
+    from app.db.session import async_engine
+    from app.services.enrichment import ENRICHABLE_STATUSES
+    from app.services.matcher import match_items
+
+    async def run() -> tuple[int, int]:
+        async with AsyncSession(async_engine, expire_on_commit=False) as session:
+            items = (
+                await session.exec(
+                    select(IntakeItem).where(
+                        IntakeItem.status.in_(ENRICHABLE_STATUSES),
+                        IntakeItem.matched_book_id.is_(None),
+                    )
+                )
+            ).all()
+            leftover = await match_items(session, items)
+            for user_id in {i.user_id for i in items if i not in leftover}:
+                await etag.bump(session, user_id, etag.INTAKE)
+            await session.commit()
+            return len(items), len(items) - len(leftover)
+
+    total, matched = asyncio.run(run())
+    print(f"matched {matched} of {total} unmatched intake items against the catalog")
+
+
+def cmd_lookup_cache(args: argparse.Namespace) -> None:
+    from app.services.lookup_cache import lookup_cache
+
+    if args.action == "clear":
+        lookup_cache.clear()
+    for name, value in lookup_cache.stats().items():
+        print(f"{name}: {value}")
+
+
+def cmd_rebuild_search(args: argparse.Namespace) -> None:
+    from app.db.search import rebuild_search_index
+
+    with engine.begin() as conn:
+        rebuild_search_index(conn)
+    print("search index rebuilt")
+
+
+def cmd_vacuum(args: argparse.Namespace) -> None:
+    from app.db.search import rebuild_search_index
+    from app.db.session import is_sqlite
+
+    if not is_sqlite:
+        raise SystemExit("vacuum is only needed for the SQLite backend")
+    # VACUUM can't run inside a transaction, and may renumber the rowids the search
+    # index points at, so the index is rebuilt straight afterwards.
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.exec_driver_sql("VACUUM")
+    with engine.begin() as conn:
+        rebuild_search_index(conn)
+    print("vacuumed the database and rebuilt the search index")
+
+
+def cmd_backfill_identifiers(args: argparse.Namespace) -> None:
+    from app.core import isbn as isbn_lib
+    from app.models import Book, BookIdentifier, Edition
+    from app.services.enrichment import register_identifiers_stmt
+
+    registered = duplicates = 0
+    with Session(engine) as session:
+        for edition in session.exec(select(Edition)).all():
+            isbn13 = isbn_lib.to_isbn13(edition.isbn13 or edition.isbn10)
+            if isbn13:
+                edition.isbn13, edition.isbn10 = isbn13, isbn_lib.isbn13_to_10(isbn13)
+                session.add(edition)
+            ids = {
+                k: v
+                for k, v in (edition.identifiers_json or {}).items()
+                if k in ("olid", "google_volume", "olwork") and v
+            }
+            if isbn13:
+                ids["isbn13"] = isbn13
+            if not ids:
+                continue
+            owner = session.exec(
+                select(BookIdentifier).where(
+                    BookIdentifier.scheme == "isbn13", BookIdentifier.value == isbn13
+                )
+            ).first()
+            if owner and owner.edition_id not in (None, edition.id):
+                duplicates += 1
+                continue
+            session.exec(
+                register_identifiers_stmt(engine.dialect.name, ids, edition.book_id, edition.id)
+            )
+            registered += 1
+
+        for book in session.exec(select(Book)).all():
+            ids = {k: v for k, v in (book.identifiers_json or {}).items() if k == "olwork" and v}
+            if ids:
+                session.exec(register_identifiers_stmt(engine.dialect.name, ids, book.id, None))
+        session.commit()
+
+    print(f"registered identifiers for {registered} editions; {duplicates} duplicate editions")
+
+
+def cmd_backfill_owned_links(args: argparse.Namespace) -> None:
+    from uuid import UUID
+
+    from app.core.etag import OWNED, bump_stmt
+    from app.models import OwnedItem
+
+    prefix = "Imported from Inbox: "
+    linked = 0
+    owners = set()
+    with Session(engine) as session:
+        items = session.exec(
+            select(OwnedItem).where(
+                OwnedItem.intake_id.is_(None), OwnedItem.notes.startswith(prefix)
+            )
+        ).all()
+        for item in items:
+            try:
+                intake_id = UUID(item.notes[len(prefix):].split()[0])
+            except (ValueError, IndexError):
+                continue
+            intake = session.get(IntakeItem, intake_id)
+            if intake is None or intake.user_id != item.user_id:
+                continue
+            item.intake_id, item.source_id = intake.id, intake.source_id
+            session.add(item)
+            owners.add(item.user_id)
+            linked += 1
+        for user_id in owners:
+            session.exec(bump_stmt(engine.dialect.name, user_id, OWNED))
+        session.commit()
+
+    print(f"linked {linked} owned items to their inbox captures")
+
+
+def cmd_reparse(args: argparse.Namespace) -> None:
+    from collections import Counter
+
+    from sqlalchemy import delete, update
+
+    from app.core.etag import INTAKE, bump_stmt
+    from app.db.rollups import INTAKE_STATUS, delta_stmt
+    from app.models import IntakeDedupBucket
+    from app.services import dedup
+    from app.services.parser import PARSER_VERSION, capture_status, parse_capture
+
+    seen = reparsed = 0
+    last_id = None
+    with Session(engine) as session:
+        while True:
+            stmt = select(
+                IntakeItem.id,
+                IntakeItem.user_id,
+                IntakeItem.raw_text,
+                IntakeItem.parse_json,
+                IntakeItem.status,
+                IntakeItem.duplicate_of_id,
+            )
+            if last_id is not None:
+                stmt = stmt.where(IntakeItem.id > last_id)
+            rows = session.exec(stmt.order_by(IntakeItem.id).limit(args.chunk_size)).all()
+            if not rows:
+                break
+            last_id = rows[-1][0]
+            seen += len(rows)
+            owners = set()
+            # Core updates skip the ORM flush hook, so status counters move by hand.
+            status_deltas: Counter = Counter()
+            for item_id, user_id, raw_text, parse_json, status, duplicate_of_id in rows:
+                if not args.all and (parse_json or {}).get("v") == PARSER_VERSION:
+                    continue
+                parsed = parse_capture(raw_text)
+                # Dedup signatures come from the parse, so they are rebuilt with it.
+                sig = dedup.signature(parsed)
+                values: dict = {
+                    "parse_json": parsed,
+                    "fingerprint": sig.fingerprint if sig else None,
+                }
+                # Only untouched captures move; matched/owned/archived keep their status.
+                if status in ("new", "parsed"):
+                    values["status"] = capture_status(parsed)
+                    if values["status"] != status:
+                        status_deltas[(user_id, status)] -= 1
+                        status_deltas[(user_id, values["status"])] += 1
+                session.exec(update(IntakeItem).where(IntakeItem.id == item_id).values(**values))
+                session.exec(
+                    delete(IntakeDedupBucket).where(IntakeDedupBucket.intake_id == item_id)
+                )
+                if sig is not None and duplicate_of_id is None:
+                    session.add_all(
+                        IntakeDedupBucket(user_id=user_id, bucket=b, intake_id=item_id)
+                        for b in sig.buckets
+                    )
+                owners.add(user_id)
+                reparsed += 1
+            for user_id in owners:
+                session.exec(bump_stmt(engine.dialect.name, user_id, INTAKE))
+            for (user_id, status), delta in status_deltas.items():
+                if delta:
+                    session.exec(
+                        delta_stmt(engine.dialect.name, user_id, INTAKE_STATUS, status, delta)
+                    )
+            session.commit()
+
+    print(f"reparsed {reparsed} of {seen} intake items (parser v{PARSER_VERSION})")
+
+
+def cmd_backfill_dedup(args: argparse.Namespace) -> None:
+    from sqlalchemy import update
+
+    from app.services import dedup
+    from app.services.parser import stored_parse
+
+    # Indexes existing captures so new ones can be matched against them; nothing already
+    # stored is merged or relinked.
+    indexed = 0
+    last_id = None
+    with Session(engine) as session:
+        while True:
+            stmt = select(IntakeItem).where(IntakeItem.fingerprint.is_(None))
+            if last_id is not None:
+                stmt = stmt.where(IntakeItem.id > last_id)
+            items = session.exec(stmt.order_by(IntakeItem.id).limit(args.chunk_size)).all()
+            if not items:
+                break
+            last_id = items[-1].id
+            for item in items:
+                sig = dedup.signature(stored_parse(item))
+                if sig is None:
+                    continue
+                session.exec(
+                    update(IntakeItem)
+                    .where(IntakeItem.id == item.id)
+                    .values(fingerprint=sig.fingerprint)
+                )
+                if item.duplicate_of_id is None:
+                    session.add_all(dedup.bucket_rows(item, sig))
+                indexed += 1
+            session.commit()
+            session.expunge_all()
+
+    print(f"indexed {indexed} intake items for duplicate detection")
+
+
+def cmd_prune_tombstones(args: argparse.Namespace) -> None:
+    from datetime import datetime, timedelta, timezone
+
+    from sqlalchemy import delete
+
+    from app.core.config import settings
+    from app.models import Tombstone
+
+    days = args.days if args.days is not None else settings.SYNC_TOMBSTONE_RETENTION_DAYS
+    cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+    with Session(engine) as session:
+        result = session.exec(delete(Tombstone).where(Tombstone.deleted_at < cutoff))
+        session.commit()
+    print(f"pruned {result.rowcount} tombstones older than {days} days")
+
+
+def cmd_prune_jobs(args: argparse.Namespace) -> None:
+    from datetime import datetime, timedelta, timezone
+
+    from sqlalchemy import delete
+
+    from app.core.config import settings
+    from app.models import Job
+    from app.models.job import DONE, FAILED
+
+    days = args.days if args.days is not None else settings.JOB_RETENTION_DAYS
+    cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+    with Session(engine) as session:
+        result = session.exec(
+            delete(Job).where(Job.state.in_((DONE, FAILED)), Job.finished_at < cutoff)
+        )
+        session.commit()
+    print(f"pruned {result.rowcount} finished jobs older than {days} days")
+
+
+def cmd_worker(args: argparse.Namespace) -> None:
+    import app.services.enrichment  # noqa: F401  (registers its job handlers)
+    from app.services.jobs import job_queue
+
+    async def run() -> None:
+        job_queue.start(args.workers)
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await job_queue.aclose()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+def cmd_rebuild_stats(args: argparse.Namespace) -> None:
+    from app.db.rollups import rebuild_rollups
+
+    with engine.begin() as conn:
+        counters = rebuild_rollups(conn)
+    print(f"rebuilt {counters} stats counters")
+
+
+def cmd_rebuild_shelf_counts(args: argparse.Namespace) -> None:
+    from sqlalchemy import delete, func, insert
+
+    from app.models import BookShelf, ShelfCount
+
+    with Session(engine) as session:
+        session.exec(delete(ShelfCount))
+        counts = select(BookShelf.user_id, BookShelf.shelf_id, func.count()).group_by(
+            BookShelf.user_id, BookShelf.shelf_id
+        )
+        session.exec(insert(ShelfCount).from_select(["user_id", "shelf_id", "count"], counts))
+        session.commit()
+        rows = session.exec(select(func.count()).select_from(ShelfCount)).one()
+    print(f"rebuilt {rows} shelf counts")
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("enrich", help="look up metadata for every unmatched intake item")
+    p.set_defaults(func=cmd_enrich)
+
+    p = sub.add_parser("match", help="link unmatched intake items to existing catalog books")
+    p.set_defaults(func=cmd_match)
+
+    p = sub.add_parser("lookup-cache", help="show or clear the metadata lookup cache")
+    p.add_argument("action", choices=["stats", "clear"])
+    p.set_defaults(func=cmd_lookup_cache)
+
+    p = sub.add_parser("rebuild-search", help="rebuild the full-text search index")
+    p.set_defaults(func=cmd_rebuild_search)
+
+    p = sub.add_parser("vacuum", help="compact the SQLite database and rebuild search")
+    p.set_defaults(func=cmd_vacuum)
+
+    p = sub.add_parser(
+        "backfill-identifiers", help="normalize ISBNs and register existing edition identifiers"
+    )
+    p.set_defaults(func=cmd_backfill_identifiers)
+
+    p = sub.add_parser(
+        "backfill-owned-links", help="link owned items imported from the inbox to their capture"
+    )
+    p.set_defaults(func=cmd_backfill_owned_links)
+
+    p = sub.add_parser("backfill-dedup", help="fingerprint existing intake items for dedup")
+    p.add_argument("--chunk-size", type=int, default=1000)
+    p.set_defaults(func=cmd_backfill_dedup)
+
+    p = sub.add_parser("reparse", help="re-run the capture parser over stored intake items")
+    p.add_argument("--all", action="store_true", help="also reparse rows already at this version")
+    p.add_argument("--chunk-size", type=int, default=1000)
+    p.set_defaults(func=cmd_reparse)
+
+    p = sub.add_parser("rebuild-stats", help="recompute the per-user /stats rollups")
+    p.set_defaults(func=cmd_rebuild_stats)
+
+    p = sub.add_parser("rebuild-shelf-counts", help="recompute per-shelf book counts")
+    p.set_defaults(func=cmd_rebuild_shelf_counts)
+
+    p = sub.add_parser("prune-tombstones", help="forget deletions older than the sync window")
+    p.add_argument("--days", type=int, help="default: SYNC_TOMBSTONE_RETENTION_DAYS")
+    p.set_defaults(func=cmd_prune_tombstones)
+
+    p = sub.add_parser("prune-jobs", help="delete finished background jobs")
+    p.add_argument("--days", type=int, help="default: JOB_RETENTION_DAYS")
+    p.set_defaults(func=cmd_prune_jobs)
+
+    p = sub.add_parser("worker", help="run background jobs without serving the API")
+    p.add_argument("--workers", type=int, help="default: JOB_WORKERS")
+    p.set_defaults(func=cmd_worker)
+
+    args = parser.parse_args(argv)
+    init_db()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
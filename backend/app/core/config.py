@@ -10,6 +10,18 @@ class Settings(BaseSettings):
     SECRET_KEY: str = "change-me-in-prod"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7  # 7 days
 
+    # Password hashing: bcrypt cost, and the dedicated process pool that runs it. Logins
+    # beyond PASSWORD_HASH_MAX_PENDING in flight get a fast 503 instead of queueing.
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 16
+
+    # Auth cache: how long a decoded token / active user record is trusted without a DB read.
+    # This is also the staleness window: a user deactivated by another process, or by a
+    # Core UPDATE rather than the ORM, keeps access for up to this long.
+    AUTH_CACHE_TTL_SECONDS: int = 60
+    AUTH_CACHE_MAX_USERS: int = 1024
+
     ADMIN_EMAIL: str = "you@example.com"
     ADMIN_PASSWORD: str = "change-me"
     ADMIN_DISPLAY_NAME: str = "Admin"
@@ -18,6 +30,97 @@ class Settings(BaseSettings):
 
     DATABASE_URL: str = "sqlite:///./dogeared.db"
 
+    # Production SQLite profile: WAL + tuned pragmas, read-only pool for GETs, small writer pool
+    SQLITE_PRODUCTION_MODE: bool = False
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024  # bytes
+    SQLITE_CACHE_SIZE_KB: int = 64 * 1024
+    DB_READ_POOL_SIZE: int = 8
+    DB_WRITE_POOL_SIZE: int = 2
+
+    # POST /intake/batch: rows per transaction, and the most items one request may carry
+    INTAKE_BATCH_CHUNK_SIZE: int = 500
+    INTAKE_BATCH_MAX_ITEMS: int = 10_000
+
+    # Rows fetched per round trip by the streaming /export endpoints
+    EXPORT_BATCH_SIZE: int = 500
+
+    # Metadata enrichment (Open Library + Google Books). Base URLs are overridable so the
+    # engine can be pointed at a local stub server.
+    ENRICH_ON_CAPTURE: bool = True
+    OPENLIBRARY_BASE_URL: str = "https://openlibrary.org"
+    OPENLIBRARY_COVERS_URL: str = "https://covers.openlibrary.org"
+    GOOGLE_BOOKS_BASE_URL: str = "https://www.googleapis.com/books/v1"
+    GOOGLE_BOOKS_API_KEY: str | None = None
+    OPENLIBRARY_CONCURRENCY: int = 4
+    GOOGLE_BOOKS_CONCURRENCY: int = 4
+    ENRICH_TIMEOUT_SECONDS: float = 10.0
+    ENRICH_MAX_RETRIES: int = 3
+    ENRICH_BACKOFF_SECONDS: float = 0.5
+    ENRICH_MATCH_THRESHOLD: float = 0.85
+    ENRICH_BATCH_SIZE: int = 25
+
+    # On-disk cache of provider responses (its own SQLite file, independent of DATABASE_URL)
+    LOOKUP_CACHE_ENABLED: bool = True
+    LOOKUP_CACHE_PATH: str = "./lookup_cache.db"
+    LOOKUP_CACHE_MAX_ENTRIES: int = 100_000
+    LOOKUP_CACHE_TTL_SECONDS: int = 60 * 60 * 24 * 30  # 30 days
+    LOOKUP_CACHE_MISS_TTL_SECONDS: int = 60 * 60 * 24  # 1 day
+
+    # Local catalog matching (rapidfuzz over an in-memory blocking index of Book titles)
+    MATCH_THRESHOLD: float = 0.9
+    MATCH_MAX_CANDIDATES: int = 50
+    MATCH_INDEX_REFRESH_SECONDS: int = 300
+
+    # Capture dedup: a capture whose text is this similar (shingle Jaccard) to an earlier
+    # one of the user's is linked to it, or merged into it when nothing new came with it
+    DEDUP_ON_CAPTURE: bool = True
+    DEDUP_THRESHOLD: float = 0.8
+    DEDUP_MAX_CANDIDATES: int = 50
+
+    # Cover proxy: thumbnails cached on disk by content hash (docker-compose points this
+    # at the /data volume), evicted oldest-first past the byte budget
+    COVER_CACHE_DIR: str = "./data/covers"
+    COVER_CACHE_MAX_BYTES: int = 512 * 1024 * 1024
+    COVER_MAX_SOURCE_BYTES: int = 10 * 1024 * 1024
+    COVER_FETCH_TIMEOUT_SECONDS: float = 10
+    COVER_MAX_AGE_SECONDS: int = 60 * 60 * 24 * 30  # 30 days
+
+    # Delta sync: deletions are remembered this long; older tokens get a full resync.
+    # The overlap re-sends the last few seconds of changes so a write that was still in
+    # flight when a token was issued can't be skipped.
+    SYNC_TOMBSTONE_RETENTION_DAYS: int = 90
+    SYNC_OVERLAP_SECONDS: float = 5
+
+    # Source conversion analytics: results cached per user and collection versions, so
+    # any intake/owned/source write invalidates them
+    ANALYTICS_CACHE_MAX_ENTRIES: int = 1000
+    ANALYTICS_CACHE_TTL_SECONDS: int = 600
+
+    # Background jobs: a pool of asyncio workers started with the app, polling the job
+    # table (and woken early by new work). A claimed job is leased for JOB_LEASE_SECONDS,
+    # which also caps how long one attempt may run; failures retry with exponential
+    # backoff. Finished jobs are kept JOB_RETENTION_DAYS for the admin stats. With
+    # JOBS_ENABLED off, jobs still queue but only `python -m app.cli worker` runs them.
+    JOBS_ENABLED: bool = True
+    JOB_WORKERS: int = 2
+    JOB_POLL_SECONDS: float = 2.0
+    JOB_LEASE_SECONDS: int = 300
+    JOB_MAX_ATTEMPTS: int = 5
+    JOB_BACKOFF_SECONDS: float = 5.0
+    JOB_BACKOFF_MAX_SECONDS: float = 60 * 60
+    JOB_RETENTION_DAYS: int = 7
+
+    # Request metrics: per-route latency histograms and SQL accounting, served at /metrics
+    # to admins only. METRICS_PUBLIC drops the auth for a scraper on a private network.
+    METRICS_ENABLED: bool = True
+    METRICS_PUBLIC: bool = False
+
+    # Slow-query log: statements at or above this many ms are logged with their
+    # EXPLAIN QUERY PLAN and aggregated by normalized SQL. 0 turns it off.
+    SLOW_QUERY_MS: float = 0
+    SLOW_QUERY_MAX_STATEMENTS: int = 500
+
     # Feature flags
     ALLOW_OPEN_REGISTRATION: bool = False  # future switch
 
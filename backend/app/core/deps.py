@@ -1,30 +1,89 @@
+import hashlib
+import time
+from uuid import UUID
+
 from fastapi import Depends, HTTPException
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from sqlmodel import Session, select
-from uuid import UUID
+from sqlalchemy import event
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.core.cache import TTLCache
+from app.core.config import settings
 from app.core.security import decode_token
-from app.db.session import get_session
+from app.db.session import get_read_session
 from app.models import User
 
 bearer = HTTPBearer(auto_error=False)
 
-def get_current_user(
-    creds: HTTPAuthorizationCredentials | None = Depends(bearer),
-    session: Session = Depends(get_session),
-) -> User:
-    if not creds:
-        raise HTTPException(status_code=401, detail="Not authenticated")
+# Authenticated requests would otherwise decode the JWT and SELECT the user every time.
+# token_cache maps sha256(token) -> user id; user_cache holds the column values of active
+# users, and every request gets its own User built from them.
+token_cache = TTLCache(
+    maxsize=settings.AUTH_CACHE_MAX_USERS * 4, ttl=settings.AUTH_CACHE_TTL_SECONDS
+)
+user_cache = TTLCache(maxsize=settings.AUTH_CACHE_MAX_USERS, ttl=settings.AUTH_CACHE_TTL_SECONDS)
+
+
+def invalidate_user(user_id: UUID) -> None:
+    """Drop a cached user so the next request re-reads it from the database."""
+    user_cache.pop(user_id)
+
+
+# ORM writes in this process evict at once. Core UPDATEs and writes made by other
+# processes don't fire these, so those reach cached users only once
+# AUTH_CACHE_TTL_SECONDS has passed.
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_cached_user(_mapper, _connection, target: User) -> None:
+    invalidate_user(target.id)
+
+
+def _user_id_from_token(token: str) -> UUID:
+    key = hashlib.sha256(token.encode("utf-8")).hexdigest()
+    user_id = token_cache.get(key)
+    if user_id is not None:
+        return user_id
 
     try:
-        payload = decode_token(creds.credentials)
+        payload = decode_token(token)
         sub = payload.get("sub")
         user_id = UUID(sub)  # ✅ convert token subject string -> UUID
     except Exception:
         raise HTTPException(status_code=401, detail="Invalid token")
 
-    user = session.exec(select(User).where(User.id == user_id)).first()
+    # Never cache a decoded token past its own expiry.
+    exp = payload.get("exp")
+    remaining = exp - time.time() if isinstance(exp, (int, float)) else None
+    token_cache.set(key, user_id, ttl=remaining)
+    return user_id
+
+
+async def get_current_user(
+    creds: HTTPAuthorizationCredentials | None = Depends(bearer),
+    session: AsyncSession = Depends(get_read_session),
+) -> User:
+    if not creds:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+
+    user_id = _user_id_from_token(creds.credentials)
+
+    cached = user_cache.get(user_id)
+    if cached is not None:
+        # A fresh instance per request, so a handler changing it can't leak into others.
+        return User(**cached)
+
+    user = (await session.exec(select(User).where(User.id == user_id))).first()
     if not user or not user.is_active:
         raise HTTPException(status_code=401, detail="Invalid token")
 
+    # Cache plain values so nothing refers back to this request's session.
+    values = user.model_dump()
+    user_cache.set(user_id, values)
+    return User(**values)
+
+
+async def get_admin_user(user: User = Depends(get_current_user)) -> User:
+    if not user.is_admin:
+        raise HTTPException(status_code=403, detail="Admin only")
     return user
@@ -0,0 +1,72 @@
+import hashlib
+from collections.abc import Iterable
+from uuid import UUID
+
+from fastapi import Request, Response
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models import CollectionVersion
+
+INTAKE = "intake"
+OWNED = "owned"
+SOURCES = "sources"
+
+# Lists are per-user: browsers may keep them but must revalidate; shared caches must not.
+CACHE_CONTROL = "private, no-cache"
+
+
+def bump_stmt(dialect: str, user_id: UUID, collection: str):
+    """Upsert that increments (or starts) a user's collection version.
+
+    Run it in the same transaction as the write so the two commit together.
+    """
+    insert = pg_insert if dialect == "postgresql" else sqlite_insert
+    stmt = insert(CollectionVersion).values(user_id=user_id, collection=collection, version=1)
+    return stmt.on_conflict_do_update(
+        index_elements=["user_id", "collection"],
+        set_={"version": CollectionVersion.version + 1},
+    )
+
+
+async def bump(session: AsyncSession, user_id: UUID, *collections: str) -> None:
+    dialect = session.get_bind().dialect.name
+    for collection in collections:
+        await session.exec(bump_stmt(dialect, user_id, collection))
+
+
+async def list_etag(
+    session: AsyncSession, request: Request, user_id: UUID, collections: Iterable[str]
+) -> str:
+    """Strong ETag for a list response: the user, the collection versions and the query."""
+    collections = sorted(collections)
+    rows = (
+        await session.exec(
+            select(CollectionVersion.collection, CollectionVersion.version).where(
+                CollectionVersion.user_id == user_id,
+                CollectionVersion.collection.in_(collections),
+            )
+        )
+    ).all()
+    versions = dict(rows)
+    key = "|".join(
+        [user_id.hex, *(f"{c}={versions.get(c, 0)}" for c in collections), str(request.url.query)]
+    )
+    return '"' + hashlib.sha256(key.encode("utf-8")).hexdigest()[:32] + '"'
+
+
+def not_modified(request: Request, etag: str) -> Response | None:
+    """A 304 when If-None-Match already names this ETag, else None."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return None
+    tags = {t.strip().removeprefix("W/") for t in header.split(",")}
+    if etag in tags or "*" in tags:
+        return Response(status_code=304, headers=etag_headers(etag))
+    return None
+
+
+def etag_headers(etag: str) -> dict[str, str]:
+    return {"ETag": etag, "Cache-Control": CACHE_CONTROL}
@@ -0,0 +1,78 @@
+import csv
+import io
+import json
+from collections.abc import AsyncIterator, Sequence
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Any
+from uuid import UUID
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy.sql import Select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.db.session import async_read_engine
+
+
+class ExportFormat(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+_MEDIA_TYPES = {
+    ExportFormat.ndjson: "application/x-ndjson",
+    ExportFormat.csv: "text/csv; charset=utf-8",
+}
+
+
+def _cell(value: Any) -> Any:
+    if isinstance(value, datetime):
+        # SQLite hands back naive datetimes; everything is stored as UTC.
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+async def _stream_rows(
+    stmt: Select, fieldnames: Sequence[str], fmt: ExportFormat
+) -> AsyncIterator[bytes]:
+    # The request's session is closed once the handler returns, so the stream owns its own.
+    async with AsyncSession(async_read_engine) as session:
+        result = await session.stream(
+            stmt.execution_options(yield_per=settings.EXPORT_BATCH_SIZE)
+        )
+        if fmt == ExportFormat.csv:
+            buf = io.StringIO()
+            writer = csv.writer(buf)
+            writer.writerow(fieldnames)
+            yield buf.getvalue().encode("utf-8")
+
+        async for partition in result.partitions():
+            if fmt == ExportFormat.csv:
+                buf = io.StringIO()
+                writer = csv.writer(buf)
+                writer.writerows([_cell(v) for v in row] for row in partition)
+                yield buf.getvalue().encode("utf-8")
+            else:
+                yield "".join(
+                    json.dumps(dict(zip(fieldnames, map(_cell, row))), ensure_ascii=False) + "\n"
+                    for row in partition
+                ).encode("utf-8")
+
+
+def export_response(
+    stmt: Select, fieldnames: Sequence[str], fmt: ExportFormat, filename: str
+) -> StreamingResponse:
+    """Stream `stmt`'s rows as NDJSON or CSV without materializing the result set.
+
+    `stmt` must select plain columns in the same order as `fieldnames`.
+    """
+    return StreamingResponse(
+        _stream_rows(stmt, fieldnames, fmt),
+        media_type=_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{fmt.value}"'},
+    )
@@ -0,0 +1,69 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from fastapi import HTTPException
+
+from app.core import security
+from app.core.config import settings
+
+
+class PasswordHasher:
+    """bcrypt in its own small process pool, with a cap on work in flight.
+
+    bcrypt is CPU-bound by design. In the shared threadpool a burst of logins would tie
+    up the threads every sync endpoint needs; here it gets PASSWORD_HASH_WORKERS
+    processes, and once PASSWORD_HASH_MAX_PENDING calls are in flight the next one is
+    turned away with a 503 at once rather than queueing behind them.
+    """
+
+    def __init__(self, workers: int, max_pending: int) -> None:
+        self.workers = workers
+        self.max_pending = max_pending
+        self.pending = 0
+        self._executor: ProcessPoolExecutor | None = None
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn: the server process has threads (aiosqlite, the enrichment client)
+            # and forking those is unsafe.
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    async def _run(self, fn, *args):
+        if self.pending >= self.max_pending:
+            raise HTTPException(
+                status_code=503,
+                detail="Too many sign-ins in progress, try again shortly",
+                headers={"Retry-After": "1"},
+            )
+        self.pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._pool(), fn, *args)
+        except BrokenProcessPool:
+            # A worker died (OOM, killed); start a fresh pool on the next call.
+            self._executor = None
+            raise HTTPException(status_code=503, detail="Password service restarting")
+        finally:
+            self.pending -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self._run(security.hash_password, password)
+
+    async def verify_and_update(
+        self, password: str, password_hash: str
+    ) -> tuple[bool, str | None]:
+        return await self._run(security.verify_and_update, password, password_hash)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS, max_pending=settings.PASSWORD_HASH_MAX_PENDING
+)
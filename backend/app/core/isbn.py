@@ -0,0 +1,55 @@
+import re
+
+_STRIP_RE = re.compile(r"[\s\-‐-―]")
+
+
+def clean(raw: str) -> str:
+    """Drop spaces and hyphens (including typographic dashes); uppercase the X check digit."""
+    return _STRIP_RE.sub("", raw or "").upper()
+
+
+def is_valid_isbn10(value: str) -> bool:
+    if len(value) != 10 or not value[:9].isdigit() or not (value[9].isdigit() or value[9] == "X"):
+        return False
+    total = sum((10 - i) * int(d) for i, d in enumerate(value[:9]))
+    total += 10 if value[9] == "X" else int(value[9])
+    return total % 11 == 0
+
+
+def _isbn13_check_digit(first12: str) -> str:
+    total = sum(int(d) * (1 if i % 2 == 0 else 3) for i, d in enumerate(first12))
+    return str((10 - total % 10) % 10)
+
+
+def is_valid_isbn13(value: str) -> bool:
+    return (
+        len(value) == 13
+        and value.isdigit()
+        and value[:3] in ("978", "979")
+        and _isbn13_check_digit(value[:12]) == value[12]
+    )
+
+
+def isbn10_to_13(value: str) -> str:
+    first12 = "978" + value[:9]
+    return first12 + _isbn13_check_digit(first12)
+
+
+def isbn13_to_10(value: str) -> str | None:
+    """Only 978-prefixed ISBN-13s have an ISBN-10 form."""
+    if not value.startswith("978"):
+        return None
+    body = value[3:12]
+    total = sum((10 - i) * int(d) for i, d in enumerate(body))
+    check = (11 - total % 11) % 11
+    return body + ("X" if check == 10 else str(check))
+
+
+def to_isbn13(raw: str | None) -> str | None:
+    """Canonical ISBN-13 for any valid ISBN-10/13 spelling, or None if it isn't one."""
+    value = clean(raw or "")
+    if is_valid_isbn13(value):
+        return value
+    if is_valid_isbn10(value):
+        return isbn10_to_13(value)
+    return None
@@ -0,0 +1,201 @@
+import contextvars
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.db.session import async_engine, async_read_engine
+
+# Seconds; roughly exponential from "cached" to "something is badly wrong".
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SERVER_TIMING_HEADER = "Server-Timing"
+
+
+@dataclass
+class RequestStats:
+    queries: int = 0
+    db_seconds: float = 0.0
+
+
+# The request being served; SQLAlchemy's events fire in the awaiting task, so queries
+# land on the right request even with many in flight.
+_current: contextvars.ContextVar[RequestStats | None] = contextvars.ContextVar(
+    "request_stats", default=None
+)
+
+
+@event.listens_for(async_engine.sync_engine, "before_cursor_execute")
+@event.listens_for(async_read_engine.sync_engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._metrics_started = time.perf_counter()
+
+
+@event.listens_for(async_engine.sync_engine, "after_cursor_execute")
+@event.listens_for(async_read_engine.sync_engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    started = getattr(context, "_metrics_started", None)
+    if stats is None or started is None:
+        return
+    stats.queries += 1
+    stats.db_seconds += time.perf_counter() - started
+
+
+class Histogram:
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.total = 0.0
+
+    def observe(self, value: float) -> None:
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.total += value
+
+
+class MetricsRegistry:
+    """Per-route request metrics, rendered in the Prometheus text format."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.latency: dict[tuple[str, str], Histogram] = {}
+        self.responses: dict[tuple[str, str, int], int] = defaultdict(int)
+        self.db_queries: dict[tuple[str, str], int] = defaultdict(int)
+        self.db_seconds: dict[tuple[str, str], float] = defaultdict(float)
+
+    def record(
+        self, method: str, route: str, status: int, seconds: float, stats: RequestStats
+    ) -> None:
+        key = (method, route)
+        with self._lock:
+            hist = self.latency.get(key)
+            if hist is None:
+                hist = self.latency[key] = Histogram(LATENCY_BUCKETS)
+            hist.observe(seconds)
+            self.responses[(method, route, status)] += 1
+            self.db_queries[key] += stats.queries
+            self.db_seconds[key] += stats.db_seconds
+
+    def clear(self) -> None:
+        with self._lock:
+            self.latency.clear()
+            self.responses.clear()
+            self.db_queries.clear()
+            self.db_seconds.clear()
+
+    def render(self) -> str:
+        lines: list[str] = []
+        with self._lock:
+            lines += [
+                "# HELP http_request_duration_seconds Request latency by route.",
+                "# TYPE http_request_duration_seconds histogram",
+            ]
+            for (method, route), hist in sorted(self.latency.items()):
+                labels = f'method="{method}",route="{_escape(route)}"'
+                cumulative = 0
+                for bound, count in zip(hist.buckets, hist.counts):
+                    cumulative += count
+                    lines.append(
+                        f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} '
+                        f"{cumulative}"
+                    )
+                cumulative += hist.counts[-1]
+                lines.append(
+                    f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {cumulative}'
+                )
+                lines.append(f"http_request_duration_seconds_sum{{{labels}}} {hist.total:.6f}")
+                lines.append(f"http_request_duration_seconds_count{{{labels}}} {cumulative}")
+
+            lines += [
+                "# HELP http_responses_total Responses by route and status code.",
+                "# TYPE http_responses_total counter",
+            ]
+            for (method, route, status), count in sorted(self.responses.items()):
+                lines.append(
+                    f'http_responses_total{{method="{method}",route="{_escape(route)}",'
+                    f'status="{status}"}} {count}'
+                )
+
+            lines += [
+                "# HELP db_queries_total SQL statements executed while serving a route.",
+                "# TYPE db_queries_total counter",
+            ]
+            for (method, route), count in sorted(self.db_queries.items()):
+                lines.append(
+                    f'db_queries_total{{method="{method}",route="{_escape(route)}"}} {count}'
+                )
+
+            lines += [
+                "# HELP db_query_seconds_total Time spent in SQL while serving a route.",
+                "# TYPE db_query_seconds_total counter",
+            ]
+            for (method, route), seconds in sorted(self.db_seconds.items()):
+                lines.append(
+                    f'db_query_seconds_total{{method="{method}",route="{_escape(route)}"}} '
+                    f"{seconds:.6f}"
+                )
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+metrics = MetricsRegistry()
+
+
+class MetricsMiddleware:
+    """Times each HTTP request, counts its SQL, and adds a Server-Timing header.
+
+    Plain ASGI rather than BaseHTTPMiddleware so streaming exports pass straight
+    through. Routes are labelled by their template (``/owned/{owned_id}``), never the
+    raw path, to keep the label set bounded.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                app_ms = (time.perf_counter() - started) * 1000
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    SERVER_TIMING_HEADER,
+                    f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.queries} queries", '
+                    f"app;dur={app_ms:.1f}",
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            route = scope.get("route")
+            metrics.record(
+                scope["method"],
+                getattr(route, "path", None) or "unmatched",
+                status,
+                time.perf_counter() - started,
+                stats,
+            )
@@ -0,0 +1,27 @@
+import base64
+from datetime import datetime
+from uuid import UUID
+
+from fastapi import HTTPException
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+# Response header carrying the cursor for the next page (absent on the last page).
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(ts: datetime, item_id: UUID) -> str:
+    """Build an opaque keyset cursor from the last row's sort key."""
+    raw = f"{ts.isoformat()}|{item_id.hex}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8")
+        ts, item_id = raw.split("|", 1)
+        return datetime.fromisoformat(ts), UUID(hex=item_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
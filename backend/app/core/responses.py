@@ -0,0 +1,31 @@
+from collections.abc import Iterable, Sequence
+from typing import Any
+
+import orjson
+from fastapi import Response
+
+
+class FastJSONResponse(Response):
+    """JSON rendered straight to bytes by orjson.
+
+    orjson encodes UUIDs and datetimes natively, so list endpoints can hand it plain
+    column tuples instead of building and re-validating a Pydantic model per row.
+    Endpoints keep their ``response_model`` for the OpenAPI schema; a returned
+    Response bypasses validation.
+    """
+
+    media_type = "application/json"
+    option = 0
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=self.option)
+
+
+class UTCJSONResponse(FastJSONResponse):
+    """Naive datetimes (what SQLite hands back) are encoded as UTC, with a ``Z`` suffix."""
+
+    option = orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z
+
+
+def rows_to_dicts(keys: Sequence[str], rows: Iterable[Sequence[Any]]) -> list[dict[str, Any]]:
+    return [dict(zip(keys, row)) for row in rows]
@@ -6,12 +6,18 @@ from passlib.context import CryptContext
 
 from app.core.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Hashes made at another cost still verify; verify_and_update reports them as stale.
+pwd_context = CryptContext(
+    schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS
+)
 ALGORITHM = "HS256"
 
+# bcrypt only looks at this many bytes of a password.
+MAX_PASSWORD_BYTES = 72
+
 
 def hash_password(password: str) -> str:
-    if len(password.encode("utf-8")) > 72:
+    if len(password.encode("utf-8")) > MAX_PASSWORD_BYTES:
         raise ValueError("Password too long (bcrypt max is 72 bytes).")
     return pwd_context.hash(password)
 
@@ -20,6 +26,11 @@ def verify_password(password: str, password_hash: str) -> bool:
     return pwd_context.verify(password, password_hash)
 
 
+def verify_and_update(password: str, password_hash: str) -> tuple[bool, str | None]:
+    """Verify, and return a fresh hash too when the stored one uses an outdated cost."""
+    return pwd_context.verify_and_update(password, password_hash)
+
+
 def create_access_token(subject: str, expires_minutes: Optional[int] = None) -> str:
     expire = datetime.now(timezone.utc) + timedelta(
         minutes=expires_minutes or settings.ACCESS_TOKEN_EXPIRE_MINUTES
@@ -0,0 +1,30 @@
+import base64
+from datetime import datetime, timezone
+from uuid import UUID
+
+from fastapi import HTTPException
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models import Tombstone
+
+
+def encode_token(ts: datetime) -> str:
+    """Opaque sync token: the point in time the next delta starts from."""
+    raw = ts.astimezone(timezone.utc).isoformat().encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_token(token: str) -> datetime:
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        ts = datetime.fromisoformat(base64.urlsafe_b64decode(padded.encode("ascii")).decode())
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid sync token")
+    if ts.tzinfo is None:
+        raise HTTPException(status_code=400, detail="Invalid sync token")
+    return ts
+
+
+def record_deletion(session: AsyncSession, user_id: UUID, collection: str, item_id: UUID) -> None:
+    """Leave a tombstone for a hard-deleted row, in the same transaction as the delete."""
+    session.add(Tombstone(user_id=user_id, collection=collection, item_id=item_id))
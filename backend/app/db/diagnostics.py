@@ -0,0 +1,140 @@
+import logging
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+
+from sqlalchemy import Engine, event
+
+logger = logging.getLogger("app.db.slow_queries")
+
+_EXPLAINABLE = ("select", "with", "update", "delete")
+_IN_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_SPACE_RE = re.compile(r"\s+")
+# Full scans of a real table ("SCAN intakeitem"), optionally through an index that only
+# supplies order; virtual tables (FTS) report SCAN for their own lookups and are skipped.
+_SCAN_RE = re.compile(r"\bSCAN (?!CONSTANT ROW)(\w+)\b(?! VIRTUAL TABLE)")
+_TEMP_BTREE_RE = re.compile(r"USE TEMP B-TREE FOR (\w[\w ]*)")
+
+
+def normalize_statement(statement: str) -> str:
+    """Collapse whitespace, literals and expanded IN lists so variants aggregate together."""
+    text = _STRING_RE.sub("?", statement)
+    text = _NUMBER_RE.sub("?", text)
+    text = _IN_LIST_RE.sub("(?...)", text)
+    return _SPACE_RE.sub(" ", text).strip()
+
+
+@dataclass
+class SlowStatement:
+    statement: str
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    plan: list[str] = field(default_factory=list)
+    flags: list[str] = field(default_factory=list)
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_ms / self.count if self.count else 0.0
+
+
+def plan_flags(plan: list[str]) -> list[str]:
+    flags: list[str] = []
+    for line in plan:
+        if m := _SCAN_RE.search(line):
+            flags.append(f"full scan: {m.group(1)}")
+        if m := _TEMP_BTREE_RE.search(line):
+            flags.append(f"temp b-tree: {m.group(1).strip().lower()}")
+    return list(dict.fromkeys(flags))
+
+
+class SlowQueryLog:
+    """Statements slower than a threshold, grouped by normalized SQL.
+
+    The first time a statement shape turns up slow, its ``EXPLAIN QUERY PLAN`` is run on
+    the same connection (SQLite only) and kept with the aggregate; full table scans and
+    temp B-tree sorts are flagged, since those are what a composite index fixes.
+    """
+
+    def __init__(self, threshold_ms: float, max_statements: int = 500) -> None:
+        self.threshold_ms = threshold_ms
+        self.max_statements = max_statements
+        self.statements: dict[str, SlowStatement] = {}
+        self._lock = threading.Lock()
+
+    def install(self, engine: Engine) -> None:
+        event.listen(engine, "before_cursor_execute", self._before)
+        event.listen(engine, "after_cursor_execute", self._after)
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        if context is not None:
+            context._slow_query_started = time.perf_counter()
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        started = getattr(context, "_slow_query_started", None)
+        if started is None:
+            return
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if elapsed_ms < self.threshold_ms:
+            return
+
+        key = normalize_statement(statement)
+        with self._lock:
+            entry = self.statements.get(key)
+            is_new = entry is None
+            if is_new:
+                if len(self.statements) >= self.max_statements:
+                    return
+                entry = self.statements[key] = SlowStatement(statement=key)
+            entry.count += 1
+            entry.total_ms += elapsed_ms
+            entry.max_ms = max(entry.max_ms, elapsed_ms)
+
+        if is_new and not executemany:
+            entry.plan = self._explain(conn, statement, parameters)
+            entry.flags = plan_flags(entry.plan)
+        logger.warning(
+            "slow query %.1f ms%s: %s%s",
+            elapsed_ms,
+            f" [{', '.join(entry.flags)}]" if entry.flags else "",
+            key,
+            "".join(f"\n    {line}" for line in entry.plan) if is_new else "",
+        )
+
+    @staticmethod
+    def _explain(conn, statement: str, parameters) -> list[str]:
+        if conn.dialect.name != "sqlite" or not statement.lstrip().lower().startswith(
+            _EXPLAINABLE
+        ):
+            return []
+        # Straight on the DBAPI connection so this doesn't re-enter the engine events.
+        cursor = conn.connection.dbapi_connection.cursor()
+        try:
+            cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)
+            return [row[3] for row in cursor.fetchall()]
+        except Exception:
+            logger.debug("EXPLAIN QUERY PLAN failed", exc_info=True)
+            return []
+        finally:
+            cursor.close()
+
+    def report(self, limit: int = 20) -> str:
+        """The worst statement shapes by total time, with their plans and flags."""
+        with self._lock:
+            entries = sorted(self.statements.values(), key=lambda e: e.total_ms, reverse=True)
+        lines = []
+        for e in entries[:limit]:
+            lines.append(
+                f"{e.total_ms:9.1f} ms total  {e.count:6d}x  mean {e.mean_ms:7.1f} ms  "
+                f"max {e.max_ms:7.1f} ms  {e.statement}"
+            )
+            lines.extend(f"    plan: {line}" for line in e.plan)
+            lines.extend(f"    !! {flag}" for flag in e.flags)
+        return "\n".join(lines)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.statements.clear()
@@ -0,0 +1,149 @@
+from collections import Counter
+from collections.abc import Iterable
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import Connection, delete, event, insert, inspect, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.models import IntakeItem, OwnedItem, UserStat
+
+# Per-user counters behind GET /stats, keyed (metric, key). Every ORM flush that adds,
+# changes or deletes an IntakeItem/OwnedItem turns into a handful of upserts in the same
+# transaction, so the capture, enrichment, matching and owned paths all stay counted
+# without each having to remember to. Core-level writes bypass the ORM and must apply
+# their own deltas (see ``delta_stmt``); ``rebuild_rollups`` repairs everything.
+INTAKE_STATUS = "intake_status"
+INTAKE_SOURCE = "intake_source"
+INTAKE_MONTH = "intake_month"
+OWNED_FORMAT = "owned_format"
+OWNED_FAVORITE = "owned_favorite"
+OWNED_MONTH = "owned_month"
+
+_INTAKE_FIELDS = ("status", "source_id", "captured_at")
+_OWNED_FIELDS = ("format", "is_favorite", "acquired_at", "created_at")
+
+Key = tuple[UUID, str, str]
+
+
+def _month(ts: datetime | None) -> str:
+    return ts.strftime("%Y-%m") if ts else "unknown"
+
+
+def intake_keys(
+    status: str, source_id: UUID | None, captured_at: datetime
+) -> list[tuple[str, str]]:
+    return [
+        (INTAKE_STATUS, status),
+        (INTAKE_SOURCE, str(source_id) if source_id else "none"),
+        (INTAKE_MONTH, _month(captured_at)),
+    ]
+
+
+def owned_keys(
+    format: str, is_favorite: bool, acquired_at: datetime | None, created_at: datetime
+) -> list[tuple[str, str]]:
+    return [
+        (OWNED_FORMAT, format),
+        (OWNED_FAVORITE, "true" if is_favorite else "false"),
+        # Acquisitions count in the month the book was acquired, if known.
+        (OWNED_MONTH, _month(acquired_at or created_at)),
+    ]
+
+
+_TRACKED = {IntakeItem: (_INTAKE_FIELDS, intake_keys), OwnedItem: (_OWNED_FIELDS, owned_keys)}
+
+
+def delta_stmt(dialect: str, user_id: UUID, metric: str, key: str, delta: int):
+    """Upsert that adds ``delta`` to one of a user's counters."""
+    insert_ = pg_insert if dialect == "postgresql" else sqlite_insert
+    stmt = insert_(UserStat.__table__).values(
+        user_id=user_id, metric=metric, key=key, count=delta
+    )
+    return stmt.on_conflict_do_update(
+        index_elements=["user_id", "metric", "key"],
+        set_={"count": UserStat.__table__.c.count + delta},
+    )
+
+
+def _keys(obj, fields: tuple[str, ...], keys_fn, *, old: bool) -> list[tuple[str, str]]:
+    if not old:
+        return keys_fn(*(getattr(obj, f) for f in fields))
+    state = inspect(obj)
+    values = []
+    for f in fields:
+        history = state.attrs[f].history
+        values.append(history.deleted[0] if history.deleted else getattr(obj, f))
+    return keys_fn(*values)
+
+
+def _flush_deltas(session: Session) -> Counter[Key]:
+    deltas: Counter[Key] = Counter()
+    for obj in session.new:
+        if (tracked := _TRACKED.get(type(obj))) is not None:
+            for metric, key in _keys(obj, *tracked, old=False):
+                deltas[(obj.user_id, metric, key)] += 1
+    for obj in session.deleted:
+        if (tracked := _TRACKED.get(type(obj))) is not None:
+            for metric, key in _keys(obj, *tracked, old=True):
+                deltas[(obj.user_id, metric, key)] -= 1
+    for obj in session.dirty:
+        if (tracked := _TRACKED.get(type(obj))) is None:
+            continue
+        before = _keys(obj, *tracked, old=True)
+        after = _keys(obj, *tracked, old=False)
+        if before == after:
+            continue
+        for metric, key in before:
+            deltas[(obj.user_id, metric, key)] -= 1
+        for metric, key in after:
+            deltas[(obj.user_id, metric, key)] += 1
+    return deltas
+
+
+def _before_flush(session: Session, _flush_context, _instances) -> None:
+    deltas = _flush_deltas(session)
+    if not deltas:
+        return
+    dialect = session.get_bind().dialect.name
+    for (user_id, metric, key), delta in deltas.items():
+        if delta:
+            session.execute(delta_stmt(dialect, user_id, metric, key, delta))
+
+
+def install() -> None:
+    # On the Session class, so async sessions (whose flushes run a sync Session
+    # underneath) and the CLI's sync sessions are both covered.
+    if not event.contains(Session, "before_flush", _before_flush):
+        event.listen(Session, "before_flush", _before_flush)
+
+
+def _count_rows(rows: Iterable, keys_fn) -> Counter[Key]:
+    counts: Counter[Key] = Counter()
+    for user_id, *values in rows:
+        for metric, key in keys_fn(*values):
+            counts[(user_id, metric, key)] += 1
+    return counts
+
+
+def rebuild_rollups(conn: Connection) -> int:
+    """Recompute every counter from the source tables; returns the number of counters."""
+    intake = conn.execute(
+        select(IntakeItem.user_id, *(getattr(IntakeItem, f) for f in _INTAKE_FIELDS))
+    )
+    owned = conn.execute(
+        select(OwnedItem.user_id, *(getattr(OwnedItem, f) for f in _OWNED_FIELDS))
+    )
+    counts = _count_rows(intake, intake_keys) + _count_rows(owned, owned_keys)
+    conn.execute(delete(UserStat))
+    if counts:
+        conn.execute(
+            insert(UserStat),
+            [
+                {"user_id": user_id, "metric": metric, "key": key, "count": n}
+                for (user_id, metric, key), n in counts.items()
+            ],
+        )
+    return len(counts)
@@ -0,0 +1,48 @@
+from sqlalchemy import Connection, text
+
+# FTS5 external-content indexes over the searchable text columns. Each index stores
+# only the token data and points back at its table's rowid; triggers keep it in step
+# with every insert/update/delete. These tables have UUID keys, so the rowid is
+# implicit and VACUUM may renumber it: init_db rebuilds every index at startup, and
+# `python -m app.cli vacuum` rebuilds them straight after compacting.
+FTS_TABLES: dict[str, tuple[str, tuple[str, ...]]] = {
+    "owneditem_fts": ("owneditem", ("title", "author", "notes")),
+    "intakeitem_fts": ("intakeitem", ("raw_text",)),
+    "book_fts": ("book", ("title", "primary_author", "description")),
+}
+
+
+def _ddl(fts: str, table: str, columns: tuple[str, ...]) -> list[str]:
+    cols = ", ".join(columns)
+    new = ", ".join(f"new.{c}" for c in columns)
+    old = ", ".join(f"old.{c}" for c in columns)
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"{cols}, content='{table}', content_rowid='rowid', "
+        "tokenize='unicode61 remove_diacritics 2')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.rowid, {new}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.rowid, {old}); END",
+        # Only text edits touch the index; status flips and the like skip it.
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {cols} ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.rowid, {old}); "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.rowid, {new}); END",
+    ]
+
+
+def ensure_search_schema(conn: Connection) -> None:
+    """Create missing FTS tables/triggers and rebuild every index from its table.
+
+    The rebuild re-reads current rowids, so an index left pointing at rowids renumbered
+    by a VACUUM since the last start is repaired rather than silently wrong.
+    """
+    for fts, (table, columns) in FTS_TABLES.items():
+        for stmt in _ddl(fts, table, columns):
+            conn.execute(text(stmt))
+    rebuild_search_index(conn)
+
+
+def rebuild_search_index(conn: Connection) -> None:
+    for fts in FTS_TABLES:
+        conn.execute(text(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')"))
@@ -1,15 +1,162 @@
-from sqlmodel import SQLModel, create_engine, Session
+from sqlalchemy import Connection, event, inspect, literal, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core.config import settings
+from app.db import rollups
+from app.db.diagnostics import SlowQueryLog
+from app.db.search import ensure_search_schema
+from app.models import UserStat
 
-connect_args = {"check_same_thread": False} if settings.DATABASE_URL.startswith("sqlite") else {}
-engine = create_engine(settings.DATABASE_URL, echo=False, connect_args=connect_args)
+# DATABASE_URL may name either a sync or an async driver; requests run on the async
+# driver while startup DDL and maintenance commands use the sync one.
+_ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}
+
+_url = make_url(settings.DATABASE_URL)
+_backend = _url.get_backend_name()
+async_url = _url.set(drivername=_ASYNC_DRIVERS.get(_backend, _url.drivername))
+sync_url = _url.set(drivername=_backend) if _url.drivername in _ASYNC_DRIVERS.values() else _url
+
+is_sqlite = _backend == "sqlite"
+connect_args = {"check_same_thread": False} if is_sqlite else {}
+
+# Production SQLite: WAL lets readers run alongside the single writer, so GET handlers get
+# their own query_only pool while writes funnel through a small dedicated writer pool.
+# In-memory databases are per-connection and can't be split.
+use_sqlite_profile = (
+    is_sqlite and settings.SQLITE_PRODUCTION_MODE and _url.database not in (None, "", ":memory:")
+)
+
+engine = create_engine(sync_url, echo=False, connect_args=connect_args)
+
+if use_sqlite_profile:
+    async_engine = create_async_engine(
+        async_url,
+        echo=False,
+        connect_args=connect_args,
+        pool_size=settings.DB_WRITE_POOL_SIZE,
+        max_overflow=0,
+    )
+    async_read_engine = create_async_engine(
+        async_url,
+        echo=False,
+        connect_args=connect_args,
+        pool_size=settings.DB_READ_POOL_SIZE,
+        max_overflow=0,
+    )
+else:
+    async_engine = create_async_engine(async_url, echo=False, connect_args=connect_args)
+    async_read_engine = async_engine
+
+
+def _apply_sqlite_pragmas(dbapi_connection, query_only: bool) -> None:
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+    # Negative cache_size is in KiB rather than pages.
+    cursor.execute(f"PRAGMA cache_size={-int(settings.SQLITE_CACHE_SIZE_KB)}")
+    if query_only:
+        cursor.execute("PRAGMA query_only=ON")
+    cursor.close()
+
+
+if use_sqlite_profile:
+
+    @event.listens_for(engine, "connect")
+    @event.listens_for(async_engine.sync_engine, "connect")
+    def _on_write_connect(dbapi_connection, _record):
+        _apply_sqlite_pragmas(dbapi_connection, query_only=False)
+
+    @event.listens_for(async_read_engine.sync_engine, "connect")
+    def _on_read_connect(dbapi_connection, _record):
+        _apply_sqlite_pragmas(dbapi_connection, query_only=True)
+
+
+# Opt-in diagnostics: see SLOW_QUERY_MS. Every engine is covered, CLI runs included.
+slow_query_log: SlowQueryLog | None = None
+if settings.SLOW_QUERY_MS > 0:
+    slow_query_log = SlowQueryLog(settings.SLOW_QUERY_MS, settings.SLOW_QUERY_MAX_STATEMENTS)
+    for _engine in {engine, async_engine.sync_engine, async_read_engine.sync_engine}:
+        slow_query_log.install(_engine)
+
+
+# Keeps the GET /stats counters in step with every ORM write.
+rollups.install()
+
+
+def _add_missing_columns(conn: Connection) -> list[tuple[str, str]]:
+    """ALTER in columns added to a model after its table was created.
+
+    They go in nullable, with the model's scalar default (if any) as the column default.
+    """
+    inspector = inspect(conn)
+    added = []
+    for table in SQLModel.metadata.sorted_tables:
+        existing = {c["name"] for c in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            ddl = f"ALTER TABLE {table.name} ADD COLUMN {column.name} "
+            ddl += column.type.compile(dialect=conn.dialect)
+            if column.default is not None and column.default.is_scalar:
+                # Existing rows take the model's default rather than NULL.
+                value = literal(column.default.arg, column.type).compile(
+                    dialect=conn.dialect, compile_kwargs={"literal_binds": True}
+                )
+                ddl += f" DEFAULT {value}"
+            conn.execute(text(ddl))
+            added.append((table.name, column.name))
+    return added
+
+
+def _drop_stale_unique_indexes(conn: Connection) -> None:
+    # An index that is unique in the database but no longer in the model (shelf names
+    # became unique per user rather than globally) is dropped; the pass below then
+    # recreates it as the model defines it.
+    inspector = inspect(conn)
+    for table in SQLModel.metadata.sorted_tables:
+        model = {index.name: index.unique for index in table.indexes}
+        for index in inspector.get_indexes(table.name):
+            if index["unique"] and model.get(index["name"]) is False:
+                conn.execute(text(f"DROP INDEX {index['name']}"))
 
 
 def init_db() -> None:
+    had_rollups = inspect(engine).has_table(UserStat.__tablename__)
     SQLModel.metadata.create_all(engine)
+    # create_all skips tables that already exist, so columns and indexes added to an
+    # existing model would never reach an older database without these passes.
+    with engine.begin() as conn:
+        for table_name, column_name in _add_missing_columns(conn):
+            if column_name == "updated_at":
+                # Existing rows last changed no later than they were created, as far as
+                # delta sync can tell.
+                conn.execute(text(f"UPDATE {table_name} SET updated_at = created_at"))
+        if not had_rollups:
+            # New table on an existing database: count what's already there.
+            rollups.rebuild_rollups(conn)
+    with engine.begin() as conn:
+        _drop_stale_unique_indexes(conn)
+    for table in SQLModel.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
+    if is_sqlite:
+        with engine.begin() as conn:
+            ensure_search_schema(conn)
+
+
+async def get_session():
+    # expire_on_commit=False: attribute access after commit must not trigger lazy IO.
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        yield session
 
 
-def get_session():
-    with Session(engine) as session:
+async def get_read_session():
+    """Session for read-only handlers; served from the query_only pool when enabled."""
+    async with AsyncSession(async_read_engine, expire_on_commit=False) as session:
         yield session
@@ -1,8 +1,31 @@
+import logging
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.core.config import settings
-from app.routers import health, auth, intake, sources, owned
+from app.core.metrics import SERVER_TIMING_HEADER, MetricsMiddleware
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.db import session as db_session
+from app.routers import (
+    admin,
+    auth,
+    covers,
+    health,
+    intake,
+    owned,
+    search,
+    shelves,
+    sources,
+    stats,
+    sync,
+)
+from app.services.covers import cover_cache
+from app.services.enrichment import enricher
+from app.services.jobs import job_queue
+from app.services.lookup_cache import lookup_cache
+
+logger = logging.getLogger(__name__)
 
 app = FastAPI(
     title=settings.APP_NAME,
@@ -21,13 +44,43 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, SERVER_TIMING_HEADER],
 )
 
+# Added last so it wraps everything else, CORS included.
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 app.include_router(health.router, tags=["health"])
 app.include_router(auth.router, prefix="/auth", tags=["auth"])
 app.include_router(intake.router, prefix="/intake", tags=["intake"])
 app.include_router(sources.router, prefix="/sources", tags=["sources"])
 app.include_router(owned.router, prefix="/owned", tags=["owned"])
+app.include_router(search.router, prefix="/search", tags=["search"])
+app.include_router(covers.router, prefix="/covers", tags=["covers"])
+app.include_router(sync.router, prefix="/sync", tags=["sync"])
+app.include_router(shelves.router, prefix="/shelves", tags=["shelves"])
+app.include_router(stats.router, prefix="/stats", tags=["stats"])
+app.include_router(admin.router, prefix="/admin", tags=["admin"])
+
+
+@app.on_event("startup")
+async def _startup():
+    # After the routers' own startup hooks, so the schema exists before workers poll it.
+    if settings.JOBS_ENABLED:
+        job_queue.start()
+
+
+@app.on_event("shutdown")
+async def _shutdown():
+    # First, so interrupted jobs are handed back while the database is still there.
+    await job_queue.aclose()
+    await enricher.aclose()
+    await cover_cache.aclose()
+    lookup_cache.close()
+    if db_session.slow_query_log is not None and db_session.slow_query_log.statements:
+        logger.warning("slow queries this run:\n%s", db_session.slow_query_log.report())
+
 
 @app.get("/")
 def root():
@@ -1,9 +1,14 @@
 from app.models.user import User, Invite
 from app.models.book import Book
 from app.models.edition import Edition, Copy
-from app.models.intake import Source, IntakeItem
-from app.models.shelf import Shelf, BookShelf, BookShelfHistory
+from app.models.identifier import BookIdentifier
+from app.models.intake import Source, IntakeItem, IntakeDedupBucket
+from app.models.shelf import Shelf, BookShelf, BookShelfHistory, ShelfCount
 from .owned import OwnedItem
+from app.models.version import CollectionVersion
+from app.models.sync import Tombstone
+from app.models.stats import UserStat
+from app.models.job import Job
 
 __all__ = [
     "User",
@@ -11,10 +16,17 @@ __all__ = [
     "Book",
     "Edition",
     "Copy",
+    "BookIdentifier",
     "Source",
     "IntakeItem",
+    "IntakeDedupBucket",
     "Shelf",
     "BookShelf",
     "BookShelfHistory",
+    "ShelfCount",
     "OwnedItem",
+    "CollectionVersion",
+    "Tombstone",
+    "UserStat",
+    "Job",
 ]
@@ -0,0 +1,26 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID, uuid4
+
+from sqlmodel import Field, SQLModel, UniqueConstraint
+
+# Schemes that name one specific edition; anything else (e.g. an Open Library work)
+# only identifies the book.
+EDITION_SCHEMES = ("isbn13", "olid", "google_volume")
+
+
+class BookIdentifier(SQLModel, table=True):
+    """Canonical external identifier -> Book/Edition, one row per (scheme, value).
+
+    Schemes: isbn13 (always normalized ISBN-13), olid (Open Library edition),
+    olwork (Open Library work), google_volume (Google Books volume id).
+    """
+
+    __table_args__ = (UniqueConstraint("scheme", "value", name="uq_bookidentifier_scheme_value"),)
+
+    id: UUID = Field(default_factory=uuid4, primary_key=True, index=True)
+    scheme: str
+    value: str
+    book_id: UUID = Field(index=True)
+    edition_id: Optional[UUID] = Field(default=None, index=True)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
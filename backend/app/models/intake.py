@@ -2,7 +2,7 @@ from datetime import datetime, timezone
 from typing import Optional
 from uuid import UUID, uuid4
 
-from sqlmodel import Column, Field, JSON, SQLModel
+from sqlmodel import Column, Field, Index, JSON, SQLModel
 
 
 def utcnow() -> datetime:
@@ -11,6 +11,9 @@ def utcnow() -> datetime:
 
 
 class Source(SQLModel, table=True):
+    # Delta sync: a user's rows changed since a point in time.
+    __table_args__ = (Index("ix_source_user_updated", "user_id", "updated_at"),)
+
     id: UUID = Field(default_factory=uuid4, primary_key=True, index=True)
     user_id: UUID = Field(index=True)
     type: str = Field(default="other", index=True)  # tiktok/family/friend/etc.
@@ -18,9 +21,20 @@ class Source(SQLModel, table=True):
     url: Optional[str] = None
     notes: Optional[str] = None
     created_at: datetime = Field(default_factory=utcnow)
+    updated_at: datetime = Field(default_factory=utcnow, sa_column_kwargs={"onupdate": utcnow})
 
 
 class IntakeItem(SQLModel, table=True):
+    # Keyset pagination: newest-first inbox pages, with and without a status filter.
+    __table_args__ = (
+        Index("ix_intakeitem_user_status_captured", "user_id", "status", "captured_at", "id"),
+        Index("ix_intakeitem_user_captured", "user_id", "captured_at", "id"),
+        # Delta sync.
+        Index("ix_intakeitem_user_updated", "user_id", "updated_at"),
+        # Exact-duplicate lookup at capture time.
+        Index("ix_intakeitem_user_fingerprint", "user_id", "fingerprint"),
+    )
+
     id: UUID = Field(default_factory=uuid4, primary_key=True, index=True)
     user_id: UUID = Field(index=True)
     raw_text: str
@@ -31,4 +45,24 @@ class IntakeItem(SQLModel, table=True):
     matched_book_id: Optional[UUID] = Field(default=None, index=True)
     match_confidence: Optional[float] = None
     parse_json: dict = Field(default_factory=dict, sa_column=Column(JSON))
-    created_at: datetime = Field(default_factory=utcnow)
\ No newline at end of file
+    # Capture dedup (app.services.dedup): a hash of the normalized title/author text;
+    # repeat captures of one book point at the first with duplicate_of_id, which counts
+    # every capture of it in capture_count.
+    fingerprint: Optional[str] = None
+    duplicate_of_id: Optional[UUID] = Field(default=None, index=True)
+    capture_count: int = 1
+    created_at: datetime = Field(default_factory=utcnow)
+    updated_at: datetime = Field(default_factory=utcnow, sa_column_kwargs={"onupdate": utcnow})
+
+
+class IntakeDedupBucket(SQLModel, table=True):
+    """LSH band bucket of a capture's MinHash signature (first captures only).
+
+    Captures whose signatures agree on a whole band share a bucket, so near-duplicate
+    candidates are a primary-key lookup instead of a scan of the user's inbox.
+    """
+
+    user_id: UUID = Field(primary_key=True)
+    bucket: str = Field(primary_key=True)
+    # Indexed so a capture's buckets can be replaced when it is re-parsed.
+    intake_id: UUID = Field(primary_key=True, index=True)
@@ -0,0 +1,41 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID, uuid4
+
+from sqlmodel import Column, Field, Index, JSON, SQLModel
+
+from app.models.intake import utcnow
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class Job(SQLModel, table=True):
+    """A unit of background work, run by the worker pool in app.services.jobs.
+
+    A worker claims a job by moving it to running with a lease; if the worker dies, the
+    lease expires and another one picks the job up again. Failed attempts are retried
+    with backoff until max_attempts, after which the job stays failed for inspection.
+    """
+
+    __table_args__ = (
+        # Claiming: the next due queued job, or a running one whose lease ran out.
+        Index("ix_job_state_run_at", "state", "run_at"),
+        # Throughput over a recent window, and pruning.
+        Index("ix_job_state_finished", "state", "finished_at"),
+    )
+
+    id: UUID = Field(default_factory=uuid4, primary_key=True)
+    kind: str
+    payload: dict = Field(default_factory=dict, sa_column=Column(JSON))
+    state: str = QUEUED  # queued/running/done/failed
+    attempts: int = 0
+    max_attempts: int = 5
+    run_at: datetime = Field(default_factory=utcnow)
+    lease_expires_at: Optional[datetime] = None
+    last_error: Optional[str] = None
+    created_at: datetime = Field(default_factory=utcnow)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
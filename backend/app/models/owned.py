@@ -2,10 +2,19 @@ from datetime import datetime
 from typing import Optional
 from uuid import UUID, uuid4
 
-from sqlmodel import Field, SQLModel
+from sqlmodel import Field, Index, SQLModel
 
 
 class OwnedItem(SQLModel, table=True):
+    # Keyset pagination: newest-first shelf pages.
+    __table_args__ = (
+        Index("ix_owneditem_user_created", "user_id", "created_at", "id"),
+        # Delta sync.
+        Index("ix_owneditem_user_updated", "user_id", "updated_at"),
+        # Source conversion analytics: a user's owned items that came from the inbox.
+        Index("ix_owneditem_user_intake", "user_id", "intake_id"),
+    )
+
     id: UUID = Field(default_factory=uuid4, primary_key=True, index=True)
     user_id: UUID = Field(index=True)
 
@@ -19,4 +28,13 @@ class OwnedItem(SQLModel, table=True):
     acquired_at: Optional[datetime] = None
 
     notes: Optional[str] = None
+
+    # Set when the book was bought off an inbox capture; source_id is copied from the
+    # capture so the link survives it being archived or removed.
+    intake_id: Optional[UUID] = Field(default=None, index=True)
+    source_id: Optional[UUID] = Field(default=None, index=True)
+
     created_at: datetime = Field(default_factory=datetime.utcnow, index=True)
+    updated_at: datetime = Field(
+        default_factory=datetime.utcnow, sa_column_kwargs={"onupdate": datetime.utcnow}
+    )
@@ -1,15 +1,24 @@
 from datetime import datetime
+from typing import Optional
 from uuid import UUID, uuid4
 
-from sqlmodel import Field, SQLModel
+from sqlmodel import Field, Index, SQLModel
 
 
 class Shelf(SQLModel, table=True):
+    """A named shelf. Shelves belong to the user who made them; rows from before
+    shelves were per-user have no user_id and stay shared by everyone."""
+
+    __table_args__ = (Index("ux_shelf_user_name", "user_id", "name", unique=True),)
+
     id: UUID = Field(default_factory=uuid4, primary_key=True, index=True)
-    name: str = Field(index=True, unique=True)
+    user_id: Optional[UUID] = Field(default=None, index=True)
+    name: str = Field(index=True)
 
 
 class BookShelf(SQLModel, table=True):
+    __table_args__ = (Index("ix_bookshelf_user_shelf", "user_id", "shelf_id"),)
+
     user_id: UUID = Field(primary_key=True)
     book_id: UUID = Field(primary_key=True)
     shelf_id: UUID
@@ -24,3 +33,14 @@ class BookShelfHistory(SQLModel, table=True):
     to_shelf_id: UUID
     timestamp: datetime = Field(default_factory=datetime.utcnow)
     note: str | None = None
+
+
+class ShelfCount(SQLModel, table=True):
+    """Books per shelf for one user, kept in step with BookShelf by app.services.shelves.
+
+    ``python -m app.cli rebuild-shelf-counts`` recomputes it from BookShelf.
+    """
+
+    user_id: UUID = Field(primary_key=True)
+    shelf_id: UUID = Field(primary_key=True)
+    count: int = 0
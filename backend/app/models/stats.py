@@ -0,0 +1,16 @@
+from uuid import UUID
+
+from sqlmodel import Field, SQLModel
+
+
+class UserStat(SQLModel, table=True):
+    """One per-user rollup counter, e.g. (user, "owned_format", "paperback") -> 12.
+
+    Maintained on every ORM flush by app.db.rollups; ``python -m app.cli rebuild-stats``
+    recomputes the table from IntakeItem and OwnedItem.
+    """
+
+    user_id: UUID = Field(primary_key=True)
+    metric: str = Field(primary_key=True)
+    key: str = Field(primary_key=True)
+    count: int = 0
@@ -0,0 +1,22 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from sqlmodel import Field, Index, SQLModel
+
+from app.models.intake import utcnow
+
+
+class Tombstone(SQLModel, table=True):
+    """A hard-deleted row, kept so delta sync can tell clients it is gone.
+
+    Pruned after SYNC_TOMBSTONE_RETENTION_DAYS; tokens older than that get a full resync.
+    """
+
+    __table_args__ = (Index("ix_tombstone_user_deleted", "user_id", "deleted_at"),)
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    user_id: UUID
+    collection: str  # intake/owned/sources, as in app.core.etag
+    item_id: UUID
+    deleted_at: datetime = Field(default_factory=utcnow)
@@ -0,0 +1,14 @@
+from uuid import UUID
+
+from sqlmodel import Field, SQLModel
+
+
+class CollectionVersion(SQLModel, table=True):
+    """Per-user change counter for a list collection (intake/owned/sources).
+
+    Every write to the collection bumps it; list endpoints derive their ETag from it.
+    """
+
+    user_id: UUID = Field(primary_key=True)
+    collection: str = Field(primary_key=True)
+    version: int = 0
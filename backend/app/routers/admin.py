@@ -0,0 +1,67 @@
+from fastapi import APIRouter, Depends, Query
+from pydantic import BaseModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.deps import get_admin_user
+from app.db.session import get_read_session
+from app.models import User
+from app.services.jobs import job_queue, queue_stats
+
+router = APIRouter()
+
+
+class JobKindOut(BaseModel):
+    kind: str
+    queued: int
+    running: int
+    done: int
+    failed: int
+
+
+class JobWorkersOut(BaseModel):
+    workers: int
+    done: int
+    retried: int
+    failed: int
+
+
+class JobQueueOut(BaseModel):
+    queued: int
+    due: int
+    running: int
+    oldest_due_seconds: float | None
+    window_seconds: int
+    done: int
+    failed: int
+    per_minute: float
+    kinds: list[JobKindOut]
+    # This process's workers since startup.
+    process: JobWorkersOut
+
+
+@router.get("/jobs", response_model=JobQueueOut)
+async def job_queue_stats(
+    window: int = Query(3600, ge=60, le=60 * 60 * 24 * 7, description="seconds"),
+    _admin: User = Depends(get_admin_user),
+    session: AsyncSession = Depends(get_read_session),
+):
+    """Queue depth now, and throughput over the last ``window`` seconds."""
+    stats = await queue_stats(session, window)
+    counters = job_queue.counters
+    return JobQueueOut(
+        queued=stats.queued,
+        due=stats.due,
+        running=stats.running,
+        oldest_due_seconds=stats.oldest_due_seconds,
+        window_seconds=stats.window_seconds,
+        done=stats.done,
+        failed=stats.failed,
+        per_minute=round((stats.done + stats.failed) * 60 / window, 2),
+        kinds=[JobKindOut(**vars(k)) for k in stats.kinds],
+        process=JobWorkersOut(
+            workers=job_queue.workers,
+            done=counters.done,
+            retried=counters.retried,
+            failed=counters.failed,
+        ),
+    )
@@ -2,13 +2,16 @@ from datetime import datetime, timedelta
 from uuid import uuid4
 
 from fastapi import APIRouter, Depends, HTTPException
-from pydantic import BaseModel, EmailStr
-from sqlmodel import Session, select
+from pydantic import BaseModel, EmailStr, field_validator
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core.config import settings
 from app.core.deps import get_current_user
-from app.core.security import create_access_token, hash_password, verify_password
-from app.db.session import get_session, init_db
+from app.core.hashing import password_hasher
+from app.core.security import MAX_PASSWORD_BYTES, create_access_token
+from app.db.session import async_engine, get_session, init_db
 from app.models import Invite, User
 
 router = APIRouter()
@@ -30,6 +33,13 @@ class RegisterIn(BaseModel):
     password: str
     invite_token: str
 
+    @field_validator("password")
+    @classmethod
+    def _password_fits_bcrypt(cls, value: str) -> str:
+        if len(value.encode("utf-8")) > MAX_PASSWORD_BYTES:
+            raise ValueError(f"must be at most {MAX_PASSWORD_BYTES} bytes")
+        return value
+
 
 class InviteCreateIn(BaseModel):
     email: EmailStr
@@ -42,43 +52,60 @@ class InviteOut(BaseModel):
     expires_at: datetime
 
 
-def ensure_bootstrap_admin(session: Session) -> None:
+async def ensure_bootstrap_admin(session: AsyncSession) -> None:
     """Create the first admin user if it doesn't exist."""
-    existing = session.exec(select(User).where(User.email == settings.ADMIN_EMAIL)).first()
+    existing = (await session.exec(select(User).where(User.email == settings.ADMIN_EMAIL))).first()
     if existing:
         return
     admin = User(
         email=settings.ADMIN_EMAIL,
         display_name=settings.ADMIN_DISPLAY_NAME,
-        password_hash=hash_password(settings.ADMIN_PASSWORD),
+        password_hash=await password_hasher.hash(settings.ADMIN_PASSWORD),
         is_admin=True,
         is_active=True,
     )
     session.add(admin)
-    session.commit()
+    try:
+        await session.commit()
+    except IntegrityError:
+        # Another worker process starting alongside this one created it first.
+        await session.rollback()
 
 
 @router.on_event("startup")
-def _startup():
+async def _startup():
     init_db()
+    # Once per process here rather than on every login/register/invite.
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        await ensure_bootstrap_admin(session)
+
+
+@router.on_event("shutdown")
+def _shutdown():
+    password_hasher.shutdown()
 
 
 @router.post("/login", response_model=TokenOut)
-def login(payload: LoginIn, session: Session = Depends(get_session)):
-    ensure_bootstrap_admin(session)
-    user = session.exec(select(User).where(User.email == payload.email)).first()
+async def login(payload: LoginIn, session: AsyncSession = Depends(get_session)):
+    user = (await session.exec(select(User).where(User.email == payload.email))).first()
     if not user or not user.is_active:
         raise HTTPException(status_code=401, detail="Invalid credentials")
-    if not verify_password(payload.password, user.password_hash):
+    # bcrypt is deliberately slow; it runs in its own bounded process pool.
+    ok, new_hash = await password_hasher.verify_and_update(payload.password, user.password_hash)
+    if not ok:
         raise HTTPException(status_code=401, detail="Invalid credentials")
+    if new_hash:
+        # Stored with an older BCRYPT_ROUNDS; upgrade now that we have the plaintext.
+        user.password_hash = new_hash
+        session.add(user)
+        await session.commit()
     return TokenOut(access_token=create_access_token(str(user.id)))
 
 
 @router.post("/invite", response_model=InviteOut)
-def create_invite(payload: InviteCreateIn, session: Session = Depends(get_session)):
+async def create_invite(payload: InviteCreateIn, session: AsyncSession = Depends(get_session)):
     # V1: keep this simple (admin check will be added when auth middleware lands)
-    ensure_bootstrap_admin(session)
-    admin = session.exec(select(User).where(User.email == settings.ADMIN_EMAIL)).first()
+    admin = (await session.exec(select(User).where(User.email == settings.ADMIN_EMAIL))).first()
     token = uuid4().hex + uuid4().hex
     expires_at = datetime.utcnow() + timedelta(hours=payload.expires_hours)
     inv = Invite(
@@ -88,31 +115,31 @@ def create_invite(payload: InviteCreateIn, session: Session = Depends(get_sessio
         created_by_user_id=admin.id,
     )
     session.add(inv)
-    session.commit()
+    await session.commit()
     return InviteOut(email=payload.email, token=token, expires_at=expires_at)
 
 
 @router.post("/register")
-def register(payload: RegisterIn, session: Session = Depends(get_session)):
-    ensure_bootstrap_admin(session)
-
+async def register(payload: RegisterIn, session: AsyncSession = Depends(get_session)):
     if settings.ALLOW_OPEN_REGISTRATION:
         invite = None
     else:
-        invite = session.exec(select(Invite).where(Invite.token == payload.invite_token)).first()
+        invite = (
+            await session.exec(select(Invite).where(Invite.token == payload.invite_token))
+        ).first()
         if not invite or invite.used_at is not None:
             raise HTTPException(status_code=400, detail="Invalid invite token")
         if invite.expires_at < datetime.utcnow():
             raise HTTPException(status_code=400, detail="Invite token expired")
 
-    existing = session.exec(select(User).where(User.email == payload.email)).first()
+    existing = (await session.exec(select(User).where(User.email == payload.email))).first()
     if existing:
         raise HTTPException(status_code=400, detail="Email already registered")
 
     user = User(
         email=payload.email,
         display_name=payload.display_name,
-        password_hash=hash_password(payload.password),
+        password_hash=await password_hasher.hash(payload.password),
         is_active=True,
         is_admin=False,
     )
@@ -120,12 +147,12 @@ def register(payload: RegisterIn, session: Session = Depends(get_session)):
     if invite:
         invite.used_at = datetime.utcnow()
         session.add(invite)
-    session.commit()
+    await session.commit()
     return {"ok": True}
 
 
 @router.get("/me")
-def me(user: User = Depends(get_current_user)):
+async def me(user: User = Depends(get_current_user)):
     return {
         "id": str(user.id),
         "email": user.email,
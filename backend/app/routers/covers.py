@@ -0,0 +1,71 @@
+from typing import Literal
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import Response
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.core.etag import not_modified
+from app.db.session import get_read_session
+from app.models import Book, Edition
+from app.services.covers import CoverError, CoverMissing, cover_cache
+
+router = APIRouter()
+
+
+async def _cover_url(session: AsyncSession, cover_id: UUID) -> str | None:
+    book = await session.get(Book, cover_id)
+    if book is not None:
+        if book.cover_url:
+            return book.cover_url
+        # No cover on the work itself; any edition's will do.
+        res = await session.exec(
+            select(Edition.cover_url)
+            .where(Edition.book_id == cover_id, Edition.cover_url.is_not(None))
+            .limit(1)
+        )
+        return res.first()
+    edition = await session.get(Edition, cover_id)
+    return edition.cover_url if edition is not None else None
+
+
+# Public on purpose: <img> tags can't send a bearer token, and covers are catalog data
+# shared by every user, not anything from someone's library.
+@router.get("/{cover_id}")
+async def get_cover(
+    cover_id: UUID,
+    request: Request,
+    size: Literal["s", "m", "l"] = "m",
+    format: Literal["webp", "jpeg"] | None = Query(default=None),
+    session: AsyncSession = Depends(get_read_session),
+):
+    url = await _cover_url(session, cover_id)
+    if not url:
+        raise HTTPException(status_code=404, detail="No cover for this book")
+
+    fmt = format
+    if fmt is None:
+        fmt = "webp" if "image/webp" in request.headers.get("accept", "") else "jpeg"
+
+    try:
+        thumb = await cover_cache.thumbnail(url, size, fmt)
+    except CoverMissing as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except CoverError as e:
+        raise HTTPException(status_code=502, detail=str(e))
+
+    # Content-addressed, so a given URL+size+format never changes under its ETag.
+    headers = {
+        "ETag": thumb.etag,
+        "Cache-Control": f"public, max-age={settings.COVER_MAX_AGE_SECONDS}",
+    }
+    if format is None:
+        headers["Vary"] = "Accept"
+
+    cached = not_modified(request, thumb.etag)
+    if cached is not None:
+        cached.headers.update(headers)
+        return cached
+    return Response(thumb.content, media_type=thumb.media_type, headers=headers)
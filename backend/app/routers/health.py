@@ -1,4 +1,9 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+
+from app.core.config import settings
+from app.core.deps import get_admin_user
+from app.core.metrics import metrics
 
 router = APIRouter()
 
@@ -6,3 +11,13 @@ router = APIRouter()
 @router.get("/health")
 def health():
     return {"ok": True}
+
+
+# Route inventory and per-route query counts are nobody else's business.
+@router.get(
+    "/metrics",
+    response_class=PlainTextResponse,
+    dependencies=[] if settings.METRICS_PUBLIC else [Depends(get_admin_user)],
+)
+def prometheus_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
@@ -1,13 +1,32 @@
+import json
+from collections.abc import AsyncIterator
 from datetime import datetime, timezone
+from typing import Any
 from uuid import UUID
 
-from fastapi import APIRouter, Depends
-from pydantic import BaseModel
-from sqlmodel import Session, select
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from pydantic import BaseModel, ValidationError, field_validator
+from sqlalchemy import tuple_, union_all
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.core import etag
+from app.core.config import settings
 from app.core.deps import get_current_user
-from app.db.session import get_session
+from app.core.export import ExportFormat, export_response
+from app.core.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    NEXT_CURSOR_HEADER,
+    decode_cursor,
+    encode_cursor,
+)
+from app.core.responses import UTCJSONResponse, rows_to_dicts
+from app.db.session import get_read_session, get_session
 from app.models import IntakeItem, Source, User
+from app.services import dedup
+from app.services.enrichment import enqueue_enrichment
+from app.services.parser import capture_status, parse_capture
 
 router = APIRouter()
 
@@ -18,6 +37,20 @@ class IntakeCreateIn(BaseModel):
     source_post_url: str | None = None
 
 
+class IntakeBatchItemIn(IntakeCreateIn):
+    # Queued share-sheet captures keep the time they were actually captured.
+    captured_at: datetime | None = None
+
+    @field_validator("captured_at")
+    @classmethod
+    def _captured_at_utc(cls, value: datetime | None) -> datetime | None:
+        # Stored naive in UTC like every other captured_at, so inbox order and keyset
+        # cursors compare like with like; naive input is taken to be UTC already.
+        if value is not None and value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+
+
 class IntakeOut(BaseModel):
     id: str
     raw_text: str
@@ -27,6 +60,24 @@ class IntakeOut(BaseModel):
     source_name: str | None
     source_type: str | None
     source_post_url: str | None
+    capture_count: int
+    duplicate_of_id: str | None
+
+
+class IntakeBatchResult(BaseModel):
+    index: int
+    ok: bool
+    # Counted on an earlier capture of the same book rather than stored as a new item.
+    merged: bool = False
+    item: IntakeOut | None = None
+    error: str | None = None
+
+
+class IntakeBatchOut(BaseModel):
+    created: int
+    merged: int
+    failed: int
+    results: list[IntakeBatchResult]
 
 
 def _as_utc(dt: datetime) -> datetime:
@@ -36,16 +87,33 @@ def _as_utc(dt: datetime) -> datetime:
     return dt
 
 
+def _intake_out(item: IntakeItem, src: Source | None) -> IntakeOut:
+    return IntakeOut(
+        id=str(item.id),
+        raw_text=item.raw_text,
+        status=item.status,
+        captured_at=_as_utc(item.captured_at),
+        source_id=str(item.source_id) if item.source_id else None,
+        source_name=src.name if src else None,
+        source_type=src.type if src else None,
+        source_post_url=item.source_post_url,
+        capture_count=item.capture_count,
+        duplicate_of_id=str(item.duplicate_of_id) if item.duplicate_of_id else None,
+    )
+
+
 def _is_tiktok_url(url: str | None) -> bool:
     if not url:
         return False
     return "tiktok.com" in url.lower()
 
 
-def _ensure_tiktok_source(session: Session, user_id: UUID) -> UUID:
+async def _ensure_tiktok_source(session: AsyncSession, user_id: UUID) -> UUID:
     """Find or create the user's canonical TikTok Source and return its id."""
-    existing = session.exec(
-        select(Source).where(Source.user_id == user_id, Source.type == "tiktok")
+    existing = (
+        await session.exec(
+            select(Source).where(Source.user_id == user_id, Source.type == "tiktok")
+        )
     ).first()
     if existing:
         return existing.id
@@ -59,89 +127,406 @@ def _ensure_tiktok_source(session: Session, user_id: UUID) -> UUID:
         created_at=datetime.now(timezone.utc),
     )
     session.add(s)
-    session.commit()
-    session.refresh(s)
+    await etag.bump(session, user_id, etag.SOURCES)
+    await session.commit()
+    await session.refresh(s)
     return s.id
 
 
-def _sources_by_id(session: Session, user_id: UUID, ids: set[UUID]) -> dict[UUID, Source]:
+async def _sources_by_id(
+    session: AsyncSession, user_id: UUID, ids: set[UUID]
+) -> dict[UUID, Source]:
     if not ids:
         return {}
-    rows = session.exec(
-        select(Source).where(Source.user_id == user_id, Source.id.in_(ids))
+    rows = (
+        await session.exec(select(Source).where(Source.user_id == user_id, Source.id.in_(ids)))
     ).all()
     return {s.id: s for s in rows}
 
 
+# Column order matches IntakeOut; shared by the list fast path, the export and /sync.
+OUT_COLUMNS = (
+    IntakeItem.id,
+    IntakeItem.raw_text,
+    IntakeItem.status,
+    IntakeItem.captured_at,
+    IntakeItem.source_id,
+    Source.name,
+    Source.type,
+    IntakeItem.source_post_url,
+    IntakeItem.capture_count,
+    IntakeItem.duplicate_of_id,
+)
+OUT_FIELDS = list(IntakeOut.model_fields)
+
+
+def select_out_columns(user_id: UUID):
+    return (
+        select(*OUT_COLUMNS)
+        .outerjoin(
+            Source, (Source.id == IntakeItem.source_id) & (Source.user_id == IntakeItem.user_id)
+        )
+        .where(IntakeItem.user_id == user_id)
+    )
+
+
+def _status_page_ids(user_id: UUID, statuses: list[str], keyset, n: int):
+    """Ids of up to ``n`` newest items per status, each read off its own index range."""
+    arms = []
+    for status in statuses:
+        arm = select(IntakeItem.id, IntakeItem.captured_at).where(
+            IntakeItem.user_id == user_id, IntakeItem.status == status
+        )
+        if keyset is not None:
+            arm = arm.where(keyset)
+        arm = arm.order_by(IntakeItem.captured_at.desc(), IntakeItem.id.desc()).limit(n)
+        # SQLite only accepts ORDER BY/LIMIT on a compound member inside a subquery.
+        sub = arm.subquery()
+        arms.append(select(sub.c.id))
+    return union_all(*arms).subquery()
+
+
 @router.get("", response_model=list[IntakeOut])
-def list_intake(
-    status: str | None = None,
+async def list_intake(
+    request: Request,
+    status: list[str] | None = Query(default=None),
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: str | None = None,
     user: User = Depends(get_current_user),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
-    stmt = select(IntakeItem).where(IntakeItem.user_id == user.id)
-    if status:
-        stmt = stmt.where(IntakeItem.status == status)
-    stmt = stmt.order_by(IntakeItem.captured_at.desc())
-    items = session.exec(stmt).all()
-
-    src_ids: set[UUID] = {i.source_id for i in items if i.source_id is not None}
-    src_map = _sources_by_id(session=session, user_id=user.id, ids=src_ids)
-
-    out: list[IntakeOut] = []
-    for i in items:
-        src = src_map.get(i.source_id) if i.source_id else None
-        out.append(
-            IntakeOut(
-                id=str(i.id),
-                raw_text=i.raw_text,
-                status=i.status,
-                captured_at=_as_utc(i.captured_at),
-                source_id=str(i.source_id) if i.source_id else None,
-                source_name=src.name if src else None,
-                source_type=src.type if src else None,
-                source_post_url=i.source_post_url,
-            )
-        )
-    return out
+    # Rows embed their source's name, so source writes change this list too.
+    tag = await etag.list_etag(session, request, user.id, (etag.INTAKE, etag.SOURCES))
+    if (not_modified := etag.not_modified(request, tag)) is not None:
+        return not_modified
+    headers = etag.etag_headers(tag)
+
+    keyset = None
+    if after:
+        after_ts, after_id = decode_cursor(after)
+        keyset = tuple_(IntakeItem.captured_at, IntakeItem.id) < tuple_(after_ts, after_id)
+
+    stmt = select_out_columns(user.id)
+    statuses = sorted(set(status or ()))
+    if len(statuses) > 1:
+        # Repeatable: the inbox asks for every not-yet-handled status at once. An IN
+        # list can't walk the (user, status, captured_at, id) index in order, so take
+        # the next page from each status's own index range and merge those.
+        page_ids = _status_page_ids(user.id, statuses, keyset, limit + 1)
+        stmt = stmt.join(page_ids, page_ids.c.id == IntakeItem.id)
+    else:
+        if statuses:
+            stmt = stmt.where(IntakeItem.status == statuses[0])
+        if keyset is not None:
+            stmt = stmt.where(keyset)
+    stmt = stmt.order_by(IntakeItem.captured_at.desc(), IntakeItem.id.desc()).limit(limit + 1)
+    rows = (await session.exec(stmt)).all()
+
+    # One extra row tells us whether another page exists without a COUNT query.
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(last.captured_at, last.id)
+
+    # Plain column tuples straight to JSON: no IntakeOut per row, no re-validation.
+    return UTCJSONResponse(rows_to_dicts(OUT_FIELDS, rows), headers=headers)
+
+
+@router.get("/export")
+async def export_intake(
+    as_: ExportFormat = Query(default=ExportFormat.ndjson, alias="as"),
+    user: User = Depends(get_current_user),
+):
+    stmt = select_out_columns(user.id).order_by(
+        IntakeItem.captured_at.desc(), IntakeItem.id.desc()
+    )
+    return export_response(stmt, OUT_FIELDS, as_, filename="dogeared-inbox")
 
 
 @router.post("", response_model=IntakeOut)
-def create_intake(
+async def create_intake(
     payload: IntakeCreateIn,
     user: User = Depends(get_current_user),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
 ):
     # Auto-attach a TikTok Source when a TikTok URL is provided and source_id isn't.
     source_id = payload.source_id
     if source_id is None and _is_tiktok_url(payload.source_post_url):
-        source_id = _ensure_tiktok_source(session=session, user_id=user.id)
-
-    item = IntakeItem(
-        user_id=user.id,
-        raw_text=payload.raw_text.strip(),
-        source_id=source_id,
-        source_post_url=payload.source_post_url,
-        captured_at=datetime.now(timezone.utc),
-        status="new",
-    )
-    session.add(item)
-    session.commit()
-    session.refresh(item)
+        source_id = await _ensure_tiktok_source(session=session, user_id=user.id)
+
+    raw_text = payload.raw_text.strip()
+    parsed = parse_capture(raw_text)
+    sig = dedup.signature(parsed) if settings.DEDUP_ON_CAPTURE else None
+    original = (await dedup.DedupIndex.load(session, user.id, [sig])).match(sig)
+
+    if original is not None and dedup.is_repeat(original, source_id, payload.source_post_url):
+        # Same book, same source, nothing new: count it on the original instead.
+        await dedup.count_repeats(session, original)
+        await etag.bump(session, user.id, etag.INTAKE)
+        await session.commit()
+        item = original
+    else:
+        item = IntakeItem(
+            user_id=user.id,
+            raw_text=raw_text,
+            source_id=source_id,
+            source_post_url=payload.source_post_url,
+            captured_at=datetime.now(timezone.utc),
+            status=capture_status(parsed),
+            parse_json=parsed,
+            fingerprint=sig.fingerprint if sig else None,
+        )
+        if original is not None:
+            # Kept for its source, but linked and out of the inbox: the original
+            # carries enrichment and matching for both.
+            item.status, item.duplicate_of_id = "duplicate", original.id
+            await dedup.count_repeats(session, original)
+        else:
+            session.add_all(dedup.bucket_rows(item, sig))
+            if settings.ENRICH_ON_CAPTURE:
+                enqueue_enrichment(session, [item.id])
+        session.add(item)
+        await etag.bump(session, user.id, etag.INTAKE)
+        await session.commit()
+        await session.refresh(item)
 
     src = None
     if item.source_id:
-        src = session.exec(
-            select(Source).where(Source.user_id == user.id, Source.id == item.source_id)
+        src = (
+            await session.exec(
+                select(Source).where(Source.user_id == user.id, Source.id == item.source_id)
+            )
         ).first()
 
-    return IntakeOut(
-        id=str(item.id),
-        raw_text=item.raw_text,
-        status=item.status,
-        captured_at=_as_utc(item.captured_at),
-        source_id=str(item.source_id) if item.source_id else None,
-        source_name=src.name if src else None,
-        source_type=src.type if src else None,
-        source_post_url=item.source_post_url,
-    )
\ No newline at end of file
+    return _intake_out(item, src)
+
+
+def _is_ndjson(request: Request) -> bool:
+    content_type = request.headers.get("content-type", "").lower()
+    return "ndjson" in content_type or "jsonl" in content_type
+
+
+def _parse_batch_item(raw: Any) -> IntakeBatchItemIn | str:
+    try:
+        item = IntakeBatchItemIn.model_validate(raw)
+    except ValidationError as e:
+        return "; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors())
+    if not item.raw_text.strip():
+        return "raw_text: must not be empty"
+    return item
+
+
+async def _iter_batch_payload(request: Request) -> AsyncIterator[IntakeBatchItemIn | str]:
+    """Yield parsed items (or per-item error strings) from a JSON array or NDJSON body.
+
+    NDJSON is consumed as it streams in, so a large upload never sits in memory whole.
+    """
+    if _is_ndjson(request):
+        buf = b""
+        async for chunk in request.stream():
+            buf += chunk
+            *lines, buf = buf.split(b"\n")
+            for line in lines:
+                if line.strip():
+                    yield _parse_ndjson_line(line)
+        if buf.strip():
+            yield _parse_ndjson_line(buf)
+        return
+
+    try:
+        data = json.loads(await request.body())
+    except ValueError:
+        raise HTTPException(status_code=422, detail="Body must be a JSON array or NDJSON")
+    if not isinstance(data, list):
+        raise HTTPException(status_code=422, detail="Body must be a JSON array or NDJSON")
+    for raw in data:
+        yield _parse_batch_item(raw)
+
+
+def _parse_ndjson_line(line: bytes) -> IntakeBatchItemIn | str:
+    try:
+        raw = json.loads(line)
+    except ValueError:
+        return "invalid JSON line"
+    return _parse_batch_item(raw)
+
+
+class _BatchWriter:
+    """Buffers batch items and writes them one chunked transaction at a time.
+
+    Sources are resolved per batch, not per item: each referenced source id is looked
+    up once, and the TikTok source is found or created at most once.
+    """
+
+    def __init__(self, session: AsyncSession, user_id: UUID):
+        self.session = session
+        self.user_id = user_id
+        self.sources: dict[UUID, Source] = {}
+        self.unknown_sources: set[UUID] = set()
+        self.tiktok_source_id: UUID | None = None
+        self.pending: list[tuple[int, IntakeBatchItemIn]] = []
+        self.results: list[IntakeBatchResult] = []
+        self.created = 0
+        self.merged = 0
+
+    async def add(self, index: int, payload: IntakeBatchItemIn) -> None:
+        self.pending.append((index, payload))
+        if len(self.pending) >= settings.INTAKE_BATCH_CHUNK_SIZE:
+            await self.flush()
+
+    async def _resolve_sources(self) -> None:
+        wanted = {
+            p.source_id
+            for _, p in self.pending
+            if p.source_id is not None
+            and p.source_id not in self.sources
+            and p.source_id not in self.unknown_sources
+        }
+        found = await _sources_by_id(session=self.session, user_id=self.user_id, ids=wanted)
+        self.sources.update(found)
+        self.unknown_sources.update(wanted - found.keys())
+
+        needs_tiktok = any(
+            p.source_id is None and _is_tiktok_url(p.source_post_url) for _, p in self.pending
+        )
+        if needs_tiktok and self.tiktok_source_id is None:
+            self.tiktok_source_id = await _ensure_tiktok_source(
+                session=self.session, user_id=self.user_id
+            )
+            tiktok = await _sources_by_id(
+                session=self.session, user_id=self.user_id, ids={self.tiktok_source_id}
+            )
+            self.sources.update(tiktok)
+
+    async def flush(self) -> None:
+        if not self.pending:
+            return
+        await self._resolve_sources()
+
+        now = datetime.now(timezone.utc)
+        prepared = []
+        for index, p in self.pending:
+            source_id = p.source_id
+            if source_id in self.unknown_sources:
+                self.results.append(
+                    IntakeBatchResult(index=index, ok=False, error="source_id: not found")
+                )
+                continue
+            if source_id is None and _is_tiktok_url(p.source_post_url):
+                source_id = self.tiktok_source_id
+            raw_text = p.raw_text.strip()
+            parsed = parse_capture(raw_text)
+            sig = dedup.signature(parsed) if settings.DEDUP_ON_CAPTURE else None
+            prepared.append((index, p, source_id, raw_text, parsed, sig))
+        self.pending = []
+
+        if not prepared:
+            return
+        # Duplicate candidates for the whole chunk in one pair of indexed lookups.
+        seen = await dedup.DedupIndex.load(
+            self.session, self.user_id, [sig for *_, sig in prepared]
+        )
+        staged: list[tuple[int, IntakeItem]] = []
+        merged: list[tuple[int, IntakeItem]] = []
+        new_ids: set[UUID] = set()
+        repeats: dict[UUID, tuple[IntakeItem, int]] = {}
+        for index, p, source_id, raw_text, parsed, sig in prepared:
+            original = seen.match(sig)
+            if original is not None:
+                if original.id in new_ids:
+                    original.capture_count += 1
+                else:
+                    repeats[original.id] = (original, repeats.get(original.id, (None, 0))[1] + 1)
+                if dedup.is_repeat(original, source_id, p.source_post_url):
+                    merged.append((index, original))
+                    continue
+            item = IntakeItem(
+                user_id=self.user_id,
+                raw_text=raw_text,
+                source_id=source_id,
+                source_post_url=p.source_post_url,
+                captured_at=p.captured_at or now,
+                status=capture_status(parsed),
+                parse_json=parsed,
+                fingerprint=sig.fingerprint if sig else None,
+            )
+            if original is not None:
+                item.status, item.duplicate_of_id = "duplicate", original.id
+            else:
+                self.session.add_all(dedup.bucket_rows(item, sig))
+                seen.add(item, sig)
+                new_ids.add(item.id)
+            staged.append((index, item))
+
+        self.session.add_all([item for _, item in staged])
+        if settings.ENRICH_ON_CAPTURE:
+            enqueue_enrichment(
+                self.session, [item.id for _, item in staged if item.duplicate_of_id is None]
+            )
+        try:
+            for original, n in repeats.values():
+                await dedup.count_repeats(self.session, original, n)
+            await etag.bump(self.session, self.user_id, etag.INTAKE)
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            self.results.extend(
+                IntakeBatchResult(index=index, ok=False, error="database write failed")
+                for index, _ in staged + merged
+            )
+            return
+
+        for index, item in staged:
+            src = self.sources.get(item.source_id) if item.source_id else None
+            self.results.append(
+                IntakeBatchResult(index=index, ok=True, item=_intake_out(item, src))
+            )
+            self.created += 1
+        for index, item in merged:
+            src = self.sources.get(item.source_id) if item.source_id else None
+            self.results.append(
+                IntakeBatchResult(index=index, ok=True, merged=True, item=_intake_out(item, src))
+            )
+            self.merged += 1
+
+
+@router.post("/batch", response_model=IntakeBatchOut)
+async def create_intake_batch(
+    request: Request,
+    user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+):
+    """Capture many items at once from a JSON array or an NDJSON stream.
+
+    Items are written in chunked transactions; each gets its own result so one bad
+    line doesn't sink the rest of the batch.
+    """
+    writer = _BatchWriter(session=session, user_id=user.id)
+    index = 0
+    payload = _iter_batch_payload(request)
+    async for parsed in payload:
+        if index >= settings.INTAKE_BATCH_MAX_ITEMS:
+            # One marker for everything past the cap; the rest of the upload isn't read.
+            writer.results.append(
+                IntakeBatchResult(
+                    index=index,
+                    ok=False,
+                    error="batch item limit exceeded; remaining items were not read",
+                )
+            )
+            await payload.aclose()
+            break
+        if isinstance(parsed, str):
+            writer.results.append(IntakeBatchResult(index=index, ok=False, error=parsed))
+        else:
+            await writer.add(index, parsed)
+        index += 1
+    await writer.flush()
+
+    results = sorted(writer.results, key=lambda r: r.index)
+    return IntakeBatchOut(
+        created=writer.created,
+        merged=writer.merged,
+        failed=len(results) - writer.created - writer.merged,
+        results=results,
+    )
@@ -1,14 +1,28 @@
 from datetime import datetime
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from pydantic import BaseModel
-from sqlmodel import Session, select
+from sqlalchemy import tuple_
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.core import etag
 from app.core.deps import get_current_user
-from app.db.session import get_session
+from app.core.export import ExportFormat, export_response
+from app.core.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    NEXT_CURSOR_HEADER,
+    decode_cursor,
+    encode_cursor,
+)
+from app.core.responses import FastJSONResponse, rows_to_dicts
+from app.core.sync import record_deletion
+from app.db.session import get_read_session, get_session
 from app.models import OwnedItem, User
 from app.models import IntakeItem  # add to imports at top if not present
+from app.services.parser import stored_parse
 
 router = APIRouter()
 
@@ -31,62 +45,109 @@ class OwnedOut(BaseModel):
     acquired_at: datetime | None
     notes: str | None
     created_at: datetime
+    intake_id: str | None
+    source_id: str | None
+
+
+# Column order matches OwnedOut; shared by the list fast path, the export and /sync.
+OUT_COLUMNS = (
+    OwnedItem.id,
+    OwnedItem.title,
+    OwnedItem.author,
+    OwnedItem.format,
+    OwnedItem.is_favorite,
+    OwnedItem.acquired_at,
+    OwnedItem.notes,
+    OwnedItem.created_at,
+    OwnedItem.intake_id,
+    OwnedItem.source_id,
+)
+OUT_FIELDS = list(OwnedOut.model_fields)
+
+
+def _owned_out(o: OwnedItem) -> OwnedOut:
+    return OwnedOut(
+        id=str(o.id),
+        title=o.title,
+        author=o.author,
+        format=o.format,
+        is_favorite=o.is_favorite,
+        acquired_at=o.acquired_at,
+        notes=o.notes,
+        created_at=o.created_at,
+        intake_id=str(o.intake_id) if o.intake_id else None,
+        source_id=str(o.source_id) if o.source_id else None,
+    )
 
 
 @router.get("", response_model=list[OwnedOut])
-def list_owned(
+async def list_owned(
+    request: Request,
     format: str | None = None,
     favorite: bool | None = None,
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: str | None = None,
     user: User = Depends(get_current_user),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
-    stmt = select(OwnedItem).where(OwnedItem.user_id == user.id)
+    tag = await etag.list_etag(session, request, user.id, (etag.OWNED,))
+    if (not_modified := etag.not_modified(request, tag)) is not None:
+        return not_modified
+    headers = etag.etag_headers(tag)
+
+    stmt = select(*OUT_COLUMNS).where(OwnedItem.user_id == user.id)
 
     if format:
         stmt = stmt.where(OwnedItem.format == format)
     if favorite is not None:
         stmt = stmt.where(OwnedItem.is_favorite == favorite)
 
-    stmt = stmt.order_by(OwnedItem.created_at.desc())
-    rows = session.exec(stmt).all()
-
-    return [
-        OwnedOut(
-            id=str(o.id),
-            title=o.title,
-            author=o.author,
-            format=o.format,
-            is_favorite=o.is_favorite,
-            acquired_at=o.acquired_at,
-            notes=o.notes,
-            created_at=o.created_at,
-        )
-        for o in rows
-    ]
+    if after:
+        after_ts, after_id = decode_cursor(after)
+        stmt = stmt.where(tuple_(OwnedItem.created_at, OwnedItem.id) < tuple_(after_ts, after_id))
+
+    stmt = stmt.order_by(OwnedItem.created_at.desc(), OwnedItem.id.desc()).limit(limit + 1)
+    rows = (await session.exec(stmt)).all()
+
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(last.created_at, last.id)
+
+    return FastJSONResponse(rows_to_dicts(OUT_FIELDS, rows), headers=headers)
+
+
+@router.get("/export")
+async def export_owned(
+    as_: ExportFormat = Query(default=ExportFormat.ndjson, alias="as"),
+    user: User = Depends(get_current_user),
+):
+    stmt = (
+        select(*OUT_COLUMNS)
+        .where(OwnedItem.user_id == user.id)
+        .order_by(OwnedItem.created_at.desc(), OwnedItem.id.desc())
+    )
+    return export_response(stmt, OUT_FIELDS, as_, filename="dogeared-owned")
 
 
 @router.post("/from-intake/{intake_id}", response_model=OwnedOut)
-def create_owned_from_intake(
+async def create_owned_from_intake(
     intake_id: UUID,
     user: User = Depends(get_current_user),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
 ):
-    intake = session.exec(
-        select(IntakeItem).where(IntakeItem.id == intake_id, IntakeItem.user_id == user.id)
+    intake = (
+        await session.exec(
+            select(IntakeItem).where(IntakeItem.id == intake_id, IntakeItem.user_id == user.id)
+        )
     ).first()
     if not intake:
         raise HTTPException(status_code=404, detail="Intake item not found")
 
-    # naive parse: "Title by Author" if present; else whole text is title
-    raw = (intake.raw_text or "").strip()
-    title = raw
-    author = None
-    if " by " in raw:
-        parts = raw.split(" by ", 1)
-        if parts[0].strip():
-            title = parts[0].strip()
-        if parts[1].strip():
-            author = parts[1].strip()
+    # Parsed once at capture; older rows fall back to a fresh parse.
+    parsed = stored_parse(intake)
+    title = parsed.get("title") or (intake.raw_text or "").strip()
+    author = parsed.get("author")
 
     o = OwnedItem(
         user_id=user.id,
@@ -95,6 +156,8 @@ def create_owned_from_intake(
         format="hardcover",
         is_favorite=False,
         notes=f"Imported from Inbox: {intake.id}",
+        intake_id=intake.id,
+        source_id=intake.source_id,
     )
     session.add(o)
 
@@ -102,25 +165,17 @@ def create_owned_from_intake(
     intake.status = "owned"
     session.add(intake)
 
-    session.commit()
-    session.refresh(o)
+    await etag.bump(session, user.id, etag.OWNED, etag.INTAKE)
+    await session.commit()
+    await session.refresh(o)
 
-    return OwnedOut(
-        id=str(o.id),
-        title=o.title,
-        author=o.author,
-        format=o.format,
-        is_favorite=o.is_favorite,
-        acquired_at=o.acquired_at,
-        notes=o.notes,
-        created_at=o.created_at,
-    )
+    return _owned_out(o)
 
 @router.post("", response_model=OwnedOut)
-def create_owned(
+async def create_owned(
     payload: OwnedCreateIn,
     user: User = Depends(get_current_user),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
 ):
     title = payload.title.strip()
     if not title:
@@ -141,32 +196,28 @@ def create_owned(
         notes=payload.notes.strip() if payload.notes else None,
     )
     session.add(o)
-    session.commit()
-    session.refresh(o)
+    await etag.bump(session, user.id, etag.OWNED)
+    await session.commit()
+    await session.refresh(o)
 
-    return OwnedOut(
-        id=str(o.id),
-        title=o.title,
-        author=o.author,
-        format=o.format,
-        is_favorite=o.is_favorite,
-        acquired_at=o.acquired_at,
-        notes=o.notes,
-        created_at=o.created_at,
-    )
+    return _owned_out(o)
 
 
 @router.delete("/{owned_id}")
-def delete_owned(
+async def delete_owned(
     owned_id: UUID,
     user: User = Depends(get_current_user),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
 ):
-    o = session.exec(
-        select(OwnedItem).where(OwnedItem.id == owned_id, OwnedItem.user_id == user.id)
+    o = (
+        await session.exec(
+            select(OwnedItem).where(OwnedItem.id == owned_id, OwnedItem.user_id == user.id)
+        )
     ).first()
     if not o:
         raise HTTPException(status_code=404, detail="Not found")
-    session.delete(o)
-    session.commit()
+    await session.delete(o)
+    record_deletion(session, user.id, etag.OWNED, o.id)
+    await etag.bump(session, user.id, etag.OWNED)
+    await session.commit()
     return {"ok": True}
@@ -0,0 +1,124 @@
+import re
+from typing import Literal
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import BaseModel
+from sqlalchemy import text
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.deps import get_current_user
+from app.db.session import get_read_session, is_sqlite
+from app.models import User
+
+router = APIRouter()
+
+SearchKind = Literal["owned", "intake", "book"]
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# One ranked query per FTS index, all scoped to the caller. Books are shared catalog
+# rows, so a user only sees the ones linked from their own inbox. CROSS JOIN pins SQLite
+# to running the MATCH first rather than walking every row the user owns.
+_KIND_SQL: dict[str, str] = {
+    "owned": """
+        SELECT 'owned' AS kind, o.id AS id, o.title AS title,
+               snippet(owneditem_fts, -1, '[', ']', '…', 12) AS snippet,
+               bm25(owneditem_fts) AS rank
+        FROM owneditem_fts CROSS JOIN owneditem o ON o.rowid = owneditem_fts.rowid
+        WHERE owneditem_fts MATCH :q AND o.user_id = :user_id
+    """,
+    "intake": """
+        SELECT 'intake' AS kind, i.id AS id, i.raw_text AS title,
+               snippet(intakeitem_fts, -1, '[', ']', '…', 12) AS snippet,
+               bm25(intakeitem_fts) AS rank
+        FROM intakeitem_fts CROSS JOIN intakeitem i ON i.rowid = intakeitem_fts.rowid
+        WHERE intakeitem_fts MATCH :q AND i.user_id = :user_id
+    """,
+    "book": """
+        SELECT 'book' AS kind, b.id AS id, b.title AS title,
+               snippet(book_fts, -1, '[', ']', '…', 12) AS snippet,
+               bm25(book_fts) AS rank
+        FROM book_fts CROSS JOIN book b ON b.rowid = book_fts.rowid
+        WHERE book_fts MATCH :q AND EXISTS (
+            SELECT 1 FROM intakeitem i
+            WHERE i.user_id = :user_id AND i.matched_book_id = b.id
+        )
+    """,
+}
+
+
+class SearchHit(BaseModel):
+    kind: SearchKind
+    id: str
+    title: str
+    snippet: str
+    # bm25 within this hit's own index (lower is better); not comparable across kinds.
+    rank: float
+    # rank relative to the best hit of the same kind: 1.0 for the best, toward 0 after.
+    score: float
+
+
+class SearchOut(BaseModel):
+    hits: list[SearchHit]
+    next_offset: int | None
+
+
+def _scored(sql: str) -> str:
+    # bm25 depends on each index's own document count and lengths, so raw ranks from
+    # different tables don't share a scale. Scale each kind by its own best hit before
+    # the kinds are merged.
+    return (
+        "SELECT *, COALESCE(rank / NULLIF(MIN(rank) OVER (), 0), 1.0) AS score "
+        f"FROM ({sql})"
+    )
+
+
+def _fts_query(q: str) -> str | None:
+    """Turn free text into a safe FTS5 query: every word must match, as a prefix."""
+    tokens = _TOKEN_RE.findall(q)
+    if not tokens:
+        return None
+    return " ".join(f'"{t}"*' for t in tokens)
+
+
+@router.get("", response_model=SearchOut)
+async def search(
+    q: str = Query(min_length=1, max_length=200),
+    kind: list[SearchKind] | None = Query(default=None),
+    limit: int = Query(default=20, ge=1, le=100),
+    offset: int = Query(default=0, ge=0),
+    user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_read_session),
+):
+    if not is_sqlite:
+        raise HTTPException(status_code=501, detail="Search requires the SQLite backend")
+
+    match = _fts_query(q)
+    if match is None:
+        return SearchOut(hits=[], next_offset=None)
+
+    kinds = kind or list(_KIND_SQL)
+    sql = (
+        " UNION ALL ".join(_scored(_KIND_SQL[k]) for k in kinds)
+        + " ORDER BY score DESC, rank, kind, id LIMIT :limit OFFSET :offset"
+    )
+    rows = (
+        await session.exec(
+            text(sql),
+            params={"q": match, "user_id": user.id.hex, "limit": limit + 1, "offset": offset},
+        )
+    ).all()
+
+    hits = [
+        SearchHit(
+            kind=r.kind,
+            id=str(UUID(hex=r.id)),
+            title=r.title,
+            snippet=r.snippet,
+            rank=r.rank,
+            score=round(r.score, 4),
+        )
+        for r in rows[:limit]
+    ]
+    return SearchOut(hits=hits, next_offset=offset + limit if len(rows) > limit else None)
@@ -0,0 +1,156 @@
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel, Field
+from sqlalchemy import func
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.deps import get_current_user
+from app.core.responses import FastJSONResponse, rows_to_dicts
+from app.db.session import get_read_session, get_session
+from app.models import Shelf, ShelfCount, User
+from app.services.shelves import MoveResult, UnknownIdsError, move_books, visible_shelves
+
+router = APIRouter()
+
+# Keeps a bulk move's IN lists and its transaction reasonably sized.
+MAX_BULK_MOVES = 1000
+
+
+class ShelfCreateIn(BaseModel):
+    name: str
+
+
+class ShelfOut(BaseModel):
+    id: str
+    name: str
+    count: int
+
+
+class ShelfMoveIn(BaseModel):
+    shelf_id: UUID
+    note: str | None = None
+
+
+class ShelfBulkMoveItem(BaseModel):
+    book_id: UUID
+    shelf_id: UUID
+
+
+class ShelfBulkMoveIn(BaseModel):
+    moves: list[ShelfBulkMoveItem] = Field(min_length=1, max_length=MAX_BULK_MOVES)
+    note: str | None = None
+
+
+class ShelfMoveOut(BaseModel):
+    book_id: str
+    from_shelf_id: str | None
+    to_shelf_id: str
+    moved: bool
+
+
+class ShelfBulkMoveOut(BaseModel):
+    moved: int
+    unchanged: int
+    results: list[ShelfMoveOut]
+
+
+def _move_out(r: MoveResult) -> ShelfMoveOut:
+    return ShelfMoveOut(
+        book_id=str(r.book_id),
+        from_shelf_id=str(r.from_shelf_id) if r.from_shelf_id else None,
+        to_shelf_id=str(r.to_shelf_id),
+        moved=r.moved,
+    )
+
+
+async def _move(
+    session: AsyncSession, user_id: UUID, moves: list[tuple[UUID, UUID]], note: str | None
+) -> list[MoveResult]:
+    try:
+        return await move_books(session, user_id, moves, note)
+    except UnknownIdsError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@router.get("", response_model=list[ShelfOut])
+async def list_shelves(
+    user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_read_session),
+):
+    # Counts come from ShelfCount, so this reads one row per shelf however many books
+    # the user has shelved.
+    stmt = (
+        select(Shelf.id, Shelf.name, func.coalesce(ShelfCount.count, 0))
+        .outerjoin(
+            ShelfCount, (ShelfCount.shelf_id == Shelf.id) & (ShelfCount.user_id == user.id)
+        )
+        .where(visible_shelves(user.id))
+        .order_by(Shelf.name)
+    )
+    rows = (await session.exec(stmt)).all()
+    return FastJSONResponse(rows_to_dicts(list(ShelfOut.model_fields), rows))
+
+
+@router.post("", response_model=ShelfOut)
+async def create_shelf(
+    payload: ShelfCreateIn,
+    user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+):
+    """Asking for a name the user can already see returns that shelf."""
+    name = payload.name.strip()
+    if not name:
+        raise HTTPException(status_code=422, detail="Name is required")
+
+    shelf = (
+        await session.exec(
+            select(Shelf)
+            .where(Shelf.name == name, visible_shelves(user.id))
+            # The user's own shelf wins over a shared one with the same name.
+            .order_by(Shelf.user_id.is_(None))
+        )
+    ).first()
+    if shelf is None:
+        shelf = Shelf(user_id=user.id, name=name)
+        session.add(shelf)
+        await session.commit()
+        await session.refresh(shelf)
+
+    count = (
+        await session.exec(
+            select(ShelfCount.count).where(
+                ShelfCount.user_id == user.id, ShelfCount.shelf_id == shelf.id
+            )
+        )
+    ).first()
+    return ShelfOut(id=str(shelf.id), name=shelf.name, count=count or 0)
+
+
+@router.put("/books/{book_id}", response_model=ShelfMoveOut)
+async def move_book(
+    book_id: UUID,
+    payload: ShelfMoveIn,
+    user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+):
+    results = await _move(session, user.id, [(book_id, payload.shelf_id)], payload.note)
+    return _move_out(results[0])
+
+
+@router.post("/moves", response_model=ShelfBulkMoveOut)
+async def move_books_bulk(
+    payload: ShelfBulkMoveIn,
+    user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+):
+    results = await _move(
+        session, user.id, [(m.book_id, m.shelf_id) for m in payload.moves], payload.note
+    )
+    moved = sum(r.moved for r in results)
+    return ShelfBulkMoveOut(
+        moved=moved,
+        unchanged=len(results) - moved,
+        results=[_move_out(r) for r in results],
+    )
@@ -1,12 +1,16 @@
 from datetime import datetime
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from pydantic import BaseModel
-from sqlmodel import Session, select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.core import etag
 from app.core.deps import get_current_user
-from app.db.session import get_session
+from app.core.responses import FastJSONResponse, rows_to_dicts
+from app.db.session import get_read_session, get_session
 from app.models import Source, User
+from app.services.source_analytics import analytics_cache, source_conversions
 
 router = APIRouter()
 
@@ -27,35 +31,45 @@ class SourceOut(BaseModel):
     created_at: datetime
 
 
+class SourceAnalyticsOut(BaseModel):
+    source_id: str | None
+    source_name: str | None
+    source_type: str | None
+    captures: int
+    conversions: int
+    conversion_rate: float | None
+    median_days_to_own: float | None
+
+
+# Column order matches SourceOut; shared with /sync.
+OUT_COLUMNS = (Source.id, Source.type, Source.name, Source.url, Source.notes, Source.created_at)
+OUT_FIELDS = list(SourceOut.model_fields)
+
+
 @router.get("", response_model=list[SourceOut])
-def list_sources(
+async def list_sources(
+    request: Request,
     user: User = Depends(get_current_user),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
+    tag = await etag.list_etag(session, request, user.id, (etag.SOURCES,))
+    if (not_modified := etag.not_modified(request, tag)) is not None:
+        return not_modified
+
     stmt = (
-        select(Source)
+        select(*OUT_COLUMNS)
         .where(Source.user_id == user.id)
         .order_by(Source.created_at.desc())
     )
-    rows = session.exec(stmt).all()
-    return [
-        SourceOut(
-            id=str(s.id),
-            type=s.type,
-            name=s.name,
-            url=s.url,
-            notes=s.notes,
-            created_at=s.created_at,
-        )
-        for s in rows
-    ]
+    rows = (await session.exec(stmt)).all()
+    return FastJSONResponse(rows_to_dicts(OUT_FIELDS, rows), headers=etag.etag_headers(tag))
 
 
 @router.post("", response_model=SourceOut)
-def create_source(
+async def create_source(
     payload: SourceCreateIn,
     user: User = Depends(get_current_user),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
 ):
     s = Source(
         user_id=user.id,
@@ -65,8 +79,9 @@ def create_source(
         notes=payload.notes.strip() if payload.notes else None,
     )
     session.add(s)
-    session.commit()
-    session.refresh(s)
+    await etag.bump(session, user.id, etag.SOURCES)
+    await session.commit()
+    await session.refresh(s)
     return SourceOut(
         id=str(s.id),
         type=s.type,
@@ -75,3 +90,23 @@ def create_source(
         notes=s.notes,
         created_at=s.created_at,
     )
+
+
+@router.get("/analytics", response_model=list[SourceAnalyticsOut])
+async def source_analytics(
+    request: Request,
+    user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_read_session),
+):
+    """Which sources lead to books that get bought: captures vs. conversions per source."""
+    tag = await etag.list_etag(
+        session, request, user.id, (etag.INTAKE, etag.OWNED, etag.SOURCES)
+    )
+    if (not_modified := etag.not_modified(request, tag)) is not None:
+        return not_modified
+
+    rows = analytics_cache.get(tag)
+    if rows is None:
+        rows = await source_conversions(session, user.id)
+        analytics_cache.set(tag, rows)
+    return FastJSONResponse(rows, headers=etag.etag_headers(tag))
@@ -0,0 +1,95 @@
+from uuid import UUID
+
+from fastapi import APIRouter, Depends
+from pydantic import BaseModel
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.deps import get_current_user
+from app.db import rollups
+from app.db.session import get_read_session
+from app.models import Source, User, UserStat
+
+router = APIRouter()
+
+
+class SourceCountOut(BaseModel):
+    source_id: str | None
+    source_name: str | None
+    count: int
+
+
+class OwnedStatsOut(BaseModel):
+    total: int
+    favorites: int
+    by_format: dict[str, int]
+    by_month: dict[str, int]
+
+
+class IntakeStatsOut(BaseModel):
+    total: int
+    by_status: dict[str, int]
+    by_source: list[SourceCountOut]
+    by_month: dict[str, int]
+
+
+class StatsOut(BaseModel):
+    owned: OwnedStatsOut
+    intake: IntakeStatsOut
+
+
+@router.get("", response_model=StatsOut)
+async def get_stats(
+    user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_read_session),
+):
+    # Read straight from the rollup counters: a few dozen rows per user, however large
+    # the library is.
+    rows = (
+        await session.exec(
+            select(UserStat.metric, UserStat.key, UserStat.count).where(
+                UserStat.user_id == user.id, UserStat.count != 0
+            )
+        )
+    ).all()
+    metrics: dict[str, dict[str, int]] = {}
+    for metric, key, count in rows:
+        metrics.setdefault(metric, {})[key] = count
+
+    by_source = metrics.get(rollups.INTAKE_SOURCE, {})
+    source_ids = [UUID(k) for k in by_source if k != "none"]
+    names: dict[str, str] = {}
+    if source_ids:
+        found = await session.exec(
+            select(Source.id, Source.name).where(
+                Source.user_id == user.id, Source.id.in_(source_ids)
+            )
+        )
+        names = {str(source_id): name for source_id, name in found}
+
+    owned_by_format = metrics.get(rollups.OWNED_FORMAT, {})
+    intake_by_status = metrics.get(rollups.INTAKE_STATUS, {})
+    return StatsOut(
+        owned=OwnedStatsOut(
+            total=sum(owned_by_format.values()),
+            favorites=metrics.get(rollups.OWNED_FAVORITE, {}).get("true", 0),
+            by_format=owned_by_format,
+            by_month=dict(sorted(metrics.get(rollups.OWNED_MONTH, {}).items())),
+        ),
+        intake=IntakeStatsOut(
+            total=sum(intake_by_status.values()),
+            by_status=intake_by_status,
+            by_source=sorted(
+                (
+                    SourceCountOut(
+                        source_id=None if key == "none" else key,
+                        source_name=names.get(key),
+                        count=count,
+                    )
+                    for key, count in by_source.items()
+                ),
+                key=lambda s: -s.count,
+            ),
+            by_month=dict(sorted(metrics.get(rollups.INTAKE_MONTH, {}).items())),
+        ),
+    )
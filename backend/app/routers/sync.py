@@ -0,0 +1,88 @@
+from datetime import datetime, timedelta, timezone
+
+from fastapi import APIRouter, Depends
+from pydantic import BaseModel
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core import etag
+from app.core.config import settings
+from app.core.deps import get_current_user
+from app.core.responses import UTCJSONResponse, rows_to_dicts
+from app.core.sync import decode_token, encode_token
+from app.db.session import get_read_session
+from app.models import IntakeItem, OwnedItem, Source, Tombstone, User
+from app.routers import intake, owned, sources
+
+router = APIRouter()
+
+
+class SyncDeletedOut(BaseModel):
+    intake: list[str]
+    owned: list[str]
+    sources: list[str]
+
+
+class SyncOut(BaseModel):
+    token: str
+    full: bool
+    intake: list[intake.IntakeOut]
+    owned: list[owned.OwnedOut]
+    sources: list[sources.SourceOut]
+    deleted: SyncDeletedOut
+
+
+@router.get("", response_model=SyncOut)
+async def sync(
+    since: str | None = None,
+    user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_read_session),
+):
+    """Everything that changed since ``since``; without a token, the whole library.
+
+    Clients upsert the returned rows by id and drop the ``deleted`` ids, then send the
+    returned token next time. ``full`` means the response is a complete snapshot (no
+    token, or one older than the tombstone retention) and local data should be replaced.
+    Rows changed within the last SYNC_OVERLAP_SECONDS may arrive twice; upserts make
+    that harmless.
+    """
+    now = datetime.now(timezone.utc)
+    token = encode_token(now - timedelta(seconds=settings.SYNC_OVERLAP_SECONDS))
+
+    changed_since: datetime | None = None
+    if since:
+        changed_since = decode_token(since)
+        if changed_since < now - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS):
+            changed_since = None
+    full = changed_since is None
+
+    # Timestamps are stored as naive UTC.
+    cutoff = changed_since.astimezone(timezone.utc).replace(tzinfo=None) if not full else None
+
+    intake_stmt = intake.select_out_columns(user.id)
+    owned_stmt = select(*owned.OUT_COLUMNS).where(OwnedItem.user_id == user.id)
+    sources_stmt = select(*sources.OUT_COLUMNS).where(Source.user_id == user.id)
+    deleted: dict[str, list] = {etag.INTAKE: [], etag.OWNED: [], etag.SOURCES: []}
+    if cutoff is not None:
+        intake_stmt = intake_stmt.where(IntakeItem.updated_at > cutoff)
+        owned_stmt = owned_stmt.where(OwnedItem.updated_at > cutoff)
+        sources_stmt = sources_stmt.where(Source.updated_at > cutoff)
+        tombstones = await session.exec(
+            select(Tombstone.collection, Tombstone.item_id).where(
+                Tombstone.user_id == user.id, Tombstone.deleted_at > cutoff
+            )
+        )
+        for collection, item_id in tombstones:
+            deleted[collection].append(item_id)
+
+    # The token was taken before these reads, so a write landing between them is
+    # simply picked up again next time.
+    body = {
+        "token": token,
+        "full": full,
+        "intake": rows_to_dicts(intake.OUT_FIELDS, (await session.exec(intake_stmt)).all()),
+        "owned": rows_to_dicts(owned.OUT_FIELDS, (await session.exec(owned_stmt)).all()),
+        "sources": rows_to_dicts(sources.OUT_FIELDS, (await session.exec(sources_stmt)).all()),
+        "deleted": deleted,
+    }
+    return UTCJSONResponse(body, headers={"Cache-Control": "private, no-store"})
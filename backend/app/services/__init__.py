@@ -0,0 +1 @@
+# Package marker for app.services
\ No newline at end of file
@@ -0,0 +1,231 @@
+import asyncio
+import hashlib
+import io
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import httpx
+from PIL import Image, UnidentifiedImageError
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Width in pixels per named size; height follows the source aspect ratio.
+SIZES = {"s": 160, "m": 320, "l": 640}
+FORMATS = {"webp": ("WEBP", "image/webp"), "jpeg": ("JPEG", "image/jpeg")}
+_QUALITY = 80
+# Served files only get their mtime bumped this often, so hits stay (nearly) read-only
+# while eviction still sees roughly least-recently-used order.
+_TOUCH_GRANULARITY_SECONDS = 3600
+# Evict down to this fraction of the budget so we don't rescan on every write.
+_EVICT_TARGET = 0.9
+
+
+class CoverError(Exception):
+    pass
+
+
+class CoverMissing(CoverError):
+    """The thumbnail was evicted again straight after being regenerated."""
+
+
+@dataclass
+class Thumbnail:
+    content: bytes
+    media_type: str
+    etag: str
+
+
+class CoverCache:
+    """Source images fetched once, stored only as fixed-size thumbnails.
+
+    Layout under COVER_CACHE_DIR:
+
+    * ``urls/ab/<sha256(url)>`` -- the content hash of what that URL served
+    * ``blobs/cd/<sha256(image)>-<size>.<ext>`` -- one thumbnail per size and format
+
+    Thumbnails are keyed by the image bytes, so the same cover reached through several
+    books, editions or URLs is stored once. The URL index lets a repeat request skip
+    the network entirely, and the content hash doubles as a strong ETag.
+    """
+
+    def __init__(self, root: str, max_bytes: int) -> None:
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self._client: httpx.AsyncClient | None = None
+        self._fetching: dict[str, asyncio.Task[str]] = {}
+        self._total_bytes: int | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(settings.COVER_FETCH_TIMEOUT_SECONDS),
+                headers={"User-Agent": f"{settings.APP_NAME}/0.1 (cover proxy)"},
+                follow_redirects=True,
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _url_path(self, url: str) -> Path:
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self.root / "urls" / key[:2] / key
+
+    def _blob_path(self, digest: str, size: str, fmt: str) -> Path:
+        return self.root / "blobs" / digest[:2] / f"{digest}-{size}.{fmt}"
+
+    async def thumbnail(self, url: str, size: str, fmt: str) -> Thumbnail:
+        """The cached thumbnail for a source URL, fetching and resizing it on first use.
+
+        The bytes are read here rather than streamed from the path later, so eviction
+        can't remove the file between the lookup and the response.
+        """
+        # Disk I/O runs in the threadpool, like the resizing in _store.
+        digest = await asyncio.to_thread(self._known_digest, url, size, fmt)
+        if digest is None:
+            digest = await self._fetch_once(url)
+        content = await asyncio.to_thread(self._read, self._blob_path(digest, size, fmt))
+        if content is None:
+            # Evicted since it was found or written: make it again, once.
+            digest = await self._fetch_once(url)
+            content = await asyncio.to_thread(self._read, self._blob_path(digest, size, fmt))
+            if content is None:
+                raise CoverMissing("cover thumbnail is not available")
+        etag = f'"{digest[:32]}-{size}.{fmt}"'
+        return Thumbnail(content=content, media_type=FORMATS[fmt][1], etag=etag)
+
+    def _read(self, path: Path) -> bytes | None:
+        try:
+            content = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        self._touch(path)
+        return content
+
+    def _known_digest(self, url: str, size: str, fmt: str) -> str | None:
+        try:
+            digest = self._url_path(url).read_text().strip()
+        except OSError:
+            return None
+        # The URL may still be indexed after eviction removed its thumbnails.
+        return digest if self._blob_path(digest, size, fmt).exists() else None
+
+    async def _fetch_once(self, url: str) -> str:
+        # Single flight: concurrent requests for one cover share one download, and a
+        # client going away mid-request doesn't abandon it for everyone else.
+        task = self._fetching.get(url)
+        if task is None:
+            task = asyncio.create_task(self._fetch_and_store(url))
+            self._fetching[url] = task
+            task.add_done_callback(lambda _: self._fetching.pop(url, None))
+        return await asyncio.shield(task)
+
+    async def _fetch_and_store(self, url: str) -> str:
+        if not url.startswith(("http://", "https://")):
+            raise CoverError(f"unsupported cover URL: {url}")
+        try:
+            async with self.client.stream("GET", url) as resp:
+                if resp.status_code != 200:
+                    raise CoverError(f"cover fetch returned {resp.status_code}")
+                chunks, received = [], 0
+                async for chunk in resp.aiter_bytes():
+                    received += len(chunk)
+                    if received > settings.COVER_MAX_SOURCE_BYTES:
+                        raise CoverError("cover image too large")
+                    chunks.append(chunk)
+        except httpx.HTTPError as e:
+            raise CoverError(f"cover fetch failed: {e}") from e
+
+        # Decoding and resizing are CPU-bound; keep them off the event loop.
+        return await asyncio.to_thread(self._store, url, b"".join(chunks))
+
+    def _store(self, url: str, data: bytes) -> str:
+        digest = hashlib.sha256(data).hexdigest()
+        try:
+            with Image.open(io.BytesIO(data)) as img:
+                img.load()
+                source = img.convert("RGB")
+        except (UnidentifiedImageError, OSError) as e:
+            raise CoverError("cover is not a readable image") from e
+
+        written = 0
+        for size, width in SIZES.items():
+            thumb = source
+            if source.width > width:
+                height = max(1, round(source.height * width / source.width))
+                thumb = source.resize((width, height), Image.Resampling.LANCZOS)
+            for fmt, (pil_format, _) in FORMATS.items():
+                buf = io.BytesIO()
+                thumb.save(buf, pil_format, quality=_QUALITY)
+                written += self._write_atomic(self._blob_path(digest, size, fmt), buf.getvalue())
+        self._write_atomic(self._url_path(url), digest.encode("ascii"))
+        self._account(written)
+        return digest
+
+    @staticmethod
+    def _write_atomic(path: Path, data: bytes) -> int:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+        return len(data)
+
+    @staticmethod
+    def _touch(path: Path) -> None:
+        try:
+            if time.time() - path.stat().st_mtime > _TOUCH_GRANULARITY_SECONDS:
+                os.utime(path)
+        except OSError:
+            pass
+
+    def _blobs(self) -> list[tuple[float, int, Path]]:
+        out = []
+        for path in (self.root / "blobs").glob("*/*"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            out.append((st.st_mtime, st.st_size, path))
+        return out
+
+    def _account(self, written: int) -> None:
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = sum(size for _, size, _ in self._blobs())
+            else:
+                self._total_bytes += written
+            if self._total_bytes <= self.max_bytes:
+                return
+            # Over budget: drop least recently served thumbnails until comfortably under.
+            blobs = sorted(self._blobs())
+            total = sum(size for _, size, _ in blobs)
+            target = self.max_bytes * _EVICT_TARGET
+            evicted = 0
+            for _, size, path in blobs:
+                if total <= target:
+                    break
+                try:
+                    path.unlink()
+                except OSError:
+                    continue
+                total -= size
+                evicted += 1
+            self._total_bytes = total
+            logger.info("cover cache: evicted %d thumbnails, %d bytes remain", evicted, total)
+
+    def stats(self) -> dict[str, int]:
+        blobs = self._blobs()
+        return {"thumbnails": len(blobs), "bytes": sum(size for _, size, _ in blobs)}
+
+
+cover_cache = CoverCache(settings.COVER_CACHE_DIR, settings.COVER_CACHE_MAX_BYTES)
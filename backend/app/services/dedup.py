@@ -0,0 +1,185 @@
+import hashlib
+import random
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import update
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.models import IntakeDedupBucket, IntakeItem
+from app.services.matcher import match_text
+from app.services.parser import stored_parse
+
+# MinHash over character 3-gram shingles, banded for LSH: 16 hashes in 4 bands of 4.
+# Two captures land in a shared bucket with probability ~1-(1-J^4)^4 for shingle Jaccard
+# J: ~0.98 at 0.8, ~0.05 at 0.3. Candidates are then checked with the exact Jaccard.
+NUM_PERM = 16
+BANDS = 4
+_ROWS = NUM_PERM // BANDS
+_SHINGLE = 3
+_PRIME = (1 << 61) - 1
+_rng = random.Random(0x0D06EA2ED)
+_PERMS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+
+
+@dataclass
+class Signature:
+    fingerprint: str
+    shingles: frozenset[str]
+    buckets: list[str] = field(default_factory=list)
+
+
+def _key(parsed: dict[str, Any]) -> str:
+    # Title/author when the parser found them, so "Dune by Frank Herbert #booktok" and
+    # "dune - frank herbert 🔥" reduce to the same text.
+    return match_text(parsed.get("text") or "")
+
+
+def _shingles(key: str) -> frozenset[str]:
+    if len(key) <= _SHINGLE:
+        return frozenset([key])
+    return frozenset(key[i : i + _SHINGLE] for i in range(len(key) - _SHINGLE + 1))
+
+
+def _hash64(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def minhash(shingles: frozenset[str]) -> list[int]:
+    hashes = [_hash64(s) for s in shingles]
+    return [min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMS]
+
+
+def signature(parsed: dict[str, Any]) -> Signature | None:
+    """Fingerprint, shingles and LSH buckets for a parsed capture; None if too short."""
+    key = _key(parsed)
+    if len(key) < _SHINGLE:
+        return None
+    shingles = _shingles(key)
+    sig = minhash(shingles)
+    buckets = []
+    for band in range(BANDS):
+        rows = sig[band * _ROWS : (band + 1) * _ROWS]
+        digest = hashlib.blake2b(repr(rows).encode("ascii"), digest_size=8).hexdigest()
+        buckets.append(f"{band}:{digest}")
+    fingerprint = hashlib.blake2b(key.encode("utf-8"), digest_size=12).hexdigest()
+    return Signature(fingerprint=fingerprint, shingles=shingles, buckets=buckets)
+
+
+def jaccard(a: frozenset[str], b: frozenset[str]) -> float:
+    return len(a & b) / len(a | b) if a or b else 0.0
+
+
+class DedupIndex:
+    """The user's earlier captures that could duplicate a given set of new ones.
+
+    ``load`` fetches them with two indexed queries (fingerprint, then LSH buckets) for
+    a whole chunk of captures; ``add`` registers captures accepted in this chunk so
+    repeats within one batch are caught too.
+    """
+
+    def __init__(self) -> None:
+        self.by_fingerprint: dict[str, IntakeItem] = {}
+        self.by_bucket: dict[str, list[IntakeItem]] = {}
+        self.shingles: dict[UUID, frozenset[str]] = {}
+
+    @classmethod
+    async def load(
+        cls, session: AsyncSession, user_id: UUID, sigs: Sequence[Signature | None]
+    ) -> "DedupIndex":
+        index = cls()
+        sigs = [s for s in sigs if s is not None]
+        if not sigs:
+            return index
+
+        exact = await session.exec(
+            select(IntakeItem).where(
+                IntakeItem.user_id == user_id,
+                IntakeItem.fingerprint.in_({s.fingerprint for s in sigs}),
+                IntakeItem.duplicate_of_id.is_(None),
+            )
+        )
+        for item in exact:
+            index.by_fingerprint.setdefault(item.fingerprint, item)
+
+        buckets = {b for s in sigs for b in s.buckets}
+        rows = await session.exec(
+            select(IntakeDedupBucket.bucket, IntakeItem)
+            .join(IntakeItem, IntakeItem.id == IntakeDedupBucket.intake_id)
+            .where(
+                IntakeDedupBucket.user_id == user_id,
+                IntakeDedupBucket.bucket.in_(buckets),
+            )
+            .limit(settings.DEDUP_MAX_CANDIDATES * BANDS)
+        )
+        for bucket, item in rows:
+            index.by_bucket.setdefault(bucket, []).append(item)
+        return index
+
+    def _shingles_of(self, item: IntakeItem) -> frozenset[str]:
+        if item.id not in self.shingles:
+            self.shingles[item.id] = _shingles(_key(stored_parse(item)))
+        return self.shingles[item.id]
+
+    def match(self, sig: Signature | None) -> IntakeItem | None:
+        """The earlier capture this one repeats, if any."""
+        if sig is None:
+            return None
+        if (item := self.by_fingerprint.get(sig.fingerprint)) is not None:
+            return item
+        best, best_score = None, settings.DEDUP_THRESHOLD
+        seen: set[UUID] = set()
+        for bucket in sig.buckets:
+            for item in self.by_bucket.get(bucket, ()):
+                if item.id in seen:
+                    continue
+                seen.add(item.id)
+                score = jaccard(sig.shingles, self._shingles_of(item))
+                if score >= best_score:
+                    best, best_score = item, score
+        return best
+
+    def add(self, item: IntakeItem, sig: Signature | None) -> None:
+        if sig is None:
+            return
+        self.by_fingerprint.setdefault(sig.fingerprint, item)
+        self.shingles[item.id] = sig.shingles
+        for bucket in sig.buckets:
+            self.by_bucket.setdefault(bucket, []).append(item)
+
+
+def bucket_rows(item: IntakeItem, sig: Signature | None) -> list[IntakeDedupBucket]:
+    if sig is None:
+        return []
+    return [
+        IntakeDedupBucket(user_id=item.user_id, bucket=b, intake_id=item.id)
+        for b in sig.buckets
+    ]
+
+
+def is_repeat(original: IntakeItem, source_id: UUID | None, source_post_url: str | None) -> bool:
+    """True when a duplicate capture brings nothing new and can be merged outright.
+
+    A different source (another friend, another account) or a different post is worth
+    keeping as a linked row so per-source analytics still see it.
+    """
+    return source_id == original.source_id and source_post_url in (
+        None,
+        original.source_post_url,
+    )
+
+
+async def count_repeats(session: AsyncSession, original: IntakeItem, n: int = 1) -> None:
+    """Add ``n`` captures to an existing item, atomically in SQL.
+
+    The in-session object is updated along with the row, so it can be returned as is.
+    """
+    await session.exec(
+        update(IntakeItem)
+        .where(IntakeItem.id == original.id)
+        .values(capture_count=IntakeItem.capture_count + n)
+    )
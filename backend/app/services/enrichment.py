@@ -0,0 +1,555 @@
+import asyncio
+import logging
+import random
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+from uuid import UUID, uuid4
+
+import httpx
+from rapidfuzz import fuzz
+from sqlalchemy import func, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core import etag
+from app.core import isbn as isbn_lib
+from app.core.config import settings
+from app.db.session import async_engine
+from app.models import Book, BookIdentifier, Edition, IntakeItem
+from app.models.identifier import EDITION_SCHEMES
+from app.services import jobs
+from app.services.lookup_cache import MISS, cache_key, lookup_cache
+from app.services.matcher import catalog_index, match_items, normalize
+from app.services.parser import stored_parse
+
+logger = logging.getLogger(__name__)
+
+_RETRY_STATUSES = {429, 500, 502, 503, 504}
+_MAX_BACKOFF_SECONDS = 30.0
+_RESULTS_PER_PROVIDER = 5
+
+# Statuses that still want a lookup; anything else has been matched or handled by hand.
+ENRICHABLE_STATUSES = ("new", "parsed")
+
+ENRICH_JOB = "enrich"
+
+
+class ProviderError(Exception):
+    pass
+
+
+@dataclass
+class LookupQuery:
+    text: str
+    title: str | None = None
+    author: str | None = None
+    isbn: str | None = None
+
+
+@dataclass
+class BookCandidate:
+    provider: str
+    title: str
+    authors: list[str] = field(default_factory=list)
+    subtitle: str | None = None
+    description: str | None = None
+    language: str | None = None
+    page_count: int | None = None
+    published_date: str | None = None
+    publisher: str | None = None
+    cover_url: str | None = None
+    isbn13: str | None = None
+    isbn10: str | None = None
+    identifiers: dict[str, str] = field(default_factory=dict)
+    score: float = 0.0
+
+
+@dataclass
+class EnrichmentReport:
+    matched: int = 0
+    needs_review: int = 0
+    failed: int = 0
+
+
+def build_query(parsed: dict[str, Any]) -> LookupQuery | None:
+    """Lookup query from a stored capture parse (see app.services.parser)."""
+    text = parsed.get("text") or ""
+    if parsed.get("isbn13"):
+        return LookupQuery(text=text, isbn=parsed["isbn13"])
+    if not parsed.get("title"):
+        return None
+    return LookupQuery(text=text, title=parsed["title"], author=parsed.get("author"))
+
+
+def score_candidate(query: LookupQuery, cand: BookCandidate) -> float:
+    if query.isbn and query.isbn == cand.isbn13:
+        return 1.0
+    if not query.title:
+        return fuzz.token_set_ratio(
+            normalize(query.text), normalize(f"{cand.title} {' '.join(cand.authors)}")
+        ) / 100
+    title_score = fuzz.token_sort_ratio(normalize(query.title), normalize(cand.title))
+    if query.author and cand.authors:
+        author_score = max(
+            fuzz.token_set_ratio(normalize(query.author), normalize(a)) for a in cand.authors
+        )
+        return (0.7 * title_score + 0.3 * author_score) / 100
+    return title_score / 100
+
+
+class Provider(ABC):
+    """One metadata source: how to ask it for a query, and how to read its answer."""
+
+    name: str
+
+    def __init__(self, base_url: str, concurrency: int):
+        self.base_url = base_url.rstrip("/")
+        self.concurrency = concurrency
+        self.semaphore = asyncio.Semaphore(concurrency)
+
+    @abstractmethod
+    def request(self, query: LookupQuery) -> tuple[str, dict[str, Any]]:
+        """URL and query params for a lookup."""
+
+    @abstractmethod
+    def parse(self, data: Any) -> list[BookCandidate]:
+        """Candidates from a decoded response body."""
+
+
+class OpenLibraryProvider(Provider):
+    name = "openlibrary"
+
+    _FIELDS = (
+        "key,title,subtitle,author_name,first_publish_year,isbn,cover_i,language,"
+        "number_of_pages_median,publisher,edition_key"
+    )
+
+    def request(self, query: LookupQuery) -> tuple[str, dict[str, Any]]:
+        params: dict[str, Any] = {"limit": _RESULTS_PER_PROVIDER, "fields": self._FIELDS}
+        if query.isbn:
+            params["isbn"] = query.isbn
+        elif query.title:
+            params["title"] = query.title
+            if query.author:
+                params["author"] = query.author
+        else:
+            params["q"] = query.text
+        return f"{self.base_url}/search.json", params
+
+    def parse(self, data: Any) -> list[BookCandidate]:
+        out: list[BookCandidate] = []
+        for doc in (data or {}).get("docs") or []:
+            if not doc.get("title"):
+                continue
+            isbn13 = next(filter(None, map(isbn_lib.to_isbn13, doc.get("isbn") or [])), None)
+            identifiers: dict[str, str] = {}
+            if doc.get("key"):
+                identifiers["olwork"] = doc["key"].rsplit("/", 1)[-1]
+            if doc.get("edition_key"):
+                identifiers["olid"] = doc["edition_key"][0]
+            cover_id = doc.get("cover_i")
+            out.append(
+                BookCandidate(
+                    provider=self.name,
+                    title=doc["title"],
+                    subtitle=doc.get("subtitle"),
+                    authors=list(doc.get("author_name") or []),
+                    language=(doc.get("language") or [None])[0],
+                    page_count=doc.get("number_of_pages_median"),
+                    published_date=(
+                        str(doc["first_publish_year"]) if doc.get("first_publish_year") else None
+                    ),
+                    publisher=(doc.get("publisher") or [None])[0],
+                    cover_url=(
+                        f"{settings.OPENLIBRARY_COVERS_URL.rstrip('/')}/b/id/{cover_id}-L.jpg"
+                        if cover_id
+                        else None
+                    ),
+                    isbn13=isbn13,
+                    isbn10=isbn_lib.isbn13_to_10(isbn13) if isbn13 else None,
+                    identifiers=identifiers,
+                )
+            )
+        return out
+
+
+class GoogleBooksProvider(Provider):
+    name = "google_books"
+
+    def request(self, query: LookupQuery) -> tuple[str, dict[str, Any]]:
+        if query.isbn:
+            q = f"isbn:{query.isbn}"
+        elif query.title:
+            q = f'intitle:"{query.title}"'
+            if query.author:
+                q += f' inauthor:"{query.author}"'
+        else:
+            q = query.text
+        params: dict[str, Any] = {
+            "q": q,
+            "maxResults": _RESULTS_PER_PROVIDER,
+            "printType": "books",
+        }
+        if settings.GOOGLE_BOOKS_API_KEY:
+            params["key"] = settings.GOOGLE_BOOKS_API_KEY
+        return f"{self.base_url}/volumes", params
+
+    def parse(self, data: Any) -> list[BookCandidate]:
+        out: list[BookCandidate] = []
+        for vol in (data or {}).get("items") or []:
+            info = vol.get("volumeInfo") or {}
+            if not info.get("title"):
+                continue
+            ids = {
+                i.get("type"): i.get("identifier") for i in info.get("industryIdentifiers") or []
+            }
+            isbn13 = isbn_lib.to_isbn13(ids.get("ISBN_13") or ids.get("ISBN_10"))
+            cover = (info.get("imageLinks") or {}).get("thumbnail")
+            out.append(
+                BookCandidate(
+                    provider=self.name,
+                    title=info["title"],
+                    subtitle=info.get("subtitle"),
+                    authors=list(info.get("authors") or []),
+                    description=info.get("description"),
+                    language=info.get("language"),
+                    page_count=info.get("pageCount"),
+                    published_date=info.get("publishedDate"),
+                    publisher=info.get("publisher"),
+                    cover_url=cover.replace("http://", "https://", 1) if cover else None,
+                    isbn13=isbn13,
+                    isbn10=isbn_lib.isbn13_to_10(isbn13) if isbn13 else None,
+                    identifiers={"google_volume": vol["id"]} if vol.get("id") else {},
+                )
+            )
+        return out
+
+
+def _merge(best: BookCandidate, others: Sequence[BookCandidate]) -> BookCandidate:
+    """Fill gaps in the winning candidate from other results describing the same book."""
+    for other in others:
+        if other is best:
+            continue
+        same_isbn = best.isbn13 is not None and other.isbn13 == best.isbn13
+        same_title = (
+            fuzz.token_sort_ratio(normalize(best.title), normalize(other.title)) >= 90
+        )
+        if not (same_isbn or same_title):
+            continue
+        for name in (
+            "subtitle",
+            "description",
+            "language",
+            "page_count",
+            "published_date",
+            "publisher",
+            "cover_url",
+            "isbn13",
+            "isbn10",
+        ):
+            if getattr(best, name) is None and getattr(other, name) is not None:
+                setattr(best, name, getattr(other, name))
+        if not best.authors:
+            best.authors = other.authors
+        best.identifiers = {**other.identifiers, **best.identifiers}
+    return best
+
+
+class EnrichmentEngine:
+    """Looks intake items up on every provider and links them to Book/Edition rows.
+
+    One pooled AsyncClient is shared by all lookups; each provider has its own
+    concurrency limit and retries transient failures (timeouts, 429/5xx) with backoff.
+    """
+
+    def __init__(self) -> None:
+        self.providers: list[Provider] = [
+            OpenLibraryProvider(settings.OPENLIBRARY_BASE_URL, settings.OPENLIBRARY_CONCURRENCY),
+            GoogleBooksProvider(settings.GOOGLE_BOOKS_BASE_URL, settings.GOOGLE_BOOKS_CONCURRENCY),
+        ]
+        self._client: httpx.AsyncClient | None = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            total = sum(p.concurrency for p in self.providers)
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(settings.ENRICH_TIMEOUT_SECONDS),
+                limits=httpx.Limits(max_connections=total, max_keepalive_connections=total),
+                headers={"User-Agent": f"{settings.APP_NAME}/0.1 (metadata enrichment)"},
+                follow_redirects=True,
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _get_json(self, provider: Provider, url: str, params: dict[str, Any]) -> Any:
+        error: Exception | None = None
+        async with provider.semaphore:
+            for attempt in range(settings.ENRICH_MAX_RETRIES + 1):
+                retry_after: float | None = None
+                try:
+                    resp = await self.client.get(url, params=params)
+                except httpx.TransportError as e:
+                    error = e
+                else:
+                    if resp.status_code not in _RETRY_STATUSES:
+                        resp.raise_for_status()
+                        return resp.json()
+                    error = ProviderError(f"{provider.name} returned {resp.status_code}")
+                    try:
+                        retry_after = float(resp.headers.get("retry-after", ""))
+                    except ValueError:
+                        retry_after = None
+
+                if attempt == settings.ENRICH_MAX_RETRIES:
+                    break
+                delay = settings.ENRICH_BACKOFF_SECONDS * 2**attempt
+                delay = retry_after if retry_after is not None else delay + random.uniform(0, delay)
+                await asyncio.sleep(min(delay, _MAX_BACKOFF_SECONDS))
+        raise ProviderError(f"{provider.name} lookup failed") from error
+
+    async def _search(self, provider: Provider, query: LookupQuery) -> list[BookCandidate]:
+        url, params = provider.request(query)
+        if not settings.LOOKUP_CACHE_ENABLED:
+            return provider.parse(await self._get_json(provider, url, params))
+
+        key = cache_key(provider.name, url.removeprefix(provider.base_url), params)
+        # The cache is a blocking sqlite3 file; keep its I/O off the event loop.
+        cached = await asyncio.to_thread(lookup_cache.get, key)
+        if cached is MISS:
+            return []
+        if cached is not None:
+            return provider.parse(cached)
+
+        data = await self._get_json(provider, url, params)
+        candidates = provider.parse(data)
+        # Empty results are cached too (with a shorter TTL); failures never are.
+        await asyncio.to_thread(lookup_cache.put, key, provider.name, data, not candidates)
+        return candidates
+
+    async def lookup(self, query: LookupQuery) -> list[BookCandidate] | None:
+        """Query every provider concurrently; None means all of them failed."""
+        results = await asyncio.gather(
+            *(self._search(p, query) for p in self.providers), return_exceptions=True
+        )
+        candidates: list[BookCandidate] = []
+        failures = 0
+        for provider, result in zip(self.providers, results):
+            if isinstance(result, BaseException):
+                failures += 1
+                logger.warning(
+                    "enrichment: %s failed for %r: %s", provider.name, query.text, result
+                )
+                continue
+            candidates.extend(result)
+        if failures == len(self.providers):
+            return None
+        for cand in candidates:
+            cand.score = score_candidate(query, cand)
+        candidates.sort(key=lambda c: c.score, reverse=True)
+        return candidates
+
+    async def enrich_items(self, item_ids: Sequence[UUID]) -> EnrichmentReport:
+        """Look up and link the given intake items. Never raises; failures are logged."""
+        report = EnrichmentReport()
+        ids = list(item_ids)
+        for start in range(0, len(ids), settings.ENRICH_BATCH_SIZE):
+            try:
+                await self._enrich_chunk(ids[start : start + settings.ENRICH_BATCH_SIZE], report)
+            except Exception:
+                logger.exception("enrichment: batch failed")
+                report.failed += len(ids[start : start + settings.ENRICH_BATCH_SIZE])
+        return report
+
+    async def _enrich_chunk(self, ids: list[UUID], report: EnrichmentReport) -> None:
+        async with AsyncSession(async_engine, expire_on_commit=False) as session:
+            items = (
+                await session.exec(
+                    select(IntakeItem).where(
+                        IntakeItem.id.in_(ids),
+                        IntakeItem.status.in_(ENRICHABLE_STATUSES),
+                        IntakeItem.matched_book_id.is_(None),
+                    )
+                )
+            ).all()
+            owners = {i.user_id for i in items}
+            report.matched += len(items)
+            # The local catalog answers most repeat captures without touching the network.
+            items = await match_items(session, items)
+            report.matched -= len(items)
+
+            queries = {i.id: build_query(stored_parse(i)) for i in items}
+            searchable = [i for i in items if queries[i.id] is not None]
+
+            # Network first, all items at once (bounded by the provider semaphores);
+            # the session is then used sequentially for the writes.
+            lookups = await asyncio.gather(*(self.lookup(queries[i.id]) for i in searchable))
+            found = {i.id: candidates for i, candidates in zip(searchable, lookups)}
+
+            for item in items:
+                candidates = found.get(item.id, [])
+                if candidates is None:
+                    report.failed += 1
+                    continue
+                if not candidates:
+                    item.status = "needs_review"
+                    report.needs_review += 1
+                else:
+                    best = _merge(candidates[0], candidates)
+                    book = await upsert_book(session, best)
+                    item.matched_book_id = book.id
+                    item.match_confidence = round(best.score, 4)
+                    if best.score >= settings.ENRICH_MATCH_THRESHOLD:
+                        item.status = "matched"
+                        report.matched += 1
+                    else:
+                        item.status = "needs_review"
+                        report.needs_review += 1
+                session.add(item)
+            for user_id in owners:
+                await etag.bump(session, user_id, etag.INTAKE)
+            await session.commit()
+
+
+def candidate_identifiers(cand: BookCandidate) -> dict[str, str]:
+    ids = {k: v for k, v in cand.identifiers.items() if v}
+    isbn13 = isbn_lib.to_isbn13(cand.isbn13 or cand.isbn10)
+    if isbn13:
+        ids["isbn13"] = isbn13
+    return ids
+
+
+def register_identifiers_stmt(
+    dialect: str, ids: dict[str, str], book_id: UUID, edition_id: UUID | None
+):
+    """INSERT for BookIdentifier rows that skips any (scheme, value) already registered.
+
+    A concurrent writer may get there first; the first registration wins.
+    """
+    rows = [
+        {
+            "id": uuid4(),
+            "scheme": scheme,
+            "value": value,
+            "book_id": book_id,
+            "edition_id": edition_id if scheme in EDITION_SCHEMES else None,
+            "created_at": datetime.utcnow(),
+        }
+        for scheme, value in ids.items()
+    ]
+    insert = pg_insert if dialect == "postgresql" else sqlite_insert
+    return insert(BookIdentifier).values(rows).on_conflict_do_nothing()
+
+
+async def upsert_book(session: AsyncSession, cand: BookCandidate) -> Book:
+    """Find the Book for a candidate or create it, registering its identifiers.
+
+    Identity is resolved through BookIdentifier with one indexed (scheme, value) query
+    covering every identifier the candidate carries; title/author is only a fallback.
+    """
+    primary_author = cand.authors[0] if cand.authors else "Unknown"
+    now = datetime.utcnow()
+    ids = candidate_identifiers(cand)
+    isbn13 = ids.get("isbn13")
+
+    known: list[BookIdentifier] = []
+    if ids:
+        known = list(
+            (
+                await session.exec(
+                    select(BookIdentifier).where(
+                        tuple_(BookIdentifier.scheme, BookIdentifier.value).in_(list(ids.items()))
+                    )
+                )
+            ).all()
+        )
+    # Prefer an edition-level hit (ISBN first) over a work-level one.
+    known.sort(key=lambda r: (r.edition_id is None, r.scheme != "isbn13"))
+
+    book = await session.get(Book, known[0].book_id) if known else None
+    edition_id = next((r.edition_id for r in known if r.edition_id), None)
+
+    if book is None:
+        book = (
+            await session.exec(
+                select(Book).where(
+                    func.lower(Book.title) == cand.title.lower(),
+                    func.lower(Book.primary_author) == primary_author.lower(),
+                )
+            )
+        ).first()
+
+    if book is None:
+        book = Book(
+            title=cand.title,
+            subtitle=cand.subtitle,
+            primary_author=primary_author,
+            authors_json=cand.authors,
+            description=cand.description,
+            language=cand.language,
+            page_count=cand.page_count,
+            published_date=cand.published_date,
+            cover_url=cand.cover_url,
+            identifiers_json=ids,
+        )
+    else:
+        for name in ("subtitle", "description", "language", "page_count", "cover_url"):
+            if getattr(book, name) is None and getattr(cand, name) is not None:
+                setattr(book, name, getattr(cand, name))
+        if not book.published_date:
+            book.published_date = cand.published_date
+        # JSON columns aren't mutation-tracked; assign a new dict.
+        book.identifiers_json = {**ids, **(book.identifiers_json or {})}
+        book.updated_at = now
+    session.add(book)
+    await session.flush()
+    catalog_index.add(book.id, book.title, book.primary_author)
+
+    if edition_id is None and isbn13:
+        edition = Edition(
+            book_id=book.id,
+            isbn13=isbn13,
+            isbn10=isbn_lib.isbn13_to_10(isbn13),
+            publisher=cand.publisher,
+            published_date=cand.published_date,
+            cover_url=cand.cover_url,
+            identifiers_json=ids,
+        )
+        session.add(edition)
+        await session.flush()
+        edition_id = edition.id
+
+    known_pairs = {(r.scheme, r.value) for r in known}
+    missing = {k: v for k, v in ids.items() if (k, v) not in known_pairs}
+    if missing:
+        await session.exec(
+            register_identifiers_stmt(session.bind.dialect.name, missing, book.id, edition_id)
+        )
+    return book
+
+
+enricher = EnrichmentEngine()
+
+
+def enqueue_enrichment(session: AsyncSession, item_ids: Sequence[UUID]) -> None:
+    """Queue a lookup for the given intake items, committed with the caller's writes."""
+    for start in range(0, len(item_ids), settings.ENRICH_BATCH_SIZE):
+        chunk = item_ids[start : start + settings.ENRICH_BATCH_SIZE]
+        jobs.enqueue(session, ENRICH_JOB, {"item_ids": [str(i) for i in chunk]})
+
+
+@jobs.handler(ENRICH_JOB)
+async def _run_enrich_job(payload: dict[str, Any]) -> None:
+    report = await enricher.enrich_items([UUID(i) for i in payload["item_ids"]])
+    if report.failed:
+        # Retried with backoff; items matched or sent to review meanwhile are skipped.
+        raise ProviderError(f"{report.failed} of {len(payload['item_ids'])} lookups failed")
@@ -0,0 +1,284 @@
+import asyncio
+import logging
+import random
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any
+
+from sqlalchemy import and_, event, func, or_, update
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.db.session import async_engine
+from app.models import Job
+from app.models.intake import utcnow
+from app.models.job import DONE, FAILED, QUEUED, RUNNING
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[dict[str, Any]], Awaitable[None]]
+
+# kind -> coroutine run with the job's payload; raising schedules a retry.
+handlers: dict[str, Handler] = {}
+
+_MAX_ERROR_CHARS = 2000
+
+
+def handler(kind: str) -> Callable[[Handler], Handler]:
+    """Register the coroutine that runs jobs of ``kind``."""
+
+    def register(fn: Handler) -> Handler:
+        handlers[kind] = fn
+        return fn
+
+    return register
+
+
+def enqueue(
+    session: AsyncSession,
+    kind: str,
+    payload: dict[str, Any],
+    *,
+    delay: float = 0,
+    max_attempts: int | None = None,
+) -> Job:
+    """Add a job to the caller's transaction; it becomes visible when that commits.
+
+    Writing the job alongside the rows it refers to means it can't be lost, or run
+    against data that was rolled back. Workers are woken as soon as the commit lands.
+    """
+    job = Job(
+        kind=kind,
+        payload=payload,
+        run_at=utcnow() + timedelta(seconds=delay),
+        max_attempts=max_attempts or settings.JOB_MAX_ATTEMPTS,
+    )
+    session.add(job)
+    target = session.sync_session
+    if not event.contains(target, "after_commit", _wake_workers):
+        event.listen(target, "after_commit", _wake_workers)
+    return job
+
+
+def _wake_workers(_session) -> None:
+    job_queue.notify()
+
+
+def backoff_seconds(attempts: int) -> float:
+    """Delay before retrying after the ``attempts``-th failure, with jitter."""
+    delay = settings.JOB_BACKOFF_SECONDS * 2 ** (attempts - 1)
+    delay = min(delay, settings.JOB_BACKOFF_MAX_SECONDS)
+    return delay + random.uniform(0, delay / 2)
+
+
+def _due(now: datetime):
+    return or_(
+        and_(Job.state == QUEUED, Job.run_at <= now),
+        and_(Job.state == RUNNING, Job.lease_expires_at < now),
+    )
+
+
+@dataclass
+class QueueCounters:
+    """What this process's workers have done since startup."""
+
+    done: int = 0
+    retried: int = 0
+    failed: int = 0
+
+
+class JobQueue:
+    """Worker pool that claims due jobs from the Job table and runs their handlers.
+
+    Claims are a conditional UPDATE on the job's state, so several workers (or several
+    app processes sharing the database) never run the same attempt twice. A job whose
+    worker died is picked up again once its lease expires.
+    """
+
+    def __init__(self) -> None:
+        self._tasks: list[asyncio.Task] = []
+        self._wake: asyncio.Event | None = None
+        self.counters = QueueCounters()
+
+    @property
+    def workers(self) -> int:
+        return len(self._tasks)
+
+    def start(self, workers: int | None = None) -> None:
+        if self._tasks:
+            return
+        self._wake = asyncio.Event()
+        for n in range(workers or settings.JOB_WORKERS):
+            self._tasks.append(asyncio.create_task(self._worker(), name=f"job-worker-{n}"))
+
+    async def aclose(self) -> None:
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._wake = None
+
+    def notify(self) -> None:
+        if self._wake is not None:
+            self._wake.set()
+
+    async def _worker(self) -> None:
+        while True:
+            try:
+                job = await self._claim()
+                if job is not None:
+                    await self._run(job)
+                    continue
+            except Exception:
+                # The database is busy or gone; an unfinished job's lease will expire.
+                logger.exception("jobs: worker error")
+            try:
+                await asyncio.wait_for(self._wake.wait(), settings.JOB_POLL_SECONDS)
+            except TimeoutError:
+                pass
+            self._wake.clear()
+
+    async def _claim(self) -> Job | None:
+        now = utcnow()
+        async with AsyncSession(async_engine, expire_on_commit=False) as session:
+            candidates = (
+                await session.exec(
+                    select(Job.id).where(_due(now)).order_by(Job.run_at).limit(len(self._tasks))
+                )
+            ).all()
+            for job_id in candidates:
+                claimed = await session.exec(
+                    update(Job)
+                    .where(Job.id == job_id, _due(now))
+                    .values(
+                        state=RUNNING,
+                        attempts=Job.attempts + 1,
+                        started_at=now,
+                        lease_expires_at=now + timedelta(seconds=settings.JOB_LEASE_SECONDS),
+                    )
+                )
+                if claimed.rowcount == 1:
+                    await session.commit()
+                    return await session.get(Job, job_id)
+            await session.rollback()
+        return None
+
+    async def _run(self, job: Job) -> None:
+        fn = handlers.get(job.kind)
+        try:
+            if fn is None:
+                raise LookupError(f"no handler registered for job kind {job.kind!r}")
+            # Past the lease another worker may claim the job, so stop before then.
+            await asyncio.wait_for(fn(job.payload), settings.JOB_LEASE_SECONDS)
+        except asyncio.CancelledError:
+            # Shutting down: hand the job straight back rather than waiting out the lease.
+            await asyncio.shield(self._release(job))
+            raise
+        except Exception as e:
+            logger.warning("jobs: %s %s attempt %d failed: %r", job.kind, job.id, job.attempts, e)
+            await self._finish(job, error=e)
+        else:
+            await self._finish(job)
+
+    async def _finish(self, job: Job, error: Exception | None = None) -> None:
+        now = utcnow()
+        values: dict[str, Any] = {"lease_expires_at": None}
+        if error is None:
+            values.update(state=DONE, finished_at=now, last_error=None)
+            self.counters.done += 1
+        else:
+            values["last_error"] = repr(error)[:_MAX_ERROR_CHARS]
+            if job.attempts >= job.max_attempts:
+                values.update(state=FAILED, finished_at=now)
+                self.counters.failed += 1
+            else:
+                values.update(
+                    state=QUEUED, run_at=now + timedelta(seconds=backoff_seconds(job.attempts))
+                )
+                self.counters.retried += 1
+        await self._update_attempt(job, values)
+
+    async def _release(self, job: Job) -> None:
+        await self._update_attempt(
+            job,
+            {"state": QUEUED, "attempts": Job.attempts - 1, "lease_expires_at": None},
+        )
+
+    async def _update_attempt(self, job: Job, values: dict[str, Any]) -> None:
+        # Only the attempt this worker claimed: if the lease ran out and another worker
+        # took the job over, that worker owns the outcome.
+        async with AsyncSession(async_engine, expire_on_commit=False) as session:
+            await session.exec(
+                update(Job)
+                .where(Job.id == job.id, Job.state == RUNNING, Job.attempts == job.attempts)
+                .values(**values)
+            )
+            await session.commit()
+
+
+job_queue = JobQueue()
+
+
+@dataclass
+class KindStats:
+    kind: str
+    queued: int = 0
+    running: int = 0
+    done: int = 0
+    failed: int = 0
+
+
+@dataclass
+class QueueStats:
+    queued: int
+    due: int
+    running: int
+    oldest_due_seconds: float | None
+    window_seconds: int
+    done: int
+    failed: int
+    kinds: list[KindStats]
+
+
+async def queue_stats(session: AsyncSession, window_seconds: int) -> QueueStats:
+    """Queue depth now, and jobs finished in the last ``window_seconds``, per kind."""
+    now = utcnow()
+    since = now - timedelta(seconds=window_seconds)
+    kinds: dict[str, KindStats] = {}
+
+    pending = await session.exec(
+        select(Job.kind, Job.state, func.count())
+        .where(Job.state.in_((QUEUED, RUNNING)))
+        .group_by(Job.kind, Job.state)
+    )
+    finished = await session.exec(
+        select(Job.kind, Job.state, func.count())
+        .where(Job.state.in_((DONE, FAILED)), Job.finished_at >= since)
+        .group_by(Job.kind, Job.state)
+    )
+    for kind, state, count in [*pending, *finished]:
+        setattr(kinds.setdefault(kind, KindStats(kind)), state, count)
+
+    due, oldest = (
+        await session.exec(
+            select(func.count(), func.min(Job.run_at)).where(
+                Job.state == QUEUED, Job.run_at <= now
+            )
+        )
+    ).one()
+    if oldest is not None and oldest.tzinfo is None:
+        oldest = oldest.replace(tzinfo=now.tzinfo)
+
+    stats = sorted(kinds.values(), key=lambda k: k.kind)
+    return QueueStats(
+        queued=sum(k.queued for k in stats),
+        due=due,
+        running=sum(k.running for k in stats),
+        oldest_due_seconds=(now - oldest).total_seconds() if oldest else None,
+        window_seconds=window_seconds,
+        done=sum(k.done for k in stats),
+        failed=sum(k.failed for k in stats),
+        kinds=stats,
+    )
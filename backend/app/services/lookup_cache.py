@@ -0,0 +1,186 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any
+
+from app.core.config import settings
+
+# Re-stamping last_access on every hit would turn each read into a write; a coarse
+# granularity keeps eviction roughly LRU while hits stay read-only.
+_TOUCH_GRANULARITY_SECONDS = 3600
+# Check the size bound every N writes instead of counting rows on every put.
+_EVICT_EVERY = 100
+# Hit/miss counters are added to the file every N lookups (and on close), so they
+# survive restarts and `app.cli lookup-cache stats` sees what the API processes did.
+_STATS_FLUSH_EVERY = 100
+_COUNTERS = ("hits", "negative_hits", "misses")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS lookup_cache (
+    key TEXT PRIMARY KEY,
+    provider TEXT NOT NULL,
+    payload TEXT,
+    is_miss INTEGER NOT NULL DEFAULT 0,
+    expires_at REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_lookup_cache_last_access ON lookup_cache (last_access);
+CREATE TABLE IF NOT EXISTS lookup_cache_stats (
+    name TEXT PRIMARY KEY,
+    count INTEGER NOT NULL
+);
+"""
+
+MISS = object()
+
+
+def cache_key(provider: str, path: str, params: dict[str, Any]) -> str:
+    """Normalize a provider request so equivalent queries share one entry."""
+    parts = [
+        f"{k}={' '.join(str(v).lower().split())}"
+        for k, v in sorted(params.items())
+        if k != "key"  # never persist API keys
+    ]
+    return f"{provider}:{path}?{'&'.join(parts)}"
+
+
+class LookupCache:
+    """On-disk cache of external book-metadata responses, shared across processes.
+
+    Lives in its own SQLite file (not DATABASE_URL) so it works the same whether the
+    main database is SQLite or Postgres, and can be deleted at any time.
+    """
+
+    def __init__(self, path: str, max_entries: int, ttl: float, miss_ttl: float):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.miss_ttl = miss_ttl
+        # Counted since the last flush to lookup_cache_stats.
+        self._pending: Counter[str] = Counter()
+        self._writes = 0
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=2000")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def get(self, key: str) -> Any:
+        """Return the cached payload, MISS for a cached negative result, or None."""
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT payload, is_miss, expires_at, last_access FROM lookup_cache WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None or row[2] <= now:
+                self._count(conn, "misses")
+                return None
+            if now - row[3] > _TOUCH_GRANULARITY_SECONDS:
+                conn.execute("UPDATE lookup_cache SET last_access = ? WHERE key = ?", (now, key))
+            if row[1]:
+                self._count(conn, "negative_hits")
+                return MISS
+            self._count(conn, "hits")
+            return json.loads(row[0])
+
+    def _count(self, conn: sqlite3.Connection, name: str) -> None:
+        self._pending[name] += 1
+        if self._pending.total() >= _STATS_FLUSH_EVERY:
+            self._flush_counters(conn)
+
+    def _flush_counters(self, conn: sqlite3.Connection) -> None:
+        if not self._pending:
+            return
+        conn.executemany(
+            "INSERT INTO lookup_cache_stats (name, count) VALUES (?, ?) "
+            "ON CONFLICT (name) DO UPDATE SET count = count + excluded.count",
+            list(self._pending.items()),
+        )
+        self._pending.clear()
+
+    def put(self, key: str, provider: str, payload: Any, is_miss: bool = False) -> None:
+        now = time.time()
+        ttl = self.miss_ttl if is_miss else self.ttl
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO lookup_cache "
+                "(key, provider, payload, is_miss, expires_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    provider,
+                    None if is_miss else json.dumps(payload, separators=(",", ":")),
+                    int(is_miss),
+                    now + ttl,
+                    now,
+                ),
+            )
+            self._writes += 1
+            if self._writes % _EVICT_EVERY == 0:
+                self._evict(conn, now)
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        conn.execute("DELETE FROM lookup_cache WHERE expires_at <= ?", (now,))
+        (count,) = conn.execute("SELECT COUNT(*) FROM lookup_cache").fetchone()
+        excess = count - self.max_entries
+        if excess > 0:
+            conn.execute(
+                "DELETE FROM lookup_cache WHERE key IN "
+                "(SELECT key FROM lookup_cache ORDER BY last_access LIMIT ?)",
+                (excess,),
+            )
+
+    def clear(self) -> None:
+        """Drop every entry and reset the hit/miss counters."""
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM lookup_cache")
+            conn.execute("DELETE FROM lookup_cache_stats")
+            self._pending.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """Entry count and hit/miss counters across every process using this file."""
+        with self._lock:
+            conn = self._connect()
+            self._flush_counters(conn)
+            (entries,) = conn.execute("SELECT COUNT(*) FROM lookup_cache").fetchone()
+            counts = dict(conn.execute("SELECT name, count FROM lookup_cache_stats"))
+        hits, negative_hits, misses = (counts.get(name, 0) for name in _COUNTERS)
+        served = hits + negative_hits
+        lookups = served + misses
+        return {
+            "entries": entries,
+            "hits": hits,
+            "negative_hits": negative_hits,
+            "misses": misses,
+            "hit_rate": round(served / lookups, 4) if lookups else 0.0,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._flush_counters(self._conn)
+                self._conn.close()
+                self._conn = None
+
+
+lookup_cache = LookupCache(
+    path=settings.LOOKUP_CACHE_PATH,
+    max_entries=settings.LOOKUP_CACHE_MAX_ENTRIES,
+    ttl=settings.LOOKUP_CACHE_TTL_SECONDS,
+    miss_ttl=settings.LOOKUP_CACHE_MISS_TTL_SECONDS,
+)
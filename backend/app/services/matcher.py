@@ -0,0 +1,161 @@
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from collections.abc import Sequence
+from uuid import UUID
+
+import numpy as np
+from rapidfuzz import fuzz, process
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.models import Book, IntakeItem
+from app.services.parser import stored_parse
+
+_URL_RE = re.compile(r"https?://\S+")
+_TAG_RE = re.compile(r"[#@]\w+")
+_NON_WORD_RE = re.compile(r"[^\w\s]")
+_STOPWORDS = frozenset({"a", "an", "and", "by", "for", "in", "of", "on", "the", "to", "with"})
+
+
+def normalize(text: str) -> str:
+    """Lowercase, drop punctuation and collapse whitespace."""
+    return " ".join(_NON_WORD_RE.sub(" ", text.lower()).split())
+
+
+def match_text(raw_text: str) -> str:
+    """Reduce capture text to the words worth matching: no URLs, tags or 'by'."""
+    text = normalize(_TAG_RE.sub(" ", _URL_RE.sub(" ", raw_text or "")))
+    return " ".join(t for t in text.split() if t != "by")
+
+
+def _tokens(text: str) -> list[str]:
+    return [t for t in text.split() if len(t) > 1 and t not in _STOPWORDS]
+
+
+def _trigrams(token: str) -> list[str]:
+    return [token[i : i + 3] for i in range(len(token) - 2)] if len(token) > 3 else [token]
+
+
+class CatalogIndex:
+    """In-memory blocking index over the Book catalog.
+
+    Title tokens map to candidate books, so a lookup only scores the handful of books
+    that share a word with the query (falling back to token trigrams for typos)
+    instead of every book. Those candidates are scored with a single ``cdist`` call.
+    """
+
+    def __init__(self) -> None:
+        self.book_ids: list[UUID] = []
+        self.titles: list[str] = []
+        self.full: list[str] = []
+        self._positions: dict[UUID, int] = {}
+        self._by_token: dict[str, list[int]] = defaultdict(list)
+        self._by_trigram: dict[str, list[int]] = defaultdict(list)
+        self.built_at = 0.0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.book_ids)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.book_ids.clear()
+            self.titles.clear()
+            self.full.clear()
+            self._positions.clear()
+            self._by_token.clear()
+            self._by_trigram.clear()
+            self.built_at = 0.0
+
+    def add(self, book_id: UUID, title: str, author: str | None) -> None:
+        title_n = normalize(title)
+        with self._lock:
+            if book_id in self._positions:
+                # Titles rarely change; keep the first indexed form.
+                return
+            pos = len(self.book_ids)
+            self._positions[book_id] = pos
+            self.book_ids.append(book_id)
+            self.titles.append(title_n)
+            self.full.append(f"{title_n} {normalize(author or '')}".strip())
+            for token in set(_tokens(title_n)):
+                self._by_token[token].append(pos)
+                for gram in _trigrams(token):
+                    self._by_trigram[gram].append(pos)
+
+    def candidates(self, query: str, limit: int) -> list[int]:
+        tokens = _tokens(query)
+        counts: Counter[int] = Counter()
+        for token in tokens:
+            counts.update(self._by_token.get(token, ()))
+        if not counts:
+            for token in tokens:
+                for gram in _trigrams(token):
+                    counts.update(self._by_trigram.get(gram, ()))
+        return [pos for pos, _ in counts.most_common(limit)]
+
+    def match_many(self, texts: Sequence[str]) -> list[tuple[UUID, float] | None]:
+        """Best (book_id, confidence 0..1) per text, or None when nothing is close."""
+        out: list[tuple[UUID, float] | None] = []
+        for text in texts:
+            query = match_text(text)
+            cands = self.candidates(query, settings.MATCH_MAX_CANDIDATES) if query else []
+            if not cands:
+                out.append(None)
+                continue
+            # A capture may name just the title or title + author; score both in one
+            # cdist call and keep the better of the two per book. Scoring only this
+            # query's own candidates keeps the matrix at 1 x 2k rather than batch x union.
+            scores = process.cdist(
+                [query],
+                [self.titles[p] for p in cands] + [self.full[p] for p in cands],
+                scorer=fuzz.token_sort_ratio,
+                dtype=np.uint8,
+            )[0]
+            best = np.maximum(scores[: len(cands)], scores[len(cands) :])
+            col = int(best.argmax())
+            out.append((self.book_ids[cands[col]], float(best[col]) / 100))
+        return out
+
+
+catalog_index = CatalogIndex()
+
+
+async def ensure_catalog_index(session: AsyncSession) -> CatalogIndex:
+    """Load the catalog on first use, and reload it once it is older than the refresh window.
+
+    Books created in this process are added as they are written, so the reload only
+    matters for books written elsewhere (CLI runs, other workers).
+    """
+    if catalog_index.built_at and time.monotonic() - catalog_index.built_at < (
+        settings.MATCH_INDEX_REFRESH_SECONDS
+    ):
+        return catalog_index
+
+    rows = (await session.exec(select(Book.id, Book.title, Book.primary_author))).all()
+    catalog_index.clear()
+    for book_id, title, author in rows:
+        catalog_index.add(book_id, title, author)
+    catalog_index.built_at = time.monotonic()
+    return catalog_index
+
+
+async def match_items(session: AsyncSession, items: Sequence[IntakeItem]) -> list[IntakeItem]:
+    """Link items to catalog books when confident; return the ones left unmatched."""
+    index = await ensure_catalog_index(session)
+    if not len(index):
+        return list(items)
+
+    leftover: list[IntakeItem] = []
+    texts = [stored_parse(i)["text"] for i in items]
+    for item, result in zip(items, index.match_many(texts)):
+        if result is None or result[1] < settings.MATCH_THRESHOLD:
+            leftover.append(item)
+            continue
+        item.matched_book_id, item.match_confidence = result[0], round(result[1], 4)
+        item.status = "matched"
+        session.add(item)
+    return leftover
@@ -0,0 +1,139 @@
+import re
+from typing import Any
+
+from app.core import isbn as isbn_lib
+from app.models import IntakeItem
+
+# Bump when the output changes; `python -m app.cli reparse` refreshes older rows.
+PARSER_VERSION = 1
+
+_URL_RE = re.compile(r"(?:https?://|www\.)\S+", re.IGNORECASE)
+# Tags start with a letter so series markers like "(Empyrean #1)" survive.
+_HASHTAG_RE = re.compile(r"(?<![\w&])#([^\W\d]\w*)")
+_MENTION_RE = re.compile(r"(?<![\w.])@([\w.]+\w)")
+_EMOJI_RE = re.compile(
+    "["
+    "\U0001f000-\U0001faff"  # pictographs, emoticons, symbols, flags
+    "\u2600-\u27bf"  # misc symbols + dingbats
+    "\u2b00-\u2bff"  # arrows, stars
+    "\ufe0f\u200d\u20e3"  # variation selector, ZWJ, keycap
+    "]+"
+)
+_ISBN_RE = re.compile(
+    r"(?:\bISBN(?:-1[03])?\s*:?\s*)?\b(?:97[89][- ]?)?(?:\d[- ]?){9}[\dXx]\b", re.IGNORECASE
+)
+_PREFIX_RE = re.compile(
+    r"^(?:book\s*recs?|recommendation|rec|tbr|must\s*read|currently\s*reading)\s*[:\-–—]\s*",
+    re.IGNORECASE,
+)
+_SERIES_RE = re.compile(
+    r"[(\[]\s*(?:(?P<name>[^()\[\]#]*?)\s*[,:]?\s*)?"
+    r"(?:book|bk\.?|vol\.?|volume|part|#)\s*(?P<num>\d+(?:\.\d+)?)\s*[)\]]",
+    re.IGNORECASE,
+)
+_QUOTED_RE = re.compile(r"[\"“]([^\"“”]{2,}?)[\"”]|‘([^‘’]{2,}?)’")
+_BY_RE = re.compile(r"^(?P<title>.+?)\s+by\s+(?P<author>.+)$", re.IGNORECASE)
+_DASH_RE = re.compile(r"^(?P<left>.+?)\s+[–—-]\s+(?P<right>.+)$")
+_NAME_RE = re.compile(r"^[A-Z][\w'’.-]*(?:\s+[A-Z][\w'’.-]*){1,3}$")
+# Anything after these ends an author name: "Frank Herbert, recommended by Sam!"
+_AUTHOR_END_RE = re.compile(r"\s*(?:[,;!?|(\[]|\s[–—-]\s).*$")
+_EDGE_PUNCT = " \t\"'“”‘’.,;:!?-–—*_~"
+_SPACE_RE = re.compile(r"\s+")
+
+
+def _clean_author(author: str) -> str | None:
+    author = _AUTHOR_END_RE.sub("", author).strip(_EDGE_PUNCT)
+    return author or None
+
+
+def _clean_title(title: str) -> str | None:
+    title = title.strip(_EDGE_PUNCT)
+    return title or None
+
+
+def parse_capture(raw_text: str) -> dict[str, Any]:
+    """Pull title/author/series/ISBN out of a free-form recommendation or TikTok caption.
+
+    The result is what gets stored in IntakeItem.parse_json.
+    """
+    text = raw_text or ""
+    urls = _URL_RE.findall(text)
+    text = _URL_RE.sub(" ", text)
+    hashtags = _HASHTAG_RE.findall(text)
+    mentions = _MENTION_RE.findall(text)
+    text = _MENTION_RE.sub(" ", _HASHTAG_RE.sub(" ", text))
+    text = _EMOJI_RE.sub(" ", text)
+
+    isbn13 = None
+    for m in _ISBN_RE.finditer(text):
+        isbn13 = isbn_lib.to_isbn13(re.sub(r"(?i)^isbn(?:-1[03])?\s*:?\s*", "", m.group(0)))
+        if isbn13:
+            text = text.replace(m.group(0), " ")
+            break
+
+    # Captions are often multi-line; the book is almost always named on the first line.
+    lines = [_SPACE_RE.sub(" ", line).strip() for line in text.splitlines()]
+    head = next((line for line in lines if line.strip(_EDGE_PUNCT)), "")
+    head = _PREFIX_RE.sub("", head)
+
+    series = series_number = None
+    m = _SERIES_RE.search(head)
+    if m:
+        series = (m.group("name") or "").strip(_EDGE_PUNCT) or None
+        series_number = m.group("num")
+        head = (head[: m.start()] + " " + head[m.end() :]).strip()
+        head = _SPACE_RE.sub(" ", head)
+
+    title = author = None
+    pattern = "plain"
+    quoted = _QUOTED_RE.search(head)
+    by = _BY_RE.match(head)
+    dash = _DASH_RE.match(head)
+    if quoted:
+        pattern = "quoted"
+        title = _clean_title(quoted.group(1) or quoted.group(2))
+        rest = _BY_RE.match("x " + head[quoted.end() :].strip())
+        if rest:
+            author = _clean_author(rest.group("author"))
+    elif by:
+        pattern = "title_by_author"
+        title, author = _clean_title(by.group("title")), _clean_author(by.group("author"))
+    elif dash:
+        left, right = dash.group("left").strip(), dash.group("right").strip()
+        # "Title – Author" unless only the left-hand side looks like a person's name.
+        if _NAME_RE.match(left) and not _NAME_RE.match(right):
+            pattern = "author_dash_title"
+            title, author = _clean_title(right), _clean_author(left)
+        else:
+            pattern = "title_dash_author"
+            title, author = _clean_title(left), _clean_author(right)
+    else:
+        title = _clean_title(head)
+        if title is None:
+            pattern = "isbn" if isbn13 else "empty"
+
+    return {
+        "v": PARSER_VERSION,
+        "pattern": pattern,
+        "title": title,
+        "author": author,
+        "series": series,
+        "series_number": series_number,
+        "isbn13": isbn13,
+        "urls": urls,
+        "hashtags": hashtags,
+        "mentions": mentions,
+        "text": " ".join(filter(None, [title, author])) or _SPACE_RE.sub(" ", text).strip(),
+    }
+
+
+def capture_status(parsed: dict[str, Any]) -> str:
+    return "parsed" if parsed.get("title") or parsed.get("isbn13") else "new"
+
+
+def stored_parse(item: IntakeItem) -> dict[str, Any]:
+    """The item's stored parse, re-parsing only rows written by an older parser."""
+    parsed = item.parse_json or {}
+    if parsed.get("v") == PARSER_VERSION:
+        return parsed
+    return parse_capture(item.raw_text)
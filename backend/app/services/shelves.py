@@ -0,0 +1,132 @@
+from collections import Counter
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import or_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models import Book, BookShelf, BookShelfHistory, Shelf, ShelfCount
+
+
+class UnknownIdsError(LookupError):
+    """Some of the shelves or books a move named don't exist (or aren't the user's)."""
+
+    def __init__(self, label: str, ids: set[UUID]) -> None:
+        self.label = label
+        self.ids = ids
+        super().__init__(f"Unknown {label}: {', '.join(sorted(map(str, ids)))}")
+
+
+@dataclass
+class MoveResult:
+    book_id: UUID
+    from_shelf_id: UUID | None
+    to_shelf_id: UUID
+    moved: bool
+
+
+def count_delta_stmt(dialect: str, user_id: UUID, shelf_id: UUID, delta: int):
+    """Upsert that adds ``delta`` to a user's count for one shelf."""
+    insert = pg_insert if dialect == "postgresql" else sqlite_insert
+    stmt = insert(ShelfCount).values(user_id=user_id, shelf_id=shelf_id, count=delta)
+    return stmt.on_conflict_do_update(
+        index_elements=["user_id", "shelf_id"],
+        set_={"count": ShelfCount.count + delta},
+    )
+
+
+def visible_shelves(user_id: UUID):
+    """Where-clause for the shelves a user can see: their own and the shared ones."""
+    return or_(Shelf.user_id == user_id, Shelf.user_id.is_(None))
+
+
+async def _require_known(session: AsyncSession, stmt, ids: set[UUID], label: str) -> None:
+    found = set((await session.exec(stmt)).all())
+    missing = ids - found
+    if missing:
+        raise UnknownIdsError(label, missing)
+
+
+async def move_books(
+    session: AsyncSession,
+    user_id: UUID,
+    moves: Sequence[tuple[UUID, UUID]],
+    note: str | None = None,
+) -> list[MoveResult]:
+    """Put each (book_id, shelf_id) pair's book on that shelf, in one transaction.
+
+    Placements, history rows and ShelfCount deltas commit together, so the counts never
+    disagree with BookShelf. A book already on its target shelf is left alone and gets
+    no history row; if a book appears twice, its last move wins. Raises UnknownIdsError
+    before writing anything if a shelf or book doesn't exist for this user.
+    """
+    targets = dict(moves)
+    if not targets:
+        return []
+    shelf_ids, book_ids = set(targets.values()), set(targets)
+    await _require_known(
+        session,
+        select(Shelf.id).where(Shelf.id.in_(shelf_ids), visible_shelves(user_id)),
+        shelf_ids,
+        "shelf",
+    )
+    await _require_known(session, select(Book.id).where(Book.id.in_(book_ids)), book_ids, "book")
+
+    # Touch the target counters first so the transaction holds the write lock (row locks
+    # on Postgres) before reading placements; two concurrent moves of one book can't
+    # then both decrement its old shelf.
+    dialect = session.get_bind().dialect.name
+    for shelf_id in set(targets.values()):
+        await session.exec(count_delta_stmt(dialect, user_id, shelf_id, 0))
+    current = {
+        row.book_id: row
+        for row in (
+            await session.exec(
+                select(BookShelf)
+                .where(BookShelf.user_id == user_id, BookShelf.book_id.in_(list(targets)))
+                .with_for_update()
+            )
+        ).all()
+    }
+
+    now = datetime.utcnow()
+    deltas: Counter[UUID] = Counter()
+    results: list[MoveResult] = []
+    for book_id, shelf_id in targets.items():
+        row = current.get(book_id)
+        from_shelf_id = row.shelf_id if row else None
+        if from_shelf_id == shelf_id:
+            results.append(MoveResult(book_id, from_shelf_id, shelf_id, moved=False))
+            continue
+        if row is None:
+            session.add(
+                BookShelf(user_id=user_id, book_id=book_id, shelf_id=shelf_id, updated_at=now)
+            )
+        else:
+            row.shelf_id = shelf_id
+            row.updated_at = now
+            session.add(row)
+            deltas[from_shelf_id] -= 1
+        deltas[shelf_id] += 1
+        session.add(
+            BookShelfHistory(
+                user_id=user_id,
+                book_id=book_id,
+                from_shelf_id=from_shelf_id,
+                to_shelf_id=shelf_id,
+                timestamp=now,
+                note=note,
+            )
+        )
+        results.append(MoveResult(book_id, from_shelf_id, shelf_id, moved=True))
+
+    for shelf_id, delta in deltas.items():
+        if delta:
+            await session.exec(count_delta_stmt(dialect, user_id, shelf_id, delta))
+    await session.commit()
+    return results
@@ -0,0 +1,92 @@
+import statistics
+from datetime import datetime, timezone
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import func
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.db import rollups
+from app.models import IntakeItem, OwnedItem, Source, UserStat
+
+# Keyed by the request's ETag, which already folds in the user and their intake, owned
+# and sources versions: a write bumps a version and the stale entry is never asked for
+# again (the LRU bound and TTL clear it out).
+analytics_cache = TTLCache(
+    maxsize=settings.ANALYTICS_CACHE_MAX_ENTRIES, ttl=settings.ANALYTICS_CACHE_TTL_SECONDS
+)
+
+_DAY_SECONDS = 86400
+
+
+def _naive_utc(dt: datetime) -> datetime:
+    if dt.tzinfo is not None:
+        return dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt
+
+
+async def source_conversions(session: AsyncSession, user_id: UUID) -> list[dict[str, Any]]:
+    """Per source: captures, books bought off them, the rate, and median days to own.
+
+    Captures come from the /stats rollups; conversions are owned items linked to an inbox
+    capture (one per capture), read through ix_owneditem_user_intake. Captures with no
+    source are reported under ``source_id: None``.
+    """
+    captures = dict(
+        (
+            await session.exec(
+                select(UserStat.key, UserStat.count).where(
+                    UserStat.user_id == user_id, UserStat.metric == rollups.INTAKE_SOURCE
+                )
+            )
+        ).all()
+    )
+
+    owned_at = func.coalesce(OwnedItem.acquired_at, OwnedItem.created_at)
+    linked = await session.exec(
+        select(OwnedItem.source_id, OwnedItem.intake_id, IntakeItem.captured_at, owned_at)
+        .outerjoin(IntakeItem, IntakeItem.id == OwnedItem.intake_id)
+        .where(OwnedItem.user_id == user_id, OwnedItem.intake_id.is_not(None))
+    )
+    converted: dict[str, set[UUID]] = {}
+    days: dict[str, list[float]] = {}
+    for source_id, intake_id, captured_at, owned_on in linked:
+        key = str(source_id) if source_id else "none"
+        converted.setdefault(key, set()).add(intake_id)
+        if captured_at is not None and owned_on is not None:
+            # Owned before it was captured (bought earlier, logged later) counts as 0.
+            elapsed = (_naive_utc(owned_on) - _naive_utc(captured_at)).total_seconds()
+            days.setdefault(key, []).append(max(elapsed, 0) / _DAY_SECONDS)
+
+    sources = (
+        await session.exec(
+            select(Source.id, Source.name, Source.type).where(Source.user_id == user_id)
+        )
+    ).all()
+    meta = {str(source_id): (name, type_) for source_id, name, type_ in sources}
+
+    out = []
+    for key in {*meta, *captures, *converted}:
+        n_captures = captures.get(key, 0)
+        n_converted = len(converted.get(key, ()))
+        if key == "none" and not (n_captures or n_converted):
+            continue
+        name, type_ = meta.get(key, (None, None))
+        out.append(
+            {
+                "source_id": None if key == "none" else key,
+                "source_name": name,
+                "source_type": type_,
+                "captures": n_captures,
+                "conversions": n_converted,
+                "conversion_rate": round(n_converted / n_captures, 4) if n_captures else None,
+                "median_days_to_own": (
+                    round(statistics.median(days[key]), 1) if key in days else None
+                ),
+            }
+        )
+    out.sort(key=lambda r: (-r["conversions"], -r["captures"], r["source_name"] or ""))
+    return out
@@ -0,0 +1,350 @@
+"""In-process API benchmark: seeded data, concurrent requests, latency and SQL counts.
+
+    cd backend && python -m benchmarks.api [--users 5 --intake 5000 ...] [--json out.json]
+
+Seeds users x sources x intake items x owned items into a throwaway SQLite database,
+then drives ``app.main.app`` through httpx's ASGI transport (no sockets, no server)
+with N concurrent clients. For each scenario it reports p50/p95/p99 latency,
+throughput and SQL statements per request; ``--json`` writes the same numbers to a
+file so two commits can be diffed.
+
+With ``SLOW_QUERY_MS=<ms>`` set, the slow-query aggregate (statement shapes, plans,
+full-scan / temp B-tree flags) is printed after the run and included in the JSON.
+"""
+
+import argparse
+import asyncio
+import contextvars
+import json
+import os
+import random
+import shutil
+import subprocess
+import tempfile
+import time
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+# Password-hashing workers are spawned and re-import this module; they inherit the dir.
+if "BENCH_DB_DIR" not in os.environ:
+    os.environ["BENCH_DB_DIR"] = tempfile.mkdtemp(prefix="dogeared-bench-")
+_DB_DIR = os.environ["BENCH_DB_DIR"]
+os.environ["DATABASE_URL"] = f"sqlite:///{_DB_DIR}/bench.db"
+os.environ["LOOKUP_CACHE_PATH"] = f"{_DB_DIR}/lookup_cache.db"
+os.environ["ENRICH_ON_CAPTURE"] = "false"
+
+import httpx  # noqa: E402
+from sqlalchemy import event, insert  # noqa: E402
+from sqlmodel import Session  # noqa: E402
+
+from app.core.hashing import password_hasher  # noqa: E402
+from app.core.security import create_access_token, hash_password  # noqa: E402
+from app.core.sync import encode_token  # noqa: E402
+from app.db import session as db_session  # noqa: E402
+from app.db.rollups import rebuild_rollups  # noqa: E402
+from app.db.session import async_engine, async_read_engine, engine, init_db  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models import IntakeItem, OwnedItem, Source, User  # noqa: E402
+from app.services.enrichment import enricher  # noqa: E402
+from app.services.lookup_cache import lookup_cache  # noqa: E402
+
+PASSWORD = "bench-password"
+_STATUSES = ("new", "parsed", "matched", "needs_review", "owned")
+_FORMATS = ("hardcover", "paperback", "ebook", "audiobook")
+
+# SQL statements issued while serving the current request. The SQLAlchemy events fire
+# in the task that awaits the query, so a context variable attributes them correctly
+# even with many requests in flight.
+_query_count: contextvars.ContextVar[list[int] | None] = contextvars.ContextVar(
+    "bench_query_count", default=None
+)
+
+
+def _count_query(*_args) -> None:
+    counter = _query_count.get()
+    if counter is not None:
+        counter[0] += 1
+
+
+for _engine in {async_engine.sync_engine, async_read_engine.sync_engine}:
+    event.listen(_engine, "before_cursor_execute", _count_query)
+
+
+@dataclass
+class Seeded:
+    emails: list[str]
+    tokens: list[str]
+
+
+def seed(users: int, sources: int, intake: int, owned: int, rng: random.Random) -> Seeded:
+    """Bulk-insert the dataset; every user shares one bcrypt hash to keep seeding fast."""
+    password_hash = hash_password(PASSWORD)
+    now = datetime.now(timezone.utc)
+    emails, tokens = [], []
+    with Session(engine) as session:
+        for u in range(users):
+            user_id = uuid4()
+            email = f"bench{u}@example.com"
+            session.execute(
+                insert(User),
+                [
+                    {
+                        "id": user_id,
+                        "email": email,
+                        "display_name": f"Bench {u}",
+                        "password_hash": password_hash,
+                        "is_active": True,
+                        "is_admin": False,
+                        "created_at": now,
+                    }
+                ],
+            )
+            source_ids = [uuid4() for _ in range(sources)]
+            if source_ids:
+                session.execute(
+                    insert(Source),
+                    [
+                        {
+                            "id": sid,
+                            "user_id": user_id,
+                            "type": rng.choice(("tiktok", "friend", "family", "other")),
+                            "name": f"Source {i}",
+                            "created_at": now,
+                            "updated_at": now,
+                        }
+                        for i, sid in enumerate(source_ids)
+                    ],
+                )
+            if intake:
+                session.execute(
+                    insert(IntakeItem),
+                    [
+                        {
+                            "id": uuid4(),
+                            "user_id": user_id,
+                            "raw_text": f"Book {i} by Author {rng.randrange(500)} #booktok",
+                            "source_id": rng.choice(source_ids) if source_ids else None,
+                            "captured_at": now - timedelta(seconds=i),
+                            "status": rng.choice(_STATUSES),
+                            "parse_json": {},
+                            "created_at": now - timedelta(seconds=i),
+                            "updated_at": now - timedelta(seconds=i),
+                        }
+                        for i in range(intake)
+                    ],
+                )
+            if owned:
+                session.execute(
+                    insert(OwnedItem),
+                    [
+                        {
+                            "id": uuid4(),
+                            "user_id": user_id,
+                            "title": f"Book {i}",
+                            "author": f"Author {rng.randrange(500)}",
+                            "format": rng.choice(_FORMATS),
+                            "is_favorite": rng.random() < 0.1,
+                            "created_at": now - timedelta(seconds=i),
+                            "updated_at": now - timedelta(seconds=i),
+                        }
+                        for i in range(owned)
+                    ],
+                )
+            emails.append(email)
+            tokens.append(create_access_token(str(user_id)))
+        session.commit()
+    # Bulk inserts skip the ORM flush hook that keeps /stats counted.
+    with engine.begin() as conn:
+        rebuild_rollups(conn)
+    return Seeded(emails=emails, tokens=tokens)
+
+
+RequestFactory = Callable[[int], tuple[str, str, dict]]
+
+
+def scenarios(data: Seeded) -> dict[str, RequestFactory]:
+    """Scenario name -> factory(i) returning (method, url, httpx request kwargs)."""
+
+    def auth(i: int) -> dict[str, str]:
+        return {"Authorization": f"Bearer {data.tokens[i % len(data.tokens)]}"}
+
+    since = encode_token(datetime.now(timezone.utc))
+
+    return {
+        "auth_me": lambda i: ("GET", "/auth/me", {"headers": auth(i)}),
+        "list_intake": lambda i: ("GET", "/intake?limit=100", {"headers": auth(i)}),
+        "list_intake_inbox": lambda i: (
+            "GET",
+            "/intake?status=new&status=parsed&status=matched&status=needs_review",
+            {"headers": auth(i)},
+        ),
+        "list_owned": lambda i: ("GET", "/owned?limit=100", {"headers": auth(i)}),
+        "list_sources": lambda i: ("GET", "/sources", {"headers": auth(i)}),
+        # A client returning after the seed: only what later scenarios wrote comes back.
+        "sync_delta": lambda i: ("GET", f"/sync?since={since}", {"headers": auth(i)}),
+        "stats": lambda i: ("GET", "/stats", {"headers": auth(i)}),
+        "search": lambda i: ("GET", "/search?q=book", {"headers": auth(i)}),
+        "create_intake": lambda i: (
+            "POST",
+            "/intake",
+            {"headers": auth(i), "json": {"raw_text": f"Bench Book {i} by Someone"}},
+        ),
+        "login": lambda i: (
+            "POST",
+            "/auth/login",
+            {"json": {"email": data.emails[i % len(data.emails)], "password": PASSWORD}},
+        ),
+    }
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * pct / 100
+    lo, hi = int(k), min(int(k) + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+async def run_scenario(
+    client: httpx.AsyncClient, factory: RequestFactory, requests: int, concurrency: int
+) -> dict:
+    latencies: list[float] = []
+    queries: list[int] = []
+    statuses: Counter[int] = Counter()
+    next_index = iter(range(requests))
+
+    async def worker() -> None:
+        for i in next_index:
+            method, url, kwargs = factory(i)
+            counter = [0]
+            token = _query_count.set(counter)
+            start = time.perf_counter()
+            try:
+                response = await client.request(method, url, **kwargs)
+            finally:
+                latencies.append(time.perf_counter() - start)
+                _query_count.reset(token)
+            queries.append(counter[0])
+            statuses[response.status_code] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "p50_ms": round(_percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(_percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(_percentile(latencies, 99) * 1000, 3),
+        "max_ms": round(latencies[-1] * 1000, 3) if latencies else 0.0,
+        "throughput_rps": round(requests / elapsed, 1) if elapsed else 0.0,
+        "sql_per_request": round(sum(queries) / len(queries), 2) if queries else 0.0,
+        "sql_max": max(queries, default=0),
+        "statuses": {str(code): n for code, n in sorted(statuses.items())},
+    }
+
+
+def _git_revision() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip() or None
+
+
+async def main(args: argparse.Namespace) -> dict:
+    rng = random.Random(args.seed)
+    init_db()
+    started = time.perf_counter()
+    data = seed(args.users, args.sources, args.intake, args.owned, rng)
+    seed_seconds = time.perf_counter() - started
+
+    available = scenarios(data)
+    names = args.only or list(available)
+    unknown = set(names) - set(available)
+    if unknown:
+        raise SystemExit(f"unknown scenario(s): {', '.join(sorted(unknown))}")
+
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        try:
+            for name in names:
+                # bcrypt dominates login; a smaller sample gives the same percentiles.
+                requests = args.login_requests if name == "login" else args.requests
+                # Warm-up: statement caches, connection pools, the auth cache.
+                await run_scenario(client, available[name], 5, 1)
+                results[name] = await run_scenario(
+                    client, available[name], requests, args.concurrency
+                )
+                r = results[name]
+                print(
+                    f"{name:<18} p50 {r['p50_ms']:8.2f} ms  p95 {r['p95_ms']:8.2f} ms  "
+                    f"p99 {r['p99_ms']:8.2f} ms  {r['throughput_rps']:8.1f} req/s  "
+                    f"sql/req {r['sql_per_request']:5.2f}  {r['statuses']}"
+                )
+        finally:
+            await enricher.aclose()
+            lookup_cache.close()
+            password_hasher.shutdown()
+
+    slow_queries = []
+    if db_session.slow_query_log is not None:
+        print("\nslow queries (by total time):")
+        print(db_session.slow_query_log.report() or "    none")
+        slow_queries = [
+            {
+                "statement": e.statement,
+                "count": e.count,
+                "total_ms": round(e.total_ms, 3),
+                "max_ms": round(e.max_ms, 3),
+                "plan": e.plan,
+                "flags": e.flags,
+            }
+            for e in db_session.slow_query_log.statements.values()
+        ]
+
+    return {
+        "revision": _git_revision(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "dataset": {
+            "users": args.users,
+            "sources_per_user": args.sources,
+            "intake_per_user": args.intake,
+            "owned_per_user": args.owned,
+            "seed": args.seed,
+            "seed_seconds": round(seed_seconds, 2),
+        },
+        "results": results,
+        "slow_queries": slow_queries,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.api")
+    parser.add_argument("--users", type=int, default=5)
+    parser.add_argument("--sources", type=int, default=10, help="per user")
+    parser.add_argument("--intake", type=int, default=5_000, help="per user")
+    parser.add_argument("--owned", type=int, default=2_000, help="per user")
+    parser.add_argument("--requests", type=int, default=500, help="per scenario")
+    parser.add_argument("--login-requests", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--only", nargs="+", metavar="SCENARIO")
+    parser.add_argument("--json", dest="json_path", help="write results to this file")
+    args = parser.parse_args()
+    try:
+        report = asyncio.run(main(args))
+    finally:
+        shutil.rmtree(_DB_DIR, ignore_errors=True)
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"wrote {args.json_path}")
@@ -0,0 +1,133 @@
+"""Per-item cost of rendering a list response: model path vs. column-tuple fast path.
+
+    cd backend && python -m benchmarks.list_serialization [--rows 10000] [--repeat 5]
+
+Seeds a throwaway SQLite database with N owned items and N intake items, then times
+both ways of turning one query into JSON bytes:
+
+* model:  SELECT entities, build an ``*Out`` per row, then validate and dump the list
+          the way FastAPI does for ``response_model`` and encode with ``json.dumps``.
+* fast:   SELECT only the output columns as tuples and hand them to orjson
+          (app.core.responses), which is what the list endpoints now do.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+_DB_DIR = tempfile.mkdtemp(prefix="dogeared-bench-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_DB_DIR}/bench.db"
+
+from pydantic import TypeAdapter  # noqa: E402
+from sqlmodel import Session, select  # noqa: E402
+from sqlmodel.ext.asyncio.session import AsyncSession  # noqa: E402
+
+from app.core.responses import FastJSONResponse, UTCJSONResponse, rows_to_dicts  # noqa: E402
+from app.db.session import async_read_engine, engine, init_db  # noqa: E402
+from app.models import IntakeItem, OwnedItem, Source  # noqa: E402
+from app.routers import intake as intake_router  # noqa: E402
+from app.routers import owned as owned_router  # noqa: E402
+
+
+def seed(rows: int) -> None:
+    user_id = uuid4()
+    now = datetime.now(timezone.utc)
+    with Session(engine) as session:
+        src = Source(user_id=user_id, type="tiktok", name="TikTok")
+        session.add(src)
+        session.add_all(
+            OwnedItem(
+                user_id=user_id,
+                title=f"Book {i}",
+                author=f"Author {i % 97}",
+                format="paperback",
+                notes="shelf b" if i % 3 else None,
+                created_at=now - timedelta(seconds=i),
+            )
+            for i in range(rows)
+        )
+        session.add_all(
+            IntakeItem(
+                user_id=user_id,
+                raw_text=f"Book {i} by Author {i % 97} #booktok",
+                source_id=src.id if i % 2 else None,
+                captured_at=now - timedelta(seconds=i),
+            )
+            for i in range(rows)
+        )
+        session.commit()
+
+
+async def model_owned() -> bytes:
+    async with AsyncSession(async_read_engine) as session:
+        items = (await session.exec(select(OwnedItem))).all()
+    out = [owned_router._owned_out(o) for o in items]
+    adapter = TypeAdapter(list[owned_router.OwnedOut])
+    return json.dumps(adapter.dump_python(adapter.validate_python(out), mode="json")).encode()
+
+
+async def fast_owned() -> bytes:
+    async with AsyncSession(async_read_engine) as session:
+        rows = (await session.exec(select(*owned_router.OUT_COLUMNS))).all()
+    return FastJSONResponse(rows_to_dicts(owned_router.OUT_FIELDS, rows)).body
+
+
+async def model_intake() -> bytes:
+    async with AsyncSession(async_read_engine) as session:
+        items = (await session.exec(select(IntakeItem))).all()
+        sources = {s.id: s for s in (await session.exec(select(Source))).all()}
+    out = [intake_router._intake_out(i, sources.get(i.source_id)) for i in items]
+    adapter = TypeAdapter(list[intake_router.IntakeOut])
+    return json.dumps(adapter.dump_python(adapter.validate_python(out), mode="json")).encode()
+
+
+async def fast_intake() -> bytes:
+    async with AsyncSession(async_read_engine) as session:
+        user_id = (await session.exec(select(Source.user_id))).first()
+        rows = (await session.exec(intake_router.select_out_columns(user_id))).all()
+    return UTCJSONResponse(rows_to_dicts(intake_router.OUT_FIELDS, rows)).body
+
+
+async def bench(name: str, fn, rows: int, repeat: int) -> float:
+    await fn()  # warm-up: imports, statement cache, connection pool
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = await fn()
+        timings.append(time.perf_counter() - start)
+    best = min(timings)
+    print(
+        f"{name:<14} {best * 1000:8.1f} ms  {best / rows * 1e6:6.2f} us/item  "
+        f"median {statistics.median(timings) * 1000:8.1f} ms  {len(body) / 1024:8.0f} KiB"
+    )
+    return best
+
+
+async def main(rows: int, repeat: int) -> None:
+    for label, model, fast in (
+        ("owned", model_owned, fast_owned),
+        ("intake", model_intake, fast_intake),
+    ):
+        slow_t = await bench(f"{label}/model", model, rows, repeat)
+        fast_t = await bench(f"{label}/fast", fast, rows, repeat)
+        print(f"{label:<14} {slow_t / fast_t:.1f}x faster\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    try:
+        init_db()
+        seed(args.rows)
+        asyncio.run(main(args.rows, args.repeat))
+    finally:
+        shutil.rmtree(_DB_DIR, ignore_errors=True)
@@ -0,0 +1,9 @@
+import os
+import tempfile
+
+# Importing the app builds engines and opens the lookup cache from settings; keep both
+# out of the working tree.
+_tmp = tempfile.mkdtemp(prefix="dogeared-tests-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_tmp}/test.db")
+os.environ.setdefault("LOOKUP_CACHE_PATH", f"{_tmp}/lookup_cache.db")
+os.environ.setdefault("COVER_CACHE_DIR", f"{_tmp}/covers")
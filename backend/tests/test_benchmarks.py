@@ -0,0 +1,20 @@
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND = Path(__file__).resolve().parents[1]
+
+
+def test_list_serialization_benchmark_runs():
+    # A subprocess: the benchmark points DATABASE_URL at its own throwaway database
+    # before importing the app, which can't happen inside this already-configured one.
+    result = subprocess.run(
+        [sys.executable, "-m", "benchmarks.list_serialization", "--rows", "10", "--repeat", "1"],
+        cwd=BACKEND,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    assert result.returncode == 0, result.stderr
+    assert "owned/fast" in result.stdout
+    assert "intake/fast" in result.stdout
@@ -0,0 +1,75 @@
+from uuid import uuid4
+
+from app.models import IntakeItem
+from app.services import dedup
+from app.services.parser import parse_capture
+
+
+def _sig(raw: str) -> dedup.Signature:
+    return dedup.signature(parse_capture(raw))
+
+
+def _item(raw: str, source_id=None, url=None) -> IntakeItem:
+    return IntakeItem(
+        user_id=uuid4(),
+        raw_text=raw,
+        parse_json=parse_capture(raw),
+        source_id=source_id,
+        source_post_url=url,
+    )
+
+
+def test_fingerprint_ignores_noise_and_pattern():
+    a = _sig("Dune by Frank Herbert #booktok")
+    b = _sig("dune - frank herbert 🔥")
+    assert a.fingerprint == b.fingerprint
+    assert a.fingerprint != _sig("Dune Messiah by Frank Herbert").fingerprint
+
+
+def test_signature_is_deterministic_and_banded():
+    a, b = _sig("Fourth Wing by Rebecca Yarros"), _sig("Fourth Wing by Rebecca Yarros")
+    assert a.buckets == b.buckets
+    assert len(a.buckets) == dedup.BANDS
+    assert [bucket.split(":")[0] for bucket in a.buckets] == [str(i) for i in range(dedup.BANDS)]
+    assert len(dedup.minhash(a.shingles)) == dedup.NUM_PERM
+
+
+def test_too_short_captures_have_no_signature():
+    assert _sig("x") is None
+
+
+def test_near_duplicates_share_a_bucket_and_unrelated_ones_dont():
+    a = _sig("Fourth Wing by Rebecca Yarros")
+    typo = _sig("Fourth Wing by Rebeca Yarros")
+    other = _sig("Circe by Madeline Miller")
+    assert dedup.jaccard(a.shingles, typo.shingles) >= 0.8
+    assert set(a.buckets) & set(typo.buckets)
+    assert not set(a.buckets) & set(other.buckets)
+
+
+def test_index_matches_exact_and_near_duplicates():
+    index = dedup.DedupIndex()
+    original = _item("Fourth Wing by Rebecca Yarros")
+    index.add(original, _sig(original.raw_text))
+    assert index.match(_sig("fourth wing - rebecca yarros!!")) is original
+    assert index.match(_sig("Fourth Wing by Rebeca Yarros")) is original
+    assert index.match(_sig("Circe by Madeline Miller")) is None
+    assert index.match(None) is None
+
+
+def test_is_repeat_only_when_nothing_new_came_with_it():
+    source = uuid4()
+    original = _item("Dune by Frank Herbert", source_id=source, url="https://t.co/1")
+    assert dedup.is_repeat(original, source, None)
+    assert dedup.is_repeat(original, source, "https://t.co/1")
+    assert not dedup.is_repeat(original, source, "https://t.co/2")
+    assert not dedup.is_repeat(original, uuid4(), None)
+
+
+def test_bucket_rows():
+    item = _item("Dune by Frank Herbert")
+    sig = _sig(item.raw_text)
+    rows = dedup.bucket_rows(item, sig)
+    assert [r.bucket for r in rows] == sig.buckets
+    assert {(r.user_id, r.intake_id) for r in rows} == {(item.user_id, item.id)}
+    assert dedup.bucket_rows(item, None) == []
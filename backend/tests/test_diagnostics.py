@@ -0,0 +1,36 @@
+from app.db.diagnostics import normalize_statement, plan_flags
+
+
+def test_normalize_collapses_literals_and_whitespace():
+    a = normalize_statement("SELECT * FROM book\n  WHERE title = 'Dune' AND year > 1965")
+    b = normalize_statement("SELECT * FROM book WHERE title = 'It''s'   AND year > 2.5")
+    assert a == b == "SELECT * FROM book WHERE title = ? AND year > ?"
+
+
+def test_normalize_collapses_expanded_in_lists():
+    one = normalize_statement("SELECT id FROM intakeitem WHERE status IN (?, ?)")
+    many = normalize_statement("SELECT id FROM intakeitem WHERE status IN (?,?,?,?)")
+    assert one == many == "SELECT id FROM intakeitem WHERE status IN (?...)"
+
+
+def test_normalize_keeps_identifiers_with_digits():
+    assert normalize_statement("SELECT t1.id FROM book AS t1") == "SELECT t1.id FROM book AS t1"
+
+
+def test_plan_flags_full_scans_and_temp_sorts():
+    plan = [
+        "SCAN intakeitem",
+        "USE TEMP B-TREE FOR ORDER BY",
+        "SCAN intakeitem",
+    ]
+    assert plan_flags(plan) == ["full scan: intakeitem", "temp b-tree: order by"]
+
+
+def test_plan_flags_ignores_index_lookups_and_virtual_tables():
+    plan = [
+        "SEARCH intakeitem USING INDEX ix_intakeitem_user_status_captured (user_id=? AND status=?)",
+        "SEARCH book USING COVERING INDEX ix_book_isbn13 (isbn13=?)",
+        "SCAN book_fts VIRTUAL TABLE INDEX 0:M1",
+        "SCAN CONSTANT ROW",
+    ]
+    assert plan_flags(plan) == []
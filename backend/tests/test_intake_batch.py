@@ -0,0 +1,23 @@
+from datetime import datetime
+
+from app.routers.intake import IntakeBatchItemIn
+
+
+def test_captured_at_with_offset_is_stored_as_utc():
+    item = IntakeBatchItemIn(raw_text="Dune", captured_at="2024-01-01T10:00:00+02:00")
+    assert item.captured_at == datetime(2024, 1, 1, 8, 0)
+    assert item.captured_at.tzinfo is None
+
+
+def test_captured_at_in_utc_keeps_its_time():
+    item = IntakeBatchItemIn(raw_text="Dune", captured_at="2024-01-01T10:00:00Z")
+    assert item.captured_at == datetime(2024, 1, 1, 10, 0)
+
+
+def test_naive_captured_at_is_taken_as_utc():
+    item = IntakeBatchItemIn(raw_text="Dune", captured_at="2024-01-01T10:00:00")
+    assert item.captured_at == datetime(2024, 1, 1, 10, 0)
+
+
+def test_captured_at_is_optional():
+    assert IntakeBatchItemIn(raw_text="Dune").captured_at is None
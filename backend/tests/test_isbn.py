@@ -0,0 +1,47 @@
+import pytest
+
+from app.core import isbn
+
+
+@pytest.mark.parametrize(
+    "raw, expected",
+    [
+        ("0441013597", "9780441013593"),
+        ("0-441-01359-7", "9780441013593"),
+        ("978-0-441-01359-3", "9780441013593"),
+        ("978 0441013593", "9780441013593"),
+        ("080442957x", "9780804429573"),
+        ("0‐8044‐2957‐X", "9780804429573"),  # typographic hyphens
+        ("979-10-90636-07-1", "9791090636071"),
+    ],
+)
+def test_to_isbn13_accepts_any_valid_spelling(raw, expected):
+    assert isbn.to_isbn13(raw) == expected
+
+
+@pytest.mark.parametrize(
+    "raw",
+    [None, "", "0441013598", "9780441013594", "1234567890123", "04410135", "97804410135930"],
+)
+def test_to_isbn13_rejects_invalid(raw):
+    assert isbn.to_isbn13(raw) is None
+
+
+def test_isbn10_check_digit_x():
+    assert isbn.is_valid_isbn10("080442957X")
+    assert not isbn.is_valid_isbn10("0804429570")
+    assert not isbn.is_valid_isbn10("X804429575")
+
+
+def test_isbn13_requires_bookland_prefix():
+    # Valid EAN-13 check digit, but not an ISBN.
+    assert not isbn.is_valid_isbn13("4006381333931")
+
+
+def test_isbn10_13_round_trip():
+    assert isbn.isbn13_to_10(isbn.isbn10_to_13("080442957X")) == "080442957X"
+    assert isbn.isbn13_to_10("9780441013593") == "0441013597"
+
+
+def test_979_isbn13_has_no_isbn10():
+    assert isbn.isbn13_to_10("9791090636071") is None
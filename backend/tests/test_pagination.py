@@ -0,0 +1,26 @@
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.pagination import decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    ts, item_id = datetime(2024, 1, 1, 8, 30, 15, 123456), uuid4()
+    cursor = encode_cursor(ts, item_id)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (ts, item_id)
+
+
+def test_cursor_keeps_timezone():
+    ts = datetime(2024, 1, 1, 8, 0, tzinfo=timezone.utc)
+    assert decode_cursor(encode_cursor(ts, uuid4()))[0] == ts
+
+
+@pytest.mark.parametrize("cursor", ["", "not-a-cursor", "Zm9vfGJhcg", "!!!"])
+def test_bad_cursor_is_a_400(cursor):
+    with pytest.raises(HTTPException) as e:
+        decode_cursor(cursor)
+    assert e.value.status_code == 400
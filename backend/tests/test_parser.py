@@ -0,0 +1,59 @@
+import pytest
+
+from app.models import IntakeItem
+from app.services.parser import PARSER_VERSION, capture_status, parse_capture, stored_parse
+
+
+@pytest.mark.parametrize(
+    "raw, pattern, title, author",
+    [
+        ("Dune by Frank Herbert #booktok 🔥", "title_by_author", "Dune", "Frank Herbert"),
+        ("Frank Herbert - Dune", "author_dash_title", "Dune", "Frank Herbert"),
+        ("Fourth Wing – Rebecca Yarros", "title_dash_author", "Fourth Wing", "Rebecca Yarros"),
+        (
+            'Book rec: "The Will of the Many" by James Islington!',
+            "quoted",
+            "The Will of the Many",
+            "James Islington",
+        ),
+        ("A Court of Thorns and Roses\nso good omg", "plain", "A Court of Thorns and Roses", None),
+    ],
+)
+def test_title_and_author(raw, pattern, title, author):
+    parsed = parse_capture(raw)
+    assert (parsed["pattern"], parsed["title"], parsed["author"]) == (pattern, title, author)
+
+
+def test_series_marker_is_split_out():
+    parsed = parse_capture("Iron Flame (Empyrean #2) by Rebecca Yarros")
+    assert parsed["title"] == "Iron Flame"
+    assert (parsed["series"], parsed["series_number"]) == ("Empyrean", "2")
+
+
+def test_isbn_only_capture():
+    parsed = parse_capture("ISBN 978-0-441-01359-3")
+    assert parsed["pattern"] == "isbn"
+    assert parsed["isbn13"] == "9780441013593"
+    assert capture_status(parsed) == "parsed"
+
+
+def test_urls_tags_and_mentions_are_collected_and_stripped():
+    parsed = parse_capture("Dune by Frank Herbert https://tiktok.com/x @bookgirl #scifi")
+    assert parsed["urls"] == ["https://tiktok.com/x"]
+    assert parsed["mentions"] == ["bookgirl"]
+    assert parsed["hashtags"] == ["scifi"]
+    assert parsed["author"] == "Frank Herbert"
+    assert parsed["text"] == "Dune Frank Herbert"
+
+
+def test_empty_capture_is_new():
+    parsed = parse_capture("")
+    assert parsed["pattern"] == "empty"
+    assert capture_status(parsed) == "new"
+
+
+def test_stored_parse_reuses_current_version_only():
+    current = {"v": PARSER_VERSION, "title": "Stored"}
+    assert stored_parse(IntakeItem(raw_text="Dune by Frank Herbert", parse_json=current)) is current
+    stale = IntakeItem(raw_text="Dune by Frank Herbert", parse_json={"v": 0, "title": "Old"})
+    assert stored_parse(stale)["title"] == "Dune"
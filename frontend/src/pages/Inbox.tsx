@@ -49,7 +49,9 @@ export default function Inbox() {
     setError(null);
     setLoading(true);
     try {
-      const data = await apiGet<IntakeItem[]>("/intake?status=new");
+      const data = await apiGet<IntakeItem[]>(
+        "/intake?status=new&status=parsed&status=matched&status=needs_review"
+      );
       setItems(data);
     } catch (err: any) {
       setError(err?.message ?? "Failed to load inbox.");